@@ -0,0 +1,125 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Peak RSS and step time of training with `num_chunks` micro-chunks.
+
+The interior constraint mimics cylinder2d_unsteady_Re100(NavierStokes on a batch of
+NPOINT_PDE * NTIME_PDE points). Each number of chunks runs in a fresh subprocess, as
+peak RSS of a process never decreases.
+
+Usage:
+    python benchmark/chunked_residual.py --device cpu --num_chunks 1 2 4 8 16
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import ppsci
+from ppsci.utils import logger
+
+
+def run_child(args):
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("t", "x", "y"), ("u", "v", "p"), 5, 50, "tanh")
+    equation = ppsci.equation.NavierStokes(0.02, 1.0, 2, True)
+    n = args.batch_size
+    pde_constraint = ppsci.constraint.SupervisedConstraint(
+        {
+            "dataset": {
+                "name": "IterableNamedArrayDataset",
+                "input": {
+                    "t": np.random.uniform(1, 50, (n, 1)).astype("float32"),
+                    "x": np.random.uniform(-8, 25, (n, 1)).astype("float32"),
+                    "y": np.random.uniform(-8, 8, (n, 1)).astype("float32"),
+                },
+                "label": {
+                    key: np.zeros((n, 1), "float32")
+                    for key in ("continuity", "momentum_x", "momentum_y")
+                },
+            },
+        },
+        ppsci.loss.MSELoss("mean"),
+        equation.equations,
+        name="EQ",
+    )
+    optimizer = ppsci.optimizer.Adam(0.001)(model)
+    solver = ppsci.solver.Solver(
+        model,
+        {pde_constraint.name: pde_constraint},
+        args.output_dir,
+        optimizer,
+        epochs=1,
+        iters_per_epoch=args.iters,
+        log_freq=args.iters,
+        device=args.device,
+        equation={"NavierStokes": equation},
+        num_chunks=args.num_chunks[0],
+    )
+    tic = time.perf_counter()
+    solver.train_epoch_func(solver, 1, args.iters)
+    cost = (time.perf_counter() - tic) / args.iters
+    # ru_maxrss is in kilobytes on linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"RESULT {peak_rss:.1f} {cost:.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch_size", type=int, default=9420 * 30)
+    parser.add_argument("--iters", type=int, default=3)
+    parser.add_argument("--num_chunks", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--output_dir", type=str, default="./output_benchmark")
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        logger.init_logger("ppsci", None, "error")
+        run_child(args)
+        sys.exit(0)
+
+    logger.init_logger("ppsci", None, "info")
+    for num_chunks in args.num_chunks:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--child",
+                "--device",
+                args.device,
+                "--batch_size",
+                str(args.batch_size),
+                "--iters",
+                str(args.iters),
+                "--num_chunks",
+                str(num_chunks),
+                "--output_dir",
+                args.output_dir,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        peak_rss, cost = output.split("RESULT")[-1].split()
+        logger.message(
+            f"num_chunks: {num_chunks}, chunk_size: "
+            f"{(args.batch_size + num_chunks - 1) // num_chunks}, "
+            f"peak RSS: {peak_rss} MB, step time: {cost} s"
+        )
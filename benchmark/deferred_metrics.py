@@ -0,0 +1,128 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of training steps per second with `deferred_metrics` on and off.
+
+The setup mimics cylinder2d_unsteady_Re100: an MLP(t, x, y -> u, v, p) trained with
+one NavierStokes interior constraint and three supervised constraints.
+
+Usage:
+    python benchmark/deferred_metrics.py --device gpu --iters 500 --log_freq 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import ppsci
+from ppsci.utils import logger
+
+
+def build_constraint(npoint_pde: int, npoint_bc: int):
+    equation = ppsci.equation.NavierStokes(0.02, 1.0, 2, True)
+
+    def random_input(n):
+        return {
+            "t": np.random.uniform(1, 50, (n, 1)).astype("float32"),
+            "x": np.random.uniform(-8, 25, (n, 1)).astype("float32"),
+            "y": np.random.uniform(-8, 8, (n, 1)).astype("float32"),
+        }
+
+    def random_label(n, keys):
+        return {key: np.random.randn(n, 1).astype("float32") for key in keys}
+
+    pde_constraint = ppsci.constraint.SupervisedConstraint(
+        {
+            "dataset": {
+                "name": "IterableNamedArrayDataset",
+                "input": random_input(npoint_pde),
+                "label": random_label(
+                    npoint_pde, ("continuity", "momentum_x", "momentum_y")
+                ),
+            },
+        },
+        ppsci.loss.MSELoss("mean"),
+        equation.equations,
+        name="EQ",
+    )
+    constraint = {pde_constraint.name: pde_constraint}
+    for name, label_keys in (
+        ("BC_inlet_cylinder", ("u", "v")),
+        ("BC_outlet", ("p",)),
+        ("IC", ("u", "v", "p")),
+    ):
+        constraint[name] = ppsci.constraint.SupervisedConstraint(
+            {
+                "dataset": {
+                    "name": "IterableNamedArrayDataset",
+                    "input": random_input(npoint_bc),
+                    "label": random_label(npoint_bc, label_keys),
+                },
+            },
+            ppsci.loss.MSELoss("mean"),
+            name=name,
+        )
+    return equation, constraint
+
+
+def benchmark(args, deferred_metrics: bool) -> float:
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("t", "x", "y"), ("u", "v", "p"), 5, 50, "tanh")
+    equation, constraint = build_constraint(args.npoint_pde, args.npoint_bc)
+    optimizer = ppsci.optimizer.Adam(0.001)(model)
+    solver = ppsci.solver.Solver(
+        model,
+        constraint,
+        args.output_dir,
+        optimizer,
+        epochs=1,
+        iters_per_epoch=args.warmup,
+        log_freq=args.log_freq,
+        device=args.device,
+        equation={"NavierStokes": equation},
+        deferred_metrics=deferred_metrics,
+    )
+    # warmup
+    solver.train_epoch_func(solver, 1, args.log_freq)
+
+    solver.iters_per_epoch = args.iters
+    tic = time.perf_counter()
+    solver.train_epoch_func(solver, 1, args.log_freq)
+    cost = time.perf_counter() - tic
+    return args.iters / cost
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="gpu")
+    parser.add_argument("--iters", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--log_freq", type=int, default=100)
+    parser.add_argument("--npoint_pde", type=int, default=2048)
+    parser.add_argument("--npoint_bc", type=int, default=256)
+    parser.add_argument("--output_dir", type=str, default="./output_benchmark")
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    result = {}
+    for deferred_metrics in (False, True):
+        result[deferred_metrics] = benchmark(args, deferred_metrics)
+
+    logger.message(
+        f"deferred_metrics=False: {result[False]:.2f} steps/s, "
+        f"deferred_metrics=True: {result[True]:.2f} steps/s, "
+        f"speedup: {result[True] / result[False]:.3f}x"
+    )
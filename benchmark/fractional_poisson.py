@@ -0,0 +1,100 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of per-iteration cost of `FractionalPoisson` with the setup of
+examples/fpde/fractional_poisson_2d.py.
+
+"rebuild" rebuilds a COO integral matrix from python lists at every iteration, as
+the equation did before, while "cached" reuses the CSR tensor held by the equation.
+
+Usage:
+    python benchmark/fractional_poisson.py --device gpu --iters 100
+"""
+
+import argparse
+import time
+
+import numpy as np
+import paddle
+from paddle import sparse
+
+import ppsci
+from ppsci.utils import logger
+
+
+def build_coo(equation: ppsci.equation.FractionalPoisson):
+    crows, cols, values, shape = equation.int_mat
+    rows = np.repeat(np.arange(len(crows) - 1), np.diff(crows))
+    indices = [[int(r), int(c)] for r, c in zip(rows, cols)]
+    return sparse.sparse_coo_tensor(
+        [[p[0] for p in indices], [p[1] for p in indices]],
+        values,
+        shape,
+        stop_gradient=False,
+    )
+
+
+def benchmark(args, rebuild: bool) -> float:
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("x", "y"), ("u",), 4, 20)
+    geom = ppsci.geometry.Disk((0, 0), 1)
+    equation = ppsci.equation.FractionalPoisson(1.8, geom, [8, 100])
+    points = geom.sample_interior(
+        args.npoint,
+        "Hammersley",
+        lambda x, y: ~geom.on_boundary(np.hstack((x, y))),
+    )
+    points = np.concatenate((points["x"], points["y"]), axis=1)
+
+    tic = time.perf_counter()
+    input_dict = {k: paddle.to_tensor(v) for k, v in equation.get_x(points).items()}
+    logger.message(f"assemble integral matrix: {time.perf_counter() - tic:.3f} s")
+
+    def step():
+        output_dict = model(input_dict)
+        if rebuild:
+            equation._int_mat_tensor = build_coo(equation)
+        res = equation.equations["fpde"]({**input_dict, **output_dict})
+        loss = (res**2).mean()
+        loss.backward()
+        model.clear_gradients()
+
+    step()
+    if args.device != "cpu":
+        paddle.device.synchronize()
+    tic = time.perf_counter()
+    for _ in range(args.iters):
+        step()
+    if args.device != "cpu":
+        paddle.device.synchronize()
+    return (time.perf_counter() - tic) / args.iters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="gpu")
+    parser.add_argument("--iters", type=int, default=100)
+    parser.add_argument("--npoint", type=int, default=100)
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    paddle.set_device(args.device)
+    cost_rebuild = benchmark(args, True)
+    cost_cached = benchmark(args, False)
+    logger.message(
+        f"rebuild: {cost_rebuild * 1000:.2f} ms/iter, "
+        f"cached: {cost_cached * 1000:.2f} ms/iter, "
+        f"speedup: {cost_rebuild / cost_cached:.2f}x"
+    )
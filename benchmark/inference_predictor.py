@@ -0,0 +1,107 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Micro-benchmark of `Solver.predict` versus `ppsci.inference.Predictor` with the MLP
+of examples/cylinder/2d_unsteady/cylinder2d_unsteady_Re100.py.
+
+Latency is measured on a single batch of `--latency_batch_size` samples, and
+throughput on `--npoint` samples, by batch size tuned by `Predictor.tune_batch_size`.
+
+Usage:
+    python benchmark/inference_predictor.py --num_cpu_threads 4 --enable_mkldnn
+"""
+
+import argparse
+import time
+
+import numpy as np
+import paddle
+
+import ppsci
+from ppsci.utils import logger
+
+
+def timeit(func, repeat: int):
+    func()
+    tic = time.perf_counter()
+    for _ in range(repeat):
+        outputs = func()
+    return outputs, (time.perf_counter() - tic) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--npoint", type=int, default=100000)
+    parser.add_argument("--latency_batch_size", type=int, default=1)
+    parser.add_argument("--num_cpu_threads", type=int, default=1)
+    parser.add_argument("--enable_mkldnn", action="store_true")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output_dir", type=str, default="./output_benchmark")
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    paddle.set_device("cpu")
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("t", "x", "y"), ("u", "v", "p"), 5, 50, "tanh")
+    solver = ppsci.solver.Solver(model, output_dir=args.output_dir, device="cpu")
+    export_path = solver.export()
+    predictor = ppsci.inference.Predictor(
+        export_path,
+        num_cpu_threads=args.num_cpu_threads,
+        enable_mkldnn=args.enable_mkldnn,
+    )
+
+    input_dict = {
+        key: np.random.rand(args.npoint, 1).astype(paddle.get_default_dtype())
+        for key in model.input_keys
+    }
+    small_input_dict = {
+        key: value[: args.latency_batch_size] for key, value in input_dict.items()
+    }
+
+    # latency
+    _, latency_dygraph = timeit(
+        lambda: solver.predict(small_input_dict, batch_size=args.latency_batch_size),
+        args.repeat,
+    )
+    _, latency_static = timeit(lambda: predictor.predict(small_input_dict), args.repeat)
+    logger.message(
+        f"latency(batch_size={args.latency_batch_size}): "
+        f"Solver.predict: {latency_dygraph * 1000:.3f} ms, "
+        f"Predictor: {latency_static * 1000:.3f} ms, "
+        f"speedup: {latency_dygraph / latency_static:.2f}x"
+    )
+
+    # throughput
+    batch_size = predictor.tune_batch_size(input_dict)
+    pred_dygraph, cost_dygraph = timeit(
+        lambda: solver.predict(input_dict, batch_size=batch_size, return_numpy=True),
+        args.repeat,
+    )
+    pred_static, cost_static = timeit(
+        lambda: predictor.predict(input_dict), args.repeat
+    )
+    max_diff = max(
+        float(np.abs(pred_dygraph[key] - pred_static[key]).max())
+        for key in model.output_keys
+    )
+    logger.message(
+        f"throughput(batch_size={batch_size}): "
+        f"Solver.predict: {args.npoint / cost_dygraph:.1f} samples/s, "
+        f"Predictor: {args.npoint / cost_static:.1f} samples/s, "
+        f"speedup: {cost_dygraph / cost_static:.2f}x, "
+        f"max abs diff: {max_diff:.3e}"
+    )
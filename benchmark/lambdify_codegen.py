@@ -0,0 +1,89 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Micro-benchmark of dispatch overhead of `ppsci.lambdify` backends, on equations of
+examples/cylinder/2d_unsteady/cylinder2d_unsteady_Re100.py.
+
+"node" calls converted nodes one by one, while "codegen" calls one generated python
+function per equation. Model forward is excluded from timing, so the difference
+between two backends is mainly overhead of dispatching, which matters for small
+batches.
+
+Usage:
+    python benchmark/lambdify_codegen.py --device gpu --batch_sizes 64 1024 9420
+"""
+
+import argparse
+import time
+
+import paddle
+
+import ppsci
+from ppsci.utils import logger
+
+
+def timeit(funcs, input_dict, output_dict, iters: int, device: str) -> float:
+    def evaluate():
+        data_dict = {**input_dict, **output_dict}
+        with ppsci.autodiff.DerivativeCache():
+            for func in funcs:
+                func(data_dict)
+
+    evaluate()
+    if device != "cpu":
+        paddle.device.synchronize()
+    tic = time.perf_counter()
+    for _ in range(iters):
+        evaluate()
+    if device != "cpu":
+        paddle.device.synchronize()
+    return (time.perf_counter() - tic) / iters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="gpu")
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[64, 1024, 9420])
+    parser.add_argument("--iters", type=int, default=100)
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    paddle.set_device(args.device)
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("t", "x", "y"), ("u", "v", "p"), 5, 50, "tanh")
+    exprs = list(ppsci.equation.NavierStokes(0.02, 1.0, 2, True).equations.values())
+    node_funcs = [ppsci.lambdify(expr, model) for expr in exprs]
+    codegen_funcs = [ppsci.lambdify(expr, model, backend="codegen") for expr in exprs]
+    for func in codegen_funcs:
+        logger.message(f"generated source: {func.source_path}")
+
+    for batch_size in args.batch_sizes:
+        input_dict = {}
+        for key in model.input_keys:
+            input_dict[key] = paddle.rand([batch_size, 1])
+            input_dict[key].stop_gradient = False
+        output_dict = model(input_dict)
+
+        cost_node = timeit(node_funcs, input_dict, output_dict, args.iters, args.device)
+        cost_codegen = timeit(
+            codegen_funcs, input_dict, output_dict, args.iters, args.device
+        )
+        logger.message(
+            f"batch_size={batch_size}: node: {cost_node * 1000:.3f} ms, "
+            f"codegen: {cost_codegen * 1000:.3f} ms, "
+            f"saved: {(cost_node - cost_codegen) * 1000:.3f} ms/eval, "
+            f"speedup: {cost_node / cost_codegen:.2f}x"
+        )
@@ -0,0 +1,132 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Node counts and evaluation time of equations converted by `ppsci.lambdify` one by
+one ("separate") versus together with common subexpressions eliminated ("shared").
+
+"built" is the number of nodes constructed, which is the number of nodes called per
+evaluation before nodes computed by former equations were skipped. "distinct" is the
+number of distinct nodes, i.e. nodes actually computed per evaluation.
+
+Usage:
+    python benchmark/lambdify_cse.py --device cpu --batch_size 4096 --iters 20
+"""
+
+import argparse
+import time
+
+import paddle
+import sympy as sp
+
+import ppsci
+from ppsci.utils import logger
+
+CASES = {
+    "NavierStokes2D": (
+        lambda: ppsci.equation.NavierStokes(0.01, 1.0, 2, True),
+        ("t", "x", "y"),
+        ("u", "v", "p"),
+    ),
+    "NavierStokes3D": (
+        lambda: ppsci.equation.NavierStokes(0.01, 1.0, 3, True),
+        ("t", "x", "y", "z"),
+        ("u", "v", "w", "p"),
+    ),
+    "LinearElasticity2D": (
+        lambda: ppsci.equation.LinearElasticity(
+            E=None, nu=None, lambda_=1.0, mu=1.0, dim=2
+        ),
+        ("x", "y", "normal_x", "normal_y"),
+        ("u", "v", "sigma_xx", "sigma_yy", "sigma_xy"),
+    ),
+    "LinearElasticity3D": (
+        lambda: ppsci.equation.LinearElasticity(
+            E=None, nu=None, lambda_=1.0, mu=1.0, dim=3
+        ),
+        ("x", "y", "z", "normal_x", "normal_y", "normal_z"),
+        (
+            ("u", "v", "w")
+            + ("sigma_xx", "sigma_yy", "sigma_zz")
+            + ("sigma_xy", "sigma_xz", "sigma_yz")
+        ),
+    ),
+}
+
+
+def timeit(funcs, model, input_dict, iters: int) -> float:
+    def evaluate():
+        data_dict = {**input_dict, **model(input_dict)}
+        with ppsci.autodiff.DerivativeCache():
+            for func in funcs:
+                func(data_dict)
+
+    evaluate()
+    tic = time.perf_counter()
+    for _ in range(iters):
+        evaluate()
+    return (time.perf_counter() - tic) / iters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="cpu")
+    parser.add_argument("--batch_size", type=int, default=4096)
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument(
+        "--cases", type=str, nargs="+", default=list(CASES), choices=list(CASES)
+    )
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    paddle.set_device(args.device)
+    ppsci.utils.misc.set_random_seed(42)
+    for case in args.cases:
+        build_equation, input_keys, output_keys = CASES[case]
+        exprs = [
+            expr
+            for expr in build_equation().equations.values()
+            if isinstance(expr, sp.Basic)
+        ]
+        model = ppsci.arch.MLP(
+            tuple(key for key in input_keys if not key.startswith("normal")),
+            output_keys,
+            5,
+            64,
+            "tanh",
+        )
+        separate_funcs = [ppsci.lambdify(expr, model) for expr in exprs]
+        shared_funcs = ppsci.lambdify(exprs, model)
+
+        input_dict = {}
+        for key in input_keys:
+            input_dict[key] = paddle.rand([args.batch_size, 1])
+            input_dict[key].stop_gradient = False
+        cost_separate = timeit(separate_funcs, model, input_dict, args.iters)
+        cost_shared = timeit(shared_funcs, model, input_dict, args.iters)
+
+        separate_nodes = [
+            node for func in separate_funcs for node in func.callable_nodes
+        ]
+        shared_nodes = {
+            id(node) for func in shared_funcs for node in func.callable_nodes
+        }
+        logger.message(
+            f"{case}: separate[built: {len(separate_nodes)}, "
+            f"distinct: {len({node.key for node in separate_nodes})}, "
+            f"time: {cost_separate * 1000:.2f} ms], "
+            f"shared[built: {len(shared_nodes)}, distinct: {len(shared_nodes)}, "
+            f"time: {cost_shared * 1000:.2f} ms]"
+        )
@@ -0,0 +1,143 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Step time, reverse sweeps and peak memory of a Poisson residual with different
+ways of computing Laplacian, for 2D, 3D and 10D inputs.
+
+Two methods are measured:
+    1. hessian: sum of second derivatives, as `ppsci.equation.Poisson` does.
+    2. hutchinson: `ppsci.autodiff.laplacian` with "hutchinson" method.
+
+"exact" method of `ppsci.autodiff.laplacian` computes the same second derivatives
+as "hessian" with the same number of reverse sweeps, so it is not measured.
+
+Each (dim, method) runs in a fresh subprocess, as peak RSS of a process never
+decreases. Peak memory is the maximum allocated GPU memory on gpu and peak RSS on cpu.
+
+Usage:
+    python benchmark/laplacian_poisson.py --device gpu --dims 2 3 10 --num_probes 1
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+import paddle
+
+import ppsci
+from ppsci.utils import logger
+
+METHODS = ("hessian", "hutchinson")
+
+
+def run_child(args):
+    ppsci.utils.misc.set_random_seed(42)
+    paddle.set_device(args.device)
+    dim = args.dims[0]
+    method = args.methods[0]
+    input_keys = tuple(f"x{i}" for i in range(dim))
+    model = ppsci.arch.MLP(input_keys, ("p",), 5, 64, "tanh")
+
+    pde = ppsci.equation.PDE()
+    invars = pde.create_symbols(" ".join(input_keys))
+    p = pde.create_function("p", invars)
+    if method == "hessian":
+        lap = sum(p.diff(invar, 2) for invar in invars)
+    else:
+        lap = pde.create_laplacian(p, invars, "hutchinson", args.num_probes)
+    residual = ppsci.lambdify(-lap - 1, model)
+
+    input_dict = {}
+    for key in input_keys:
+        input_dict[key] = paddle.rand([args.batch_size, 1])
+        input_dict[key].stop_gradient = False
+
+    def step():
+        res = residual({**input_dict})
+        loss = (res**2).mean()
+        loss.backward()
+        model.clear_gradients()
+        ppsci.autodiff.clear()
+
+    step()
+    if args.device != "cpu":
+        paddle.device.synchronize()
+    ppsci.autodiff.num_reverse_sweeps(reset=True)
+    tic = time.perf_counter()
+    for _ in range(args.iters):
+        step()
+    if args.device != "cpu":
+        paddle.device.synchronize()
+    cost = (time.perf_counter() - tic) / args.iters
+    num_sweeps = ppsci.autodiff.num_reverse_sweeps() / args.iters
+    if args.device == "gpu":
+        peak_mem = paddle.device.cuda.max_memory_allocated() / 1024**2
+    else:
+        # ru_maxrss is in kilobytes on linux
+        peak_mem = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"RESULT {peak_mem:.1f} {cost:.4f} {num_sweeps:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="gpu")
+    parser.add_argument("--batch_size", type=int, default=8192)
+    parser.add_argument("--iters", type=int, default=20)
+    parser.add_argument("--dims", type=int, nargs="+", default=[2, 3, 10])
+    parser.add_argument(
+        "--methods", type=str, nargs="+", default=list(METHODS), choices=METHODS
+    )
+    parser.add_argument("--num_probes", type=int, default=1)
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        logger.init_logger("ppsci", None, "error")
+        run_child(args)
+        sys.exit(0)
+
+    logger.init_logger("ppsci", None, "info")
+    for dim in args.dims:
+        for method in args.methods:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--child",
+                    "--device",
+                    args.device,
+                    "--batch_size",
+                    str(args.batch_size),
+                    "--iters",
+                    str(args.iters),
+                    "--dims",
+                    str(dim),
+                    "--methods",
+                    method,
+                    "--num_probes",
+                    str(args.num_probes),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            peak_mem, cost, num_sweeps = output.split("RESULT")[-1].split()
+            logger.message(
+                f"dim: {dim}, method: {method}, reverse sweeps: {num_sweeps}, "
+                f"step time: {float(cost) * 1000:.2f} ms, peak memory: {peak_mem} MB"
+            )
@@ -0,0 +1,116 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of `Mesh.random_boundary_points`, vectorized sampler versus the
+former per-triangle python loop.
+
+STL files of aneurysm and bracket examples should be downloaded into
+`examples/aneurysm/stl` and `examples/bracket/stl` at first.
+
+Usage:
+    python benchmark/mesh_surface_sampling.py --npoint 100000
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import numpy as np
+import paddle
+
+import ppsci
+from ppsci.geometry import mesh
+from ppsci.utils import logger
+
+
+def loop_random_boundary_points(geom: mesh.Mesh, n: int, random: str = "pseudo"):
+    """Per-triangle sampling loop, kept here as reference."""
+    triangle_area = mesh.area_of_triangles(geom.v0, geom.v1, geom.v2)
+    triangle_prob = triangle_area / np.linalg.norm(triangle_area, ord=1)
+    npoint_per_triangle = np.random.choice(
+        np.arange(len(triangle_prob)), n, p=triangle_prob
+    )
+    npoint_per_triangle, _ = np.histogram(
+        npoint_per_triangle, np.arange(len(triangle_prob) + 1) - 0.5
+    )
+
+    points = []
+    normal = []
+    areas = []
+    for i, npoint in enumerate(npoint_per_triangle):
+        if npoint == 0:
+            continue
+        points.append(
+            mesh.sample_in_triangle(geom.v0[i], geom.v1[i], geom.v2[i], npoint, random)
+        )
+        normal.append(
+            np.tile(geom.face_normal[i], (npoint, 1)).astype(paddle.get_default_dtype())
+        )
+        areas.append(
+            np.full(
+                (npoint, 1),
+                triangle_area[i] / npoint,
+                dtype=paddle.get_default_dtype(),
+            )
+        )
+
+    return (
+        np.concatenate(points, axis=0),
+        np.concatenate(normal, axis=0),
+        np.concatenate(areas, axis=0),
+    )
+
+
+def timeit(func, repeat: int) -> float:
+    func()
+    tic = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - tic) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--npoint", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--stl_dirs",
+        type=str,
+        nargs="+",
+        default=["./examples/aneurysm/stl", "./examples/bracket/stl"],
+    )
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    stl_files = sorted(
+        sum([glob.glob(os.path.join(d, "*.stl")) for d in args.stl_dirs], [])
+    )
+    if len(stl_files) == 0:
+        raise FileNotFoundError(f"No stl file found in {args.stl_dirs}.")
+
+    for stl_file in stl_files:
+        geom = ppsci.geometry.Mesh(stl_file)
+        cost_loop = timeit(
+            lambda: loop_random_boundary_points(geom, args.npoint), args.repeat
+        )
+        cost_vec = timeit(lambda: geom.random_boundary_points(args.npoint), args.repeat)
+        _, _, areas = geom.random_boundary_points(args.npoint)
+        logger.message(
+            f"{os.path.basename(stl_file)}: num_faces={geom.num_faces}, "
+            f"loop: {cost_loop * 1000:.2f} ms, vectorized: {cost_vec * 1000:.2f} ms, "
+            f"speedup: {cost_loop / cost_vec:.1f}x, "
+            f"area: {areas.sum():.6f}(exact: {geom.triangle_areas.sum():.6f})"
+        )
@@ -0,0 +1,107 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of autoregressive generation of `PhysformerGPT2`.
+
+Three paths are measured:
+    1. last-token: the former path, only the last token is fed at each step without
+       any context.
+    2. re-encode: the whole generated sequence is re-encoded at each step.
+    3. kv-cache: incremental decoding with preallocated key/value cache.
+
+Path 2 and 3 should give the same outputs.
+
+Usage:
+    python benchmark/physx_generation.py --device gpu --max_length 256
+"""
+
+import argparse
+import time
+
+import paddle
+
+import ppsci
+from ppsci.utils import logger
+
+
+@paddle.no_grad()
+def generate_last_token(model: ppsci.arch.PhysformerGPT2, x, max_length):
+    cur_len = x.shape[1]
+    while cur_len < max_length:
+        next_output = model.forward_tensor(x[:, -1:])[0][:, -1:]
+        x = paddle.concat([x, next_output], axis=1)
+        cur_len += 1
+    return x
+
+
+def timeit(func, repeat: int, device: str):
+    func()
+    if device != "cpu":
+        paddle.device.synchronize()
+    tic = time.perf_counter()
+    for _ in range(repeat):
+        outputs = func()
+    if device != "cpu":
+        paddle.device.synchronize()
+    return outputs, (time.perf_counter() - tic) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--device", type=str, default="gpu")
+    parser.add_argument("--batch_size", type=int, default=16)
+    parser.add_argument("--max_length", type=int, default=256)
+    parser.add_argument("--num_layers", type=int, default=4)
+    parser.add_argument("--num_ctx", type=int, default=64)
+    parser.add_argument("--embed_size", type=int, default=32)
+    parser.add_argument("--num_heads", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    paddle.set_device(args.device)
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.PhysformerGPT2(
+        ("embeds",),
+        ("pred_embeds",),
+        args.num_layers,
+        args.num_ctx,
+        args.embed_size,
+        args.num_heads,
+    )
+    model.eval()
+    x = paddle.randn([args.batch_size, 1, args.embed_size])
+    nstep = args.max_length - 1
+
+    _, cost_last = timeit(
+        lambda: generate_last_token(model, x, args.max_length), args.repeat, args.device
+    )
+    out_full, cost_full = timeit(
+        lambda: model.generate(x, args.max_length, use_cache=False),
+        args.repeat,
+        args.device,
+    )
+    out_cache, cost_cache = timeit(
+        lambda: model.generate(x, args.max_length, use_cache=True),
+        args.repeat,
+        args.device,
+    )
+    logger.message(
+        f"last-token: {nstep / cost_last:.1f} steps/s, "
+        f"re-encode: {nstep / cost_full:.1f} steps/s, "
+        f"kv-cache: {nstep / cost_cache:.1f} steps/s, "
+        f"max abs diff(kv-cache vs re-encode): "
+        f"{float((out_cache - out_full).abs().max()):.3e}"
+    )
@@ -0,0 +1,84 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of `PointCloud.is_inside`, KD-tree backend versus chunked
+brute-force fallback.
+
+Half of the query points are taken from the point cloud (with a perturbation smaller
+than `atol`), the other half are random points. The former `(N, M, ndim)` broadcast
+is not measured, for it needs N * M * ndim bytes (3e10 for the default setting).
+
+Usage:
+    python benchmark/pointcloud_membership.py --npoint 100000 --nquery 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import ppsci
+from ppsci.utils import logger
+
+
+def benchmark(geom: ppsci.geometry.PointCloud, query: np.ndarray, use_tree: bool):
+    # False means brute-force fallback
+    geom._interior_tree = None if use_tree else False
+    tic = time.perf_counter()
+    mask = geom.is_inside(query)
+    return mask, time.perf_counter() - tic
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--npoint", type=int, default=100000)
+    parser.add_argument("--nquery", type=int, default=100000)
+    parser.add_argument("--ndim", type=int, default=3)
+    parser.add_argument("--chunk_size", type=int, default=256)
+    parser.add_argument(
+        "--skip_bruteforce", action="store_true", help="Only run KD-tree backend."
+    )
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    keys = ("x", "y", "z", "t")[: args.ndim]
+    points = np.random.rand(args.npoint, args.ndim).astype("float32")
+    geom = ppsci.geometry.PointCloud(
+        {key: points[:, i : i + 1] for i, key in enumerate(keys)},
+        keys,
+        chunk_size=args.chunk_size,
+    )
+
+    nhit = args.nquery // 2
+    query = np.concatenate(
+        [
+            points[np.random.choice(args.npoint, nhit)]
+            + np.random.uniform(-5e-7, 5e-7, (nhit, args.ndim)).astype("float32"),
+            np.random.rand(args.nquery - nhit, args.ndim).astype("float32"),
+        ]
+    )
+
+    mask_tree, cost_tree = benchmark(geom, query, True)
+    logger.message(
+        f"KD-tree: {cost_tree:.3f} s(including build), "
+        f"{mask_tree.sum()}/{args.nquery} points inside"
+    )
+    if not args.skip_bruteforce:
+        mask_bf, cost_bf = benchmark(geom, query, False)
+        logger.message(
+            f"brute-force: {cost_bf:.3f} s, {mask_bf.sum()}/{args.nquery} points "
+            f"inside, speedup: {cost_bf / cost_tree:.1f}x, "
+            f"consistent: {bool((mask_tree == mask_bf).all())}"
+        )
@@ -0,0 +1,86 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""
+Memory report of `CylinderDataset`, sliding windows sliced on demand from trajectories
+versus windows materialized as the former `read_data` did.
+
+Settings of examples/cylinder/2d_unsteady/transformer_physx are reported by default,
+the dataset should be downloaded into `--file_path` at first.
+
+Usage:
+    python benchmark/trphysx_dataset_memory.py --file_path ./datasets/cylinder_training.hdf5
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+import ppsci
+from ppsci.utils import logger
+
+
+def report(file_path: str, block_size: int, stride: int):
+    tracemalloc.start()
+    tic = time.perf_counter()
+    dataset = ppsci.data.dataset.CylinderDataset(
+        file_path,
+        ("states", "visc"),
+        ("pred_states", "recover_states"),
+        block_size,
+        stride,
+    )
+    cost = time.perf_counter() - tic
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # former layout keeps every window as a copy
+    windows_nbytes = len(dataset) * block_size * dataset.trajectories[0].nbytes
+    # every window can be sliced from trajectories without copy
+    start = dataset.window_starts[-1]
+    assert np.shares_memory(
+        dataset[len(dataset) - 1][0]["states"], dataset.trajectories
+    )
+    assert (dataset.trajectories[start : start + block_size] == dataset.data[-1]).all()
+    logger.message(
+        f"block_size={block_size}, stride={stride}, windows={len(dataset)}: "
+        f"materialized: {windows_nbytes / 2**20:.1f} MB, "
+        f"on-demand: {dataset.trajectories.nbytes / 2**20:.1f} MB "
+        f"({windows_nbytes / dataset.trajectories.nbytes:.2f}x smaller), "
+        f"peak during construction: {peak / 2**20:.1f} MB, "
+        f"construction: {cost:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--file_path", type=str, default="./datasets/cylinder_training.hdf5"
+    )
+    parser.add_argument(
+        "--settings",
+        type=int,
+        nargs="+",
+        default=[16, 4, 4, 16],
+        help="Pairs of block_size and stride, defaults to settings of "
+        "train_transformer.py and train_enn.py.",
+    )
+    args = parser.parse_args()
+
+    logger.init_logger("ppsci", None, "info")
+    for block_size, stride in zip(args.settings[::2], args.settings[1::2]):
+        report(args.file_path, block_size, stride)
@@ -25,6 +25,7 @@ from ppsci import utils  # isort:skip
 from ppsci import visualize  # isort:skip
 from ppsci import validate  # isort:skip
 from ppsci import solver  # isort:skip
+from ppsci import inference  # isort:skip
 from ppsci import experimental  # isort:skip
 
 from ppsci.utils.checker import run_check  # isort:skip
@@ -45,6 +46,7 @@ __all__ = [
     "visualize",
     "validate",
     "solver",
+    "inference",
     "experimental",
     "run_check",
     "run_check_mesh",
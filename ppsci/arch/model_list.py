@@ -14,11 +14,15 @@
 
 from __future__ import annotations
 
+from typing import Dict
+from typing import List
 from typing import Tuple
 
+import paddle
 from paddle import nn
 
 from ppsci.arch import base
+from ppsci.arch import mlp
 
 
 class ModelList(base.Arch):
@@ -26,17 +30,26 @@ class ModelList(base.Arch):
 
     Args:
         model_list (Tuple[base.Arch, ...]): Model(s) nesteed in tuple.
+        stacked (bool, optional): Whether to evaluate structurally identical MLPs
+            together, i.e. MLPs with the same input keys, layer shapes, activations
+            and skip connection. Weights of each layer in such group are stacked
+            into shape of [n_models, in, out] at every forward pass, then computed
+            by one batched matmul. Parameters still belong to each model, so
+            optimizers and checkpoints are not affected. Defaults to False.
 
     Examples:
         >>> import ppsci
         >>> model1 = ppsci.arch.MLP(("x", "y"), ("u", "v"), 10, 128)
         >>> model2 = ppsci.arch.MLP(("x", "y"), ("w", "p"), 5, 128)
         >>> model = ppsci.arch.ModelList((model1, model2))
+        >>> model3 = ppsci.arch.MLP(("x", "y"), ("w", "p"), 10, 128)
+        >>> model = ppsci.arch.ModelList((model1, model3), stacked=True)
     """
 
     def __init__(
         self,
         model_list: Tuple[base.Arch, ...],
+        stacked: bool = False,
     ):
         super().__init__()
         output_keys_set = set()
@@ -49,11 +62,75 @@ class ModelList(base.Arch):
             output_keys_set = output_keys_set | set(model.output_keys)
 
         self.model_list = nn.LayerList(model_list)
+        self.stacked = stacked
+        self._stacked_groups = self._group_stackable_models() if stacked else []
+
+    def _group_stackable_models(self) -> List[List[int]]:
+        """Group indices of structurally identical MLPs, groups with only one model
+        are discarded.
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for i, model in enumerate(self.model_list):
+            if type(model) is not mlp.MLP:
+                continue
+            if not all(isinstance(linear, nn.Linear) for linear in model.linears):
+                continue
+            # activations from act_func_dict are shared instances, so models
+            # with the same activation objects compute the same function
+            signature = (
+                tuple(model.input_keys),
+                model.skip_connection,
+                tuple(tuple(linear.weight.shape) for linear in model.linears),
+                tuple(model.last_fc.weight.shape),
+                tuple(id(act) for act in model.acts),
+            )
+            groups.setdefault(signature, []).append(i)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _forward_stacked(self, x, models: List[mlp.MLP]) -> List[paddle.Tensor]:
+        """Evaluate structurally identical MLPs with batched matmul.
+
+        Returns:
+            List[paddle.Tensor]: Output tensor of each model.
+        """
+        model0 = models[0]
+        # [N, in] @ [n_models, in, out] -> [n_models, N, out]
+        y = model0.concat_to_tensor(x, model0.input_keys, axis=-1)
+        skip = None
+        for i in range(len(model0.linears)):
+            weight = paddle.stack([model.linears[i].weight for model in models])
+            bias = paddle.stack([model.linears[i].bias for model in models])
+            y = paddle.matmul(y, weight) + bias.unsqueeze(1)
+            if model0.skip_connection and i % 2 == 0:
+                if skip is not None:
+                    skip = y
+                    y = y + skip
+                else:
+                    skip = y
+            y = model0.acts[i](y)
+
+        weight = paddle.stack([model.last_fc.weight for model in models])
+        bias = paddle.stack([model.last_fc.bias for model in models])
+        y = paddle.matmul(y, weight) + bias.unsqueeze(1)
+        return paddle.unbind(y, axis=0)
 
     def forward(self, x):
+        y_list = [None] * len(self.model_list)
+        for group in self._stacked_groups:
+            models = [self.model_list[i] for i in group]
+            # input transform may differ between models, skip stacking
+            if any(model._input_transform is not None for model in models):
+                continue
+            for i, y in zip(group, self._forward_stacked(x, models)):
+                model = self.model_list[i]
+                y = model.split_to_dict(y, model.output_keys, axis=-1)
+                if model._output_transform is not None:
+                    y = model._output_transform(x, y)
+                y_list[i] = y
+
         y_all = {}
-        for model in self.model_list:
-            y = model(x)
+        for i, model in enumerate(self.model_list):
+            y = y_list[i] if y_list[i] is not None else model(x)
             y_all.update(y)
 
         return y_all
@@ -87,7 +87,13 @@ class MaskedAttention(nn.Layer):
             attn = attn / (float(value.shape[-1]) ** 0.5)
 
         nd, ns = attn.shape[-2], attn.shape[-1]
-        mask = self.bias[:, :, ns - nd : ns, :ns]
+        if ns <= self.bias.shape[-1]:
+            mask = self.bias[:, :, ns - nd : ns, :ns]
+        else:
+            # sequence with cached context may be longer than num_ctx
+            mask = paddle.tril(paddle.ones((ns, ns), dtype="int32"))[
+                ns - nd : ns
+            ].reshape([1, 1, nd, ns])
         attn = paddle.where(mask > 0, attn, self.masked_bias.cast(attn.dtype))
 
         if attention_mask is not None:
@@ -125,14 +131,47 @@ class MaskedAttention(nn.Layer):
         attention_mask=None,
         head_mask=None,
         output_attentions=False,
+        use_cache=False,
+        cache_index=None,
     ):
+        """Compute masked self-attention.
+
+        Args:
+            x (Tensor): Input tensor with shape of [B, T, C].
+            layer_past (Optional[Tuple[Tensor, Tensor]]): Key and value of previous
+                tokens with shape of [B, num_heads, T_past, C // num_heads].
+                Defaults to None.
+            attention_mask (Optional[Tensor]): Additive attention mask.
+                Defaults to None.
+            head_mask (Optional[Tensor]): Multiplicative head mask. Defaults to None.
+            output_attentions (bool, optional): Whether to output attention weights.
+                Defaults to False.
+            use_cache (bool, optional): Whether to output present key and value.
+                Defaults to False.
+            cache_index (Optional[int]): If given, `layer_past` will be treated as
+                preallocated buffers with shape of [B, num_heads, max_length,
+                C // num_heads], whose first `cache_index` tokens are valid. Key and
+                value of `x` will be written into buffers in-place.
+                Defaults to None.
+
+        Returns:
+            List[Tensor]: Output tensor, present key and value(if use_cache is True)
+                and attention weights(if output_attentions is True).
+        """
         x = self.qkv_proj(x)
         query, key, value = x.split(x.shape[2] // self.split_size, axis=2)
         query = self.split_heads(query)
         key = self.split_heads(key, k=True)
         value = self.split_heads(value)
-        # Concat previous key and value tensors
-        if layer_past is not None:
+        if layer_past is not None and cache_index is not None:
+            # Write current key and value into preallocated buffers
+            end_index = cache_index + value.shape[-2]
+            layer_past[0][:, :, cache_index:end_index] = key.transpose([0, 1, 3, 2])
+            layer_past[1][:, :, cache_index:end_index] = value
+            key = layer_past[0][:, :, :end_index].transpose([0, 1, 3, 2])
+            value = layer_past[1][:, :, :end_index]
+        elif layer_past is not None:
+            # Concat previous key and value tensors
             past_key, past_value = layer_past[0].transpose([0, 1, 3, 2]), layer_past[1]
             key = paddle.concat((past_key, key), axis=-1)
             value = paddle.concat((past_value, value), axis=-2)
@@ -145,7 +184,10 @@ class MaskedAttention(nn.Layer):
         output = self.out_proj(output)
         output = self.proj_drop(output)
 
-        outputs = [output] + attn_outputs[1:]
+        outputs = [output]
+        if use_cache:
+            outputs.append((key.transpose([0, 1, 3, 2]), value))
+        outputs += attn_outputs[1:]
         return outputs
 
 
@@ -221,6 +263,8 @@ class Block(nn.Layer):
         attention_mask=None,
         head_mask=None,
         output_attentions=False,
+        use_cache=False,
+        cache_index=None,
     ):
         # Evaluate attention heads
         output_attn = self.attn.forward(
@@ -229,6 +273,8 @@ class Block(nn.Layer):
             attention_mask=attention_mask,
             head_mask=head_mask,
             output_attentions=output_attentions,
+            use_cache=use_cache,
+            cache_index=cache_index,
         )
         x = x + output_attn[0]
         m = self.mlp(self.ln_2(x))
@@ -307,11 +353,11 @@ class PhysformerGPT2(base.Arch):
             zeros_(module.bias)
             ones_(module.weight)
 
-    def get_position_embed(self, x):
+    def get_position_embed(self, x, past_length=0):
         B, N, _ = x.shape
-        position_ids = paddle.arange(0, N, dtype=paddle.get_default_dtype()).reshape(
-            [1, N, 1]
-        )
+        position_ids = paddle.arange(
+            past_length, past_length + N, dtype=paddle.get_default_dtype()
+        ).reshape([1, N, 1])
         position_ids = position_ids.repeat_interleave(B, axis=0)
 
         position_embeds = paddle.zeros_like(x)
@@ -324,7 +370,7 @@ class PhysformerGPT2(base.Arch):
         )
         return position_embeds
 
-    def _generate_time_series(self, x, max_length):
+    def _generate_time_series(self, x, max_length, use_cache=True):
         cur_len = x.shape[1]
         if cur_len >= max_length:
             raise ValueError(
@@ -332,32 +378,57 @@ class PhysformerGPT2(base.Arch):
                 f"the length of input context({cur_len})"
             )
 
+        B, _, C = x.shape
+        outputs = paddle.zeros([B, max_length, C], dtype=x.dtype)
+        outputs[:, :cur_len] = x
+        layer_pasts = None
+        if use_cache:
+            # preallocate key and value cache of each layer with max_length
+            cache_shape = [B, self.num_heads, max_length, C // self.num_heads]
+            layer_pasts = [
+                (paddle.zeros(cache_shape, x.dtype), paddle.zeros(cache_shape, x.dtype))
+                for _ in range(self.num_layers)
+            ]
+
+        past_length = 0
+        model_inputs = x
         while cur_len < max_length:
-            model_inputs = x[:, -1:]
-            outputs = self.forward_tensor(model_inputs)
-            next_output = outputs[0][:, -1:]
-            x = paddle.concat([x, next_output], axis=1)
+            if use_cache:
+                next_output = self.forward_tensor(
+                    model_inputs, layer_pasts, past_length
+                )[0][:, -1:]
+                past_length += model_inputs.shape[1]
+                model_inputs = next_output
+            else:
+                # re-encode the whole sequence at each step
+                next_output = self.forward_tensor(outputs[:, :cur_len])[0][:, -1:]
+            outputs[:, cur_len : cur_len + 1] = next_output
             cur_len = cur_len + 1
-        return x
+        return outputs
 
     @paddle.no_grad()
-    def generate(self, x, max_length=256):
+    def generate(self, x, max_length=256, use_cache=True):
         if max_length <= 0:
             raise ValueError(
                 "max_length({max_length}) should be a strictly positive integer."
             )
-        outputs = self._generate_time_series(x, max_length)
+        outputs = self._generate_time_series(x, max_length, use_cache)
         return outputs
 
-    def forward_tensor(self, x):
-        position_embeds = self.get_position_embed(x)
+    def forward_tensor(self, x, layer_pasts=None, past_length=0):
+        position_embeds = self.get_position_embed(x, past_length)
         # Combine input embedding, position embeding
         hidden_states = x + position_embeds
         hidden_states = self.drop(hidden_states)
 
         # Loop through transformer self-attention layers
-        for block in self.blocks:
-            block_outputs = block(hidden_states)
+        for i, block in enumerate(self.blocks):
+            if layer_pasts is None:
+                block_outputs = block(hidden_states)
+            else:
+                block_outputs = block(
+                    hidden_states, layer_past=layer_pasts[i], cache_index=past_length
+                )
             hidden_states = block_outputs[0]
         outputs = self.linear(self.ln(hidden_states))
         return (outputs,)
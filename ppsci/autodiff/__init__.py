@@ -12,6 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from ppsci.autodiff.ad import DerivativeCache
 from ppsci.autodiff.ad import clear
+from ppsci.autodiff.ad import current_derivative_cache
 from ppsci.autodiff.ad import hessian
 from ppsci.autodiff.ad import jacobian
+from ppsci.autodiff.ad import laplacian
+from ppsci.autodiff.ad import num_reverse_sweeps
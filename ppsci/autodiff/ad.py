@@ -18,9 +18,62 @@ This module is adapted from [https://github.com/lululxvi/deepxde](https://github
 
 from __future__ import annotations
 
+from typing import Callable
+from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Union
 
+import numpy as np
 import paddle
+from typing_extensions import Literal
+
+# number of reverse sweeps, i.e. calls of `paddle.grad`, done by this module
+_num_reverse_sweeps = 0
+# number of derivative tensors created by reverse sweeps
+_num_grad_nodes = 0
+
+
+def num_reverse_sweeps(reset: bool = False) -> int:
+    """Return number of reverse sweeps(calls of `paddle.grad`) done by jacobian and
+    hessian since the last reset, which measures number of graph traversals for
+    computing derivatives.
+
+    Args:
+        reset (bool, optional): Whether reset counter to 0 after returning.
+            Defaults to False.
+
+    Returns:
+        int: Number of reverse sweeps.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x = paddle.randn([4, 1])
+        >>> x.stop_gradient = False
+        >>> y = x * x
+        >>> _ = ppsci.autodiff.num_reverse_sweeps(reset=True)
+        >>> dy_dx = ppsci.autodiff.jacobian(y, x)
+        >>> ppsci.autodiff.num_reverse_sweeps()
+        1
+    """
+    global _num_reverse_sweeps
+    num = _num_reverse_sweeps
+    if reset:
+        _num_reverse_sweeps = 0
+    return num
+
+
+def _grad(
+    y: "paddle.Tensor", xs: List["paddle.Tensor"], allow_unused: bool = False
+) -> List[Optional["paddle.Tensor"]]:
+    """Compute gradients of y to each of xs in one reverse sweep."""
+    global _num_reverse_sweeps, _num_grad_nodes
+    _num_reverse_sweeps += 1
+    grads = paddle.grad(y, xs, create_graph=True, allow_unused=allow_unused)
+    _num_grad_nodes += sum(grad is not None for grad in grads)
+    return grads
 
 
 class _Jacobian:
@@ -44,6 +97,10 @@ class _Jacobian:
 
         self.J = {}
 
+    def y(self, i: int) -> "paddle.Tensor":
+        """Returns y_i."""
+        return self.ys[:, i : i + 1] if self.dim_y > 1 else self.ys
+
     def __call__(self, i: int = 0, j: Optional[int] = None) -> "paddle.Tensor":
         """Returns J[`i`][`j`]. If `j` is ``None``, returns the gradient of y_i, i.e.,
         J[i].
@@ -54,8 +111,7 @@ class _Jacobian:
             raise ValueError(f"j({j}) should in range [0, {self.dim_x}).")
         # Compute J[i]
         if i not in self.J:
-            y = self.ys[:, i : i + 1] if self.dim_y > 1 else self.ys
-            self.J[i] = paddle.grad(y, self.xs, create_graph=True)[0]
+            self.J[i] = _grad(self.y(i), [self.xs])[0]
 
         return self.J[i] if (j is None or self.dim_x == 1) else self.J[i][:, j : j + 1]
 
@@ -101,10 +157,89 @@ class Jacobians:
             >>> y = x * x
             >>> dy_dx = ppsci.autodiff.jacobian(y, x)
         """
+        return self._get(ys, xs)(i, j)
+
+    def _get(self, ys: "paddle.Tensor", xs: "paddle.Tensor") -> _Jacobian:
         key = (ys, xs)
         if key not in self.Js:
             self.Js[key] = _Jacobian(ys, xs)
-        return self.Js[key](i, j)
+        return self.Js[key]
+
+    def block(
+        self,
+        ys: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+        xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+    ) -> "paddle.Tensor":
+        """Compute dense Jacobian block of all (output component, input) pairs.
+
+        Pairs are grouped by output component, so each output component costs only
+        one reverse sweep for all inputs, and pairs computed before are reused.
+        Computed derivatives are cached, so that later `jacobian(y, x)` of any pair
+        in the block returns cached result without extra reverse sweep.
+
+        Args:
+            ys (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Output tensor(s), each
+                of shape [batch_size, dim_y].
+            xs (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Input tensor(s), each
+                of shape [batch_size, dim_x].
+
+        Returns:
+            paddle.Tensor: Jacobian block of shape [batch_size, sum(dim_y), sum(dim_x)],
+                in which rows and columns are ordered as given ys and xs.
+
+        Examples:
+            >>> import paddle
+            >>> import ppsci
+            >>> x = paddle.randn([4, 1])
+            >>> y = paddle.randn([4, 1])
+            >>> x.stop_gradient = False
+            >>> y.stop_gradient = False
+            >>> u, v = x * y, x + y
+            >>> J = ppsci.autodiff.jacobian.block((u, v), (x, y))
+            >>> J.shape
+            [4, 2, 2]
+        """
+        # NOTE: check sequence instead of tensor, for tensor is not paddle.Tensor
+        # in static graph mode
+        ys = list(ys) if isinstance(ys, (list, tuple)) else [ys]
+        xs = list(xs) if isinstance(xs, (list, tuple)) else [xs]
+        self.prefetch(ys, xs)
+        rows = []
+        for y in ys:
+            jacs = [self._get(y, x) for x in xs]
+            for i in range(y.shape[1]):
+                rows.append(paddle.concat([jac.J[i] for jac in jacs], axis=-1))
+        return paddle.stack(rows, axis=1)
+
+    def prefetch(
+        self,
+        ys: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+        xs: Union["paddle.Tensor", Sequence["paddle.Tensor"]],
+    ):
+        """Compute and cache all (output component, input) pairs like `block`,
+        without assembling them into a dense block.
+
+        Args:
+            ys (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Output tensor(s).
+            xs (Union[paddle.Tensor, Sequence[paddle.Tensor]]): Input tensor(s).
+        """
+        ys = list(ys) if isinstance(ys, (list, tuple)) else [ys]
+        xs = list(xs) if isinstance(xs, (list, tuple)) else [xs]
+        for y in ys:
+            jacs = [self._get(y, x) for x in xs]
+            for i in range(y.shape[1]):
+                self._compute_row(jacs, i)
+
+    def _compute_row(self, jacs: List[_Jacobian], i: int):
+        """Compute i-th rows of given Jacobians sharing the same ys by one reverse
+        sweep, gradient of input not used in computing ys is filled with zeros.
+        """
+        missing = [jac for jac in jacs if i not in jac.J]
+        if not missing:
+            return
+        grads = _grad(missing[0].y(i), [jac.xs for jac in missing], allow_unused=True)
+        for jac, grad in zip(missing, grads):
+            jac.J[i] = paddle.zeros_like(jac.xs) if grad is None else grad
 
     def _clear(self):
         """Clear cached Jacobians."""
@@ -137,6 +272,14 @@ class _Hessian:
         component: Optional[int] = None,
         grad_y: Optional["paddle.Tensor"] = None,
     ):
+        component = self._check_component(ys, component)
+        if grad_y is None:
+            grad_y = jacobian(ys, xs, i=component, j=None)
+        self.H = _Jacobian(grad_y, xs)
+
+    @staticmethod
+    def _check_component(ys: "paddle.Tensor", component: Optional[int]) -> int:
+        """Check `component` against shape of `ys` and return index of it."""
         dim_y = ys.shape[1]
 
         if dim_y > 1:
@@ -154,10 +297,7 @@ class _Hessian:
                     f"component{component} should be set to None when dim_y({dim_y})=1."
                 )
             component = 0
-
-        if grad_y is None:
-            grad_y = jacobian(ys, xs, i=component, j=None)
-        self.H = _Jacobian(grad_y, xs)
+        return component
 
     def __call__(self, i: int = 0, j: int = 0):
         """Returns H[`i`][`j`]."""
@@ -226,7 +366,220 @@ class Hessians:
 hessian = Hessians()
 
 
+class Laplacians:
+    r"""Compute Laplacian, i.e. trace of Hessian matrix of ys to all given inputs.
+
+    $$
+    \rm Laplacian(ys, xs, component) = \sum_i \dfrac{\partial^2 ys_{component}}{\partial xs_i^2}
+    $$
+
+    First derivatives of ys to all inputs are computed by one reverse sweep and
+    shared with `jacobian`. Then "exact" method sums up diagonal terms of Hessian
+    computed by `hessian`, which costs one reverse sweep per input dimension as
+    summing second derivatives does, only sharing cached terms with it. Only
+    "hutchinson" method reduces reverse sweeps, by estimating the trace with
+    Hutchinson's estimator $E_v[v^T H v]$ with Rademacher probe v, which costs one
+    reverse sweep per probe regardless of number of inputs.
+
+    Computed Laplacians will be cached by (output, inputs, component, method,
+    num_probes).
+    """
+
+    def __init__(self):
+        self.Ls = {}
+
+    def __call__(
+        self,
+        ys: "paddle.Tensor",
+        xs: Sequence["paddle.Tensor"],
+        component: Optional[int] = None,
+        method: Literal["exact", "hutchinson"] = "exact",
+        num_probes: int = 1,
+    ) -> "paddle.Tensor":
+        """Compute laplacian for given ys and xs.
+
+        Args:
+            ys (paddle.Tensor): Output tensor.
+            xs (Sequence[paddle.Tensor]): Input tensors, each of shape
+                [batch_size, dim_x].
+            component (Optional[int]): If `y` has the shape (batch_size, dim_y > 1),
+                then `y[:, component]` is used to compute the Laplacian. Do not use if
+                `y` has the shape (batch_size, 1). Defaults to None.
+            method (Literal["exact", "hutchinson"], optional): Method for computing
+                trace of Hessian. Defaults to "exact".
+            num_probes (int, optional): Number of probe vectors for "hutchinson"
+                method. Defaults to 1.
+
+        Returns:
+            paddle.Tensor: Laplacian of shape [batch_size, 1].
+
+        Examples:
+            >>> import paddle
+            >>> import ppsci
+            >>> x = paddle.randn([4, 1])
+            >>> y = paddle.randn([4, 1])
+            >>> x.stop_gradient = False
+            >>> y.stop_gradient = False
+            >>> u = x * x * y
+            >>> lap_u = ppsci.autodiff.laplacian(u, (x, y))
+            >>> lap_u.shape
+            [4, 1]
+        """
+        if method not in ("exact", "hutchinson"):
+            raise ValueError(
+                f"method should be 'exact' or 'hutchinson', but got {method}."
+            )
+        xs = tuple(xs)
+        key = (ys, xs, component, method, num_probes)
+        if key not in self.Ls:
+            i = _Hessian._check_component(ys, component)
+            # first derivatives to all inputs by one reverse sweep
+            jacs = [jacobian._get(ys, x) for x in xs]
+            jacobian._compute_row(jacs, i)
+            if method == "exact":
+                terms = [
+                    hessian(ys, x, component=component, i=j, j=j)
+                    for x in xs
+                    for j in range(x.shape[1])
+                ]
+                self.Ls[key] = paddle.add_n(terms) if len(terms) > 1 else terms[0]
+            else:
+                grads = [jac.J[i] for jac in jacs]
+                self.Ls[key] = self._hutchinson(grads, xs, num_probes)
+        return self.Ls[key]
+
+    @staticmethod
+    def _hutchinson(
+        grads: List["paddle.Tensor"], xs: Sequence["paddle.Tensor"], num_probes: int
+    ) -> "paddle.Tensor":
+        """Estimate trace of Hessian matrix by Hutchinson's estimator.
+
+        Points in a batch are independent, so one reverse sweep of sum(v * grad)
+        gives Hessian-vector products of all points at once.
+        """
+        estimate = paddle.zeros_like(xs[0][:, :1])
+        for _ in range(num_probes):
+            vs = [paddle.randint(0, 2, x.shape).astype(x.dtype) * 2 - 1 for x in xs]
+            grad_dot_v = paddle.add_n([(v * g).sum() for v, g in zip(vs, grads)])
+            hvps = _grad(grad_dot_v, list(xs), allow_unused=True)
+            # hvp is None if grad does not depend on x, i.e. zero Hessian
+            for v, hvp in zip(vs, hvps):
+                if hvp is not None:
+                    estimate = estimate + (v * hvp).sum(axis=1, keepdim=True)
+        return estimate / num_probes
+
+    def _clear(self):
+        """Clear cached Laplacians."""
+        self.Ls = {}
+
+
+# Use high-order differentiation with singleton pattern for convenient
+laplacian = Laplacians()
+
+
 def clear():
-    """Clear cached Jacobians and Hessians."""
+    """Clear cached Jacobians, Hessians and Laplacians."""
     jacobian._clear()
     hessian._clear()
+    laplacian._clear()
+
+
+# stack of entered derivative caches, the last one is active
+_derivative_cache_stack: List["DerivativeCache"] = []
+
+
+class DerivativeCache:
+    """Scoped cache of derivatives keyed by (output key, input key, order), such as
+    ("u", "x", 1) for du/dx and ("u__x", "y", 2) for d^3u/dxdy^2, which is active
+    within a `with` block and used by derivative nodes of `ppsci.lambdify`.
+
+    Counters below are collected during the scope:
+
+    * hits: Number of derivatives found in cache.
+    * misses: Number of derivatives computed.
+    * sweeps: Number of reverse sweeps, see `num_reverse_sweeps`.
+    * nodes: Number of derivative tensors created by reverse sweeps, which are new
+        nodes in computational graph.
+    * retained_bytes: Bytes of derivatives held by cache at the end of scope.
+
+    Jacobians, Hessians and Laplacians cached by tensor are cleared at the end of
+    scope as well.
+
+    Args:
+        stats (Optional[Dict[str, int]]): Dict for accumulating counters at the end of
+            scope, `retained_bytes` is accumulated by maximum while others by sum.
+            Defaults to None.
+
+    Examples:
+        >>> import paddle
+        >>> import ppsci
+        >>> x = paddle.randn([4, 1])
+        >>> x.stop_gradient = False
+        >>> y = x * x
+        >>> compute_func = lambda: ppsci.autodiff.jacobian(y, x)
+        >>> with ppsci.autodiff.DerivativeCache() as cache:
+        ...     dy_dx = cache.lookup(("y", "x", 1), compute_func)
+        ...     dy_dx = cache.lookup(("y", "x", 1), compute_func)
+        >>> cache.hits, cache.misses
+        (1, 1)
+    """
+
+    def __init__(self, stats: Optional[Dict[str, int]] = None):
+        self.stats = stats
+        self.cache: Dict[tuple, "paddle.Tensor"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.sweeps = 0
+        self.nodes = 0
+        self.retained_bytes = 0
+
+    def lookup(
+        self, key: tuple, compute_func: Callable[[], "paddle.Tensor"]
+    ) -> "paddle.Tensor":
+        """Return cached derivative of given key, or compute and cache it by
+        `compute_func` if not found.
+
+        Args:
+            key (tuple): Key of (output key, input key, order).
+            compute_func (Callable[[], paddle.Tensor]): Function for computing
+                derivative.
+
+        Returns:
+            paddle.Tensor: Derivative of given key.
+        """
+        if key in self.cache:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.cache[key] = compute_func()
+        return self.cache[key]
+
+    def __enter__(self) -> "DerivativeCache":
+        _derivative_cache_stack.append(self)
+        self._sweeps_start = _num_reverse_sweeps
+        self._nodes_start = _num_grad_nodes
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _derivative_cache_stack.pop()
+        self.sweeps += _num_reverse_sweeps - self._sweeps_start
+        self.nodes += _num_grad_nodes - self._nodes_start
+        if paddle.in_dynamic_mode():
+            # shapes are unknown in static graph mode
+            self.retained_bytes = sum(
+                int(np.prod(value.shape)) * value.element_size()
+                for value in self.cache.values()
+            )
+        if self.stats is not None:
+            for key in ("hits", "misses", "sweeps", "nodes"):
+                self.stats[key] = self.stats.get(key, 0) + getattr(self, key)
+            self.stats["retained_bytes"] = max(
+                self.stats.get("retained_bytes", 0), self.retained_bytes
+            )
+        self.cache = {}
+        clear()
+
+
+def current_derivative_cache() -> Optional[DerivativeCache]:
+    """Return the active derivative cache, or None if not within any scope."""
+    return _derivative_cache_stack[-1] if _derivative_cache_stack else None
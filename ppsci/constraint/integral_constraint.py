@@ -29,7 +29,6 @@ from typing_extensions import Literal
 from ppsci import geometry
 from ppsci.constraint import base
 from ppsci.data import dataset
-from ppsci.utils import misc
 
 if TYPE_CHECKING:
     from ppsci import loss
@@ -99,15 +98,12 @@ class IntegralConstraint(base.Constraint):
             criteria = eval(criteria)
 
         # prepare input
-        input_list = []
-        for _ in range(
-            dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"]
-        ):
-            input = geom.sample_boundary(
-                dataloader_cfg["integral_batch_size"], random, criteria
-            )
-            input_list.append(input)
-        input = misc.stack_dict_list(input_list)
+        input = geom.sample_boundary_batched(
+            dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"],
+            dataloader_cfg["integral_batch_size"],
+            random,
+            criteria,
+        )
         # shape of each input is [batch_size, integral_batch_size, ndim]
 
         # prepare label
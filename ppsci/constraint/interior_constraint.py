@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import math
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
@@ -22,12 +23,18 @@ from typing import Optional
 from typing import Union
 
 import numpy as np
+import paddle
 import sympy
+from paddle import io
+from paddle import nn
 from typing_extensions import Literal
 
+from ppsci import autodiff
 from ppsci import geometry
 from ppsci.constraint import base
+from ppsci.data import dataloader
 from ppsci.data import dataset
+from ppsci.utils import logger
 
 if TYPE_CHECKING:
     from ppsci import loss
@@ -56,6 +63,14 @@ class InteriorConstraint(base.Constraint):
         compute_sdf_derivatives (Optional[bool]): Whether compute derivatives for SDF.
             Defaults to False.
         name (str, optional): Name of constraint object. Defaults to "EQ".
+        rar_cfg (Optional[Dict[str, Any]]): Config of residual-based adaptive
+            refinement(RAR), which resamples points with largest residual every
+            "freq" epochs during training, such as {"freq": 100, "num_candidates":
+            100000, "num_refine": 1000, "mode": "add", "batch_size": 8192}. "mode"
+            can be "add"(append refined points to dataset) or "replace"(replace points
+            with smallest residual in dataset). Unset items default to "freq": 1,
+            "num_refine": 1000, "mode": "add", "batch_size": 8192 and
+            "num_candidates": 100 * num_refine. Defaults to None.
 
     Examples:
         >>> import ppsci
@@ -87,8 +102,11 @@ class InteriorConstraint(base.Constraint):
         weight_dict: Optional[Dict[str, Union[Callable, float]]] = None,
         compute_sdf_derivatives: bool = False,
         name: str = "EQ",
+        rar_cfg: Optional[Dict[str, Any]] = None,
     ):
         self.label_dict = label_dict
+        self.geom = geom
+        self.weight_dict = weight_dict
         self.input_keys = geom.dim_keys
         self.output_keys = tuple(label_dict.keys())
         self.output_expr = {
@@ -101,6 +119,36 @@ class InteriorConstraint(base.Constraint):
         if isinstance(criteria, str):
             criteria = eval(criteria)
 
+        # keep sampling config for adaptive refinement
+        self.random = random
+        self.criteria = criteria
+        self.compute_sdf_derivatives = compute_sdf_derivatives
+        self.rar_cfg = rar_cfg
+        if self.rar_cfg is not None:
+            if isinstance(geom, geometry.Mesh):
+                raise NotImplementedError(
+                    "rar_cfg is not supported for Mesh geometry yet."
+                )
+            self.rar_cfg = {
+                "freq": 1,
+                "num_refine": 1000,
+                "mode": "add",
+                "batch_size": 8192,
+                **self.rar_cfg,
+            }
+            if "num_candidates" not in self.rar_cfg:
+                self.rar_cfg["num_candidates"] = self.rar_cfg["num_refine"] * 100
+            if self.rar_cfg["mode"] not in ("add", "replace"):
+                raise ValueError(
+                    f"rar_cfg['mode'] should be 'add' or 'replace', "
+                    f"but got {self.rar_cfg['mode']}"
+                )
+            if not isinstance(self.rar_cfg["freq"], int) or self.rar_cfg["freq"] < 1:
+                raise ValueError(
+                    f"rar_cfg['freq'] should be a positive integer, "
+                    f"but got {self.rar_cfg['freq']}"
+                )
+
         # prepare input
         input = geom.sample_interior(
             dataloader_cfg["batch_size"] * dataloader_cfg["iters_per_epoch"],
@@ -113,18 +161,46 @@ class InteriorConstraint(base.Constraint):
             input["area"] *= dataloader_cfg["iters_per_epoch"]
 
         # prepare label
+        label = self._prepare_label(input)
+
+        # prepare weight
+        weight = self._prepare_weight(input, label)
+
+        if "sdf" in input:
+            input.pop("sdf")
+
+        # wrap input, label, weight into a dataset
+        if isinstance(dataloader_cfg["dataset"], str):
+            dataloader_cfg["dataset"] = {"name": dataloader_cfg["dataset"]}
+        dataloader_cfg["dataset"].update(
+            {"input": input, "label": label, "weight": weight}
+        )
+        _dataset = dataset.build_dataset(dataloader_cfg["dataset"])
+
+        # construct dataloader with dataset and dataloader_cfg
+        super().__init__(_dataset, dataloader_cfg, loss, name)
+
+    def _prepare_label(self, input: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Compute label for given input points according to `label_dict`.
+
+        Args:
+            input (Dict[str, np.ndarray]): Input points.
+
+        Returns:
+            Dict[str, np.ndarray]: Label dict.
+        """
         label = {}
-        for key, value in label_dict.items():
+        for key, value in self.label_dict.items():
             if isinstance(value, (int, float)):
                 label[key] = np.full_like(next(iter(input.values())), value)
             elif isinstance(value, sympy.Basic):
                 func = sympy.lambdify(
-                    sympy.symbols(geom.dim_keys),
+                    sympy.symbols(self.geom.dim_keys),
                     value,
                     [{"amax": lambda xy, _: np.maximum(xy[0], xy[1])}, "numpy"],
                 )
                 label[key] = func(
-                    **{k: v for k, v in input.items() if k in geom.dim_keys}
+                    **{k: v for k, v in input.items() if k in self.geom.dim_keys}
                 )
             elif callable(value):
                 func = value
@@ -133,11 +209,23 @@ class InteriorConstraint(base.Constraint):
                     label[key] = np.full_like(next(iter(input.values())), label[key])
             else:
                 raise NotImplementedError(f"type of {type(value)} is invalid yet.")
+        return label
 
-        # prepare weight
+    def _prepare_weight(
+        self, input: Dict[str, np.ndarray], label: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """Compute weight for given input points according to `weight_dict`.
+
+        Args:
+            input (Dict[str, np.ndarray]): Input points.
+            label (Dict[str, np.ndarray]): Label dict of input points.
+
+        Returns:
+            Dict[str, np.ndarray]: Weight dict.
+        """
         weight = {key: np.ones_like(next(iter(label.values()))) for key in label}
-        if weight_dict is not None:
-            for key, value in weight_dict.items():
+        if self.weight_dict is not None:
+            for key, value in self.weight_dict.items():
                 if isinstance(value, str):
                     if value == "sdf":
                         weight[key] = input["sdf"]
@@ -147,12 +235,12 @@ class InteriorConstraint(base.Constraint):
                     weight[key] = np.full_like(next(iter(label.values())), float(value))
                 elif isinstance(value, sympy.Basic):
                     func = sympy.lambdify(
-                        sympy.symbols(geom.dim_keys),
+                        sympy.symbols(self.geom.dim_keys),
                         value,
                         [{"amax": lambda xy, _: np.maximum(xy[0], xy[1])}, "numpy"],
                     )
                     weight[key] = func(
-                        **{k: v for k, v in input.items() if k in geom.dim_keys}
+                        **{k: v for k, v in input.items() if k in self.geom.dim_keys}
                     )
                 elif callable(value):
                     func = value
@@ -163,17 +251,147 @@ class InteriorConstraint(base.Constraint):
                         )
                 else:
                     raise NotImplementedError(f"type of {type(value)} is invalid yet.")
+        return weight
 
-        if "sdf" in input:
-            input.pop("sdf")
+    def compute_residual(
+        self,
+        model: nn.Layer,
+        input: Dict[str, np.ndarray],
+        label: Dict[str, np.ndarray],
+        batch_size: int = 8192,
+    ) -> np.ndarray:
+        """Compute the sum of absolute residuals of all output expressions on given
+        points batch by batch. Gradients are only computed w.r.t. input points, so
+        gradients of model parameters are not affected.
 
-        # wrap input, label, weight into a dataset
-        if isinstance(dataloader_cfg["dataset"], str):
-            dataloader_cfg["dataset"] = {"name": dataloader_cfg["dataset"]}
-        dataloader_cfg["dataset"].update(
-            {"input": input, "label": label, "weight": weight}
+        Args:
+            model (nn.Layer): NN model.
+            input (Dict[str, np.ndarray]): Input points.
+            label (Dict[str, np.ndarray]): Label of input points.
+            batch_size (int, optional): Batch size of evaluation. Defaults to 8192.
+
+        Returns:
+            np.ndarray: Residual of each point with shape [N, 1].
+        """
+        num_points = len(next(iter(input.values())))
+        residuals = []
+        for st in range(0, num_points, batch_size):
+            ed = min(st + batch_size, num_points)
+            input_dict = {
+                key: paddle.to_tensor(value[st:ed], stop_gradient=False)
+                for key, value in input.items()
+            }
+            # model forward
+            data_dict = {k: v for k, v in input_dict.items()}
+            data_dict.update(model(input_dict))
+
+            # equation forward
+            residual = 0
+            for name, expr in self.output_expr.items():
+                residual += paddle.abs(
+                    expr(data_dict) - paddle.to_tensor(label[name][st:ed])
+                )
+            residuals.append(residual.detach().numpy())
+
+            # clear differentiation cache
+            autodiff.clear()
+        return np.concatenate(residuals, axis=0)
+
+    def refine(self, model: nn.Layer):
+        """Residual-based adaptive refinement(RAR). Sample `num_candidates` points from
+        geometry, then add `num_refine` points with largest residual to dataset, or
+        replace the `num_refine` points with smallest residual in dataset by them,
+        according to `rar_cfg`.
+
+        Args:
+            model (nn.Layer): NN model.
+        """
+        if self.rar_cfg is None:
+            raise ValueError(f"rar_cfg of constraint({self.name}) is not set.")
+        batch_size = self.rar_cfg["batch_size"]
+
+        # sample candidate points and compute their residual
+        candidate_input = self.geom.sample_interior(
+            self.rar_cfg["num_candidates"],
+            self.random,
+            self.criteria,
+            False,
+            self.compute_sdf_derivatives,
         )
-        _dataset = dataset.build_dataset(dataloader_cfg["dataset"])
+        candidate_label = self._prepare_label(candidate_input)
+        candidate_weight = self._prepare_weight(candidate_input, candidate_label)
+        if "sdf" in candidate_input:
+            candidate_input.pop("sdf")
+        candidate_residual = self.compute_residual(
+            model, candidate_input, candidate_label, batch_size
+        ).flatten()
+        num_refine = min(self.rar_cfg["num_refine"], len(candidate_residual))
+        refine_index = np.argsort(-candidate_residual)[:num_refine]
 
-        # construct dataloader with dataset and dataloader_cfg
-        super().__init__(_dataset, dataloader_cfg, loss, name)
+        # fetch current data from dataset
+        _dataset = (
+            self.data_loader.dataset
+            if isinstance(self.data_loader, io.DataLoader)
+            else self.data_loader
+        )
+        data_dicts = []
+        for data_dict in (_dataset.input, _dataset.label, _dataset.weight):
+            data_dicts.append(
+                {
+                    key: (value.numpy() if paddle.is_tensor(value) else value)
+                    for key, value in data_dict.items()
+                }
+            )
+        input, label, _ = data_dicts
+
+        # add or replace points in dataset
+        refine_data = (candidate_input, candidate_label, candidate_weight)
+        if self.rar_cfg["mode"] == "add":
+            for data_dict, refine_dict in zip(data_dicts, refine_data):
+                for key in data_dict:
+                    data_dict[key] = np.concatenate(
+                        (data_dict[key], refine_dict[key][refine_index]), axis=0
+                    )
+        else:
+            residual = self.compute_residual(model, input, label, batch_size)
+            replace_index = np.argsort(residual.flatten())[:num_refine]
+            for data_dict, refine_dict in zip(data_dicts, refine_data):
+                for key in data_dict:
+                    data_dict[key][replace_index] = refine_dict[key][refine_index]
+
+        # update dataset in place
+        is_iterable = isinstance(_dataset, io.IterableDataset)
+        for attr_name, data_dict in zip(("input", "label", "weight"), data_dicts):
+            setattr(
+                _dataset,
+                attr_name,
+                {
+                    key: (paddle.to_tensor(value) if is_iterable else value)
+                    for key, value in data_dict.items()
+                },
+            )
+        _dataset._len = len(next(iter(input.values())))
+        # DistributedBatchSampler computes number of samples of each rank only at
+        # construction, so update them for grown dataset
+        if isinstance(self.data_loader, io.DataLoader) and isinstance(
+            self.data_loader.batch_sampler, io.DistributedBatchSampler
+        ):
+            batch_sampler = self.data_loader.batch_sampler
+            batch_sampler.num_samples = math.ceil(_dataset._len / batch_sampler.nranks)
+            batch_sampler.total_size = batch_sampler.num_samples * batch_sampler.nranks
+
+        # restart data iterator for discarding stale batches
+        if isinstance(self.data_iter, dataloader.PrefetchDataLoader):
+            self.data_iter.close()
+            self.data_iter = dataloader.PrefetchDataLoader(
+                self.data_loader, self.data_iter.prefetch_depth
+            )
+        else:
+            self.data_iter = iter(self.data_loader)
+
+        logger.info(
+            f"[RAR] {self.rar_cfg['mode']} {num_refine} points for constraint "
+            f"'{self.name}', max residual of candidates: "
+            f"{candidate_residual[refine_index[0]]:.5f}, number of points: "
+            f"{_dataset._len}"
+        )
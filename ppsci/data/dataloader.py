@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+import queue
+import threading
 from typing import Union
 
 from paddle import io
@@ -45,3 +47,86 @@ class InfiniteDataLoader:
 
     def __len__(self):
         return len(self.dataloader)
+
+
+class PrefetchDataLoader:
+    """A wrapper for infinite dataloader, which produces batches in a background
+    thread and buffers them in a queue, so that loading next batch overlaps with
+    computation on current batch. The wrapped loader is restarted transparently when
+    it is exhausted.
+
+    NOTE: Random sampling of wrapped loader(e.g. shuffle) is executed in the background
+    thread, so the order of batches may differ from non-prefetching one under the
+    same random seed.
+
+    Args:
+        dataloader (Union[io.DataLoader, io.IterableDataset]): A finite and iterable loader or iterable dataset to be wrapped.
+        prefetch_depth (int, optional): Maximum number of prefetched batches. Defaults to 2.
+
+    Examples:
+        >>> import numpy as np
+        >>> import ppsci
+        >>> dataset = ppsci.data.dataset.IterableNamedArrayDataset(
+        ...     {"x": np.random.randn(100, 1)}, {"u": np.random.randn(100, 1)}
+        ... )
+        >>> loader = ppsci.data.dataloader.PrefetchDataLoader(dataset, 2)
+        >>> input_dict, label_dict, weight_dict = next(loader)
+    """
+
+    # interval(in seconds) for checking stop signal when queue is full
+    _PUT_TIMEOUT = 0.1
+
+    def __init__(
+        self, dataloader: Union[io.DataLoader, io.IterableDataset], prefetch_depth=2
+    ):
+        if prefetch_depth < 1:
+            raise ValueError(f"prefetch_depth({prefetch_depth}) should be >= 1.")
+        self.dataloader = dataloader
+        self.prefetch_depth = prefetch_depth
+        self._queue = queue.Queue(maxsize=prefetch_depth)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Put item into queue, return False if stop signal is received."""
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=self._PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            while not self._stop_event.is_set():
+                num_batches = 0
+                for batch in self.dataloader:
+                    num_batches += 1
+                    if not self._put(batch):
+                        return
+                if num_batches == 0:
+                    raise ValueError("Wrapped dataloader yields no batch.")
+        except Exception as e:
+            # pass exception to the consumer thread
+            self._put(e)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        batch = self._queue.get()
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+    def __len__(self):
+        return len(self.dataloader)
+
+    def close(self):
+        """Stop background thread and discard prefetched batches."""
+        self._stop_event.set()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._thread.join()
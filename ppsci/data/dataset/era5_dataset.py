@@ -14,9 +14,16 @@
 
 from __future__ import annotations
 
+import collections
 import glob
+import os
+import queue
+import threading
 from typing import Dict
+from typing import Hashable
+from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 
 import h5py
@@ -26,6 +33,125 @@ from paddle import io
 from paddle import vision
 
 
+def _to_slice_runs(indices: Sequence[int]) -> List[Tuple[int, int]]:
+    """Convert indices into runs of consecutive increasing indices, e.g.
+    [0, 1, 2, 5, 6, 3] -> [(0, 3), (5, 7), (3, 4)], so that each run can be read by
+    slicing instead of fancy indexing.
+    """
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] == index:
+            runs[-1][1] += 1
+        else:
+            runs.append([index, index + 1])
+    return [tuple(run) for run in runs]
+
+
+class _LRUBlockCache:
+    """LRU cache of decoded arrays with capacity in bytes.
+
+    Args:
+        capacity (int): Capacity in bytes.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.nbytes = 0
+        self.blocks: "collections.OrderedDict[Hashable, np.ndarray]" = (
+            collections.OrderedDict()
+        )
+        # held during a whole read, shared by readers of the same cache
+        self.lock = threading.Lock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.blocks
+
+    def get(self, key: Hashable) -> np.ndarray:
+        self.blocks.move_to_end(key)
+        return self.blocks[key]
+
+    def put(self, key: Hashable, block: np.ndarray):
+        if key not in self.blocks:
+            self.blocks[key] = block
+            self.nbytes += block.nbytes
+
+    def evict(self):
+        """Evict least recently used blocks until total size is within capacity."""
+        while self.nbytes > self.capacity and self.blocks:
+            _, block = self.blocks.popitem(last=False)
+            self.nbytes -= block.nbytes
+
+
+class _TimeSlabReader:
+    """Reader of time steps from a h5py dataset in shape of [T, C, ...] or [T, ...].
+
+    Missing time steps are read by one hyperslab per contiguous run, which is
+    extended to chunk boundaries along time axis when it fits in cache, and channel
+    selection is converted into slice runs. Decoded time steps are kept in cache.
+
+    Args:
+        dataset (h5py.Dataset): H5py dataset to be read.
+        channels (Optional[Sequence[int]]): Channels to be read, None means all.
+        cache (_LRUBlockCache): Cache shared by readers.
+        key (Hashable): Unique key of this reader in cache.
+    """
+
+    def __init__(
+        self,
+        dataset: h5py.Dataset,
+        channels: Optional[Sequence[int]],
+        cache: _LRUBlockCache,
+        key: Hashable,
+    ):
+        self.dataset = dataset
+        self.channel_runs = None if channels is None else _to_slice_runs(channels)
+        self.cache = cache
+        self.key = key
+        self.num_steps = dataset.shape[0]
+        self.time_chunk = 1 if dataset.chunks is None else dataset.chunks[0]
+        step_shape = list(dataset.shape[1:])
+        if channels is not None:
+            step_shape[0] = len(channels)
+        self.step_nbytes = int(np.prod(step_shape)) * dataset.dtype.itemsize
+
+    def _read_slab(self, start: int, stop: int) -> np.ndarray:
+        if self.channel_runs is None:
+            return self.dataset[start:stop]
+        slabs = [self.dataset[start:stop, c0:c1] for c0, c1 in self.channel_runs]
+        return slabs[0] if len(slabs) == 1 else np.concatenate(slabs, axis=1)
+
+    def read(self, steps: Sequence[int], copy: bool = True) -> List[np.ndarray]:
+        """Read given time steps.
+
+        Args:
+            steps (Sequence[int]): Indices of time steps.
+            copy (bool, optional): Whether return copies of cached arrays, which
+                is required if returned arrays might be modified. Defaults to True.
+
+        Returns:
+            List[np.ndarray]: Arrays of each time step.
+        """
+        with self.cache.lock:
+            missing = sorted({t for t in steps if (self.key, t) not in self.cache})
+            for start, stop in _to_slice_runs(missing):
+                # decoding is done by chunk, so read whole chunks if affordable
+                chunk_start = start - start % self.time_chunk
+                chunk_stop = min(
+                    -(-stop // self.time_chunk) * self.time_chunk, self.num_steps
+                )
+                if (chunk_stop - chunk_start) * self.step_nbytes <= self.cache.capacity:
+                    start, stop = chunk_start, chunk_stop
+                slab = self._read_slab(start, stop)
+                for i, t in enumerate(range(start, stop)):
+                    self.cache.put((self.key, t), slab[i])
+
+            steps_data = [self.cache.get((self.key, t)) for t in steps]
+            self.cache.evict()
+        if copy and self.cache.capacity > 0:
+            steps_data = [data.copy() for data in steps_data]
+        return steps_data
+
+
 class ERA5Dataset(io.Dataset):
     """Class for ERA5 dataset.
 
@@ -41,6 +167,12 @@ class ERA5Dataset(io.Dataset):
             transform(s). Defaults to None.
         training (bool, optional): Whether in train mode. Defaults to True.
         stride (int, optional): Stride of sampling data. Defaults to 1.
+        cache_size (float, optional): Size in MB of LRU cache of decoded time steps,
+            which is owned by each dataloader worker. Defaults to 0.
+        prefetch_depth (int, optional): Number of following samples read in a
+            background thread once consecutive indices are requested, such as
+            sampling without shuffle. Prefetched data is kept in cache, so
+            `cache_size` should be large enough to hold them. Defaults to 0.
 
     Examples:
         >>> import ppsci
@@ -63,6 +195,8 @@ class ERA5Dataset(io.Dataset):
         transforms: Optional[vision.Compose] = None,
         training: bool = True,
         stride: int = 1,
+        cache_size: float = 0,
+        prefetch_depth: int = 0,
     ):
         super().__init__()
         self.file_path = file_path
@@ -88,6 +222,42 @@ class ERA5Dataset(io.Dataset):
         if self.precip_file_path is not None:
             self.precip_files = self.read_data(precip_file_path, "tp")
 
+        self.cache_size = cache_size
+        self.prefetch_depth = prefetch_depth
+        # readers, cache and prefetching thread are created in each process, for
+        # dataloader workers are forked from main process
+        self._pid = None
+
+    def _init_readers(self):
+        self._pid = os.getpid()
+        cache = _LRUBlockCache(int(self.cache_size * 1024 * 1024))
+        self._input_readers = [
+            _TimeSlabReader(_file, self.vars_channel, cache, ("input", i))
+            for i, _file in enumerate(self.files)
+        ]
+        if self.precip_file_path is not None:
+            self._label_readers = [
+                _TimeSlabReader(_file, None, cache, ("label", i))
+                for i, _file in enumerate(self.precip_files)
+            ]
+        else:
+            self._label_readers = self._input_readers
+
+        self._last_idx = None
+        self._prefetch_queue = None
+        if self.prefetch_depth > 0:
+            self._prefetch_queue = queue.Queue(maxsize=self.prefetch_depth)
+            threading.Thread(target=self._prefetch, daemon=True).start()
+
+    def _prefetch(self):
+        while True:
+            global_idx = self._prefetch_queue.get()
+            try:
+                self._read_sample(global_idx, copy=False)
+            except Exception:
+                # errors will be raised when the sample is actually requested
+                pass
+
     def read_data(self, path: str, var="fields"):
         paths = [path] if path.endswith(".h5") else glob.glob(path + "/*.h5")
         paths.sort()
@@ -100,7 +270,8 @@ class ERA5Dataset(io.Dataset):
     def __len__(self):
         return self.num_samples // self.stride
 
-    def __getitem__(self, global_idx):
+    def _locate(self, global_idx: int) -> Tuple[int, int, int]:
+        """Compute year index, input time index and first label time index."""
         global_idx *= self.stride
         year_idx = global_idx // self.num_samples_per_year
         local_idx = global_idx % self.num_samples_per_year
@@ -110,12 +281,6 @@ class ERA5Dataset(io.Dataset):
             if local_idx >= self.num_samples_per_year - self.num_label_timestamps:
                 local_idx = self.num_samples_per_year - self.num_label_timestamps - 1
 
-        input_file = self.files[year_idx]
-        label_file = (
-            self.precip_files[year_idx]
-            if self.precip_file_path is not None
-            else input_file
-        )
         if self.precip_file_path is not None and year_idx == 0 and self.training:
             # first year has 2 missing samples in precip (they are first two time points)
             lim = self.num_samples_per_year - 2
@@ -125,19 +290,50 @@ class ERA5Dataset(io.Dataset):
             label_idx = local_idx + step
         else:
             input_idx, label_idx = local_idx, local_idx + step
+        return year_idx, input_idx, label_idx
+
+    def _read_sample(
+        self, global_idx: int, copy: bool = True
+    ) -> Tuple[np.ndarray, List[np.ndarray]]:
+        """Read input and labels of a sample, input and labels from the same file are
+        read together.
+        """
+        year_idx, input_idx, label_idx = self._locate(global_idx)
+        label_steps = [label_idx + i for i in range(self.num_label_timestamps)]
+        input_reader = self._input_readers[year_idx]
+        label_reader = self._label_readers[year_idx]
+        if input_reader is label_reader:
+            steps_data = input_reader.read([input_idx] + label_steps, copy)
+            return steps_data[0], steps_data[1:]
+        return input_reader.read([input_idx], copy)[0], label_reader.read(
+            label_steps, copy
+        )
 
-        input_item = {self.input_keys[0]: input_file[input_idx, self.vars_channel]}
+    def __getitem__(self, global_idx):
+        if self._pid != os.getpid():
+            self._init_readers()
+
+        input_data, labels_data = self._read_sample(global_idx)
+
+        # prefetch following samples when indices are requested consecutively
+        if self._prefetch_queue is not None and self._last_idx == global_idx - 1:
+            for next_idx in range(
+                global_idx + 1, min(global_idx + 1 + self.prefetch_depth, len(self))
+            ):
+                try:
+                    self._prefetch_queue.put_nowait(next_idx)
+                except queue.Full:
+                    break
+        self._last_idx = global_idx
+
+        input_item = {self.input_keys[0]: input_data}
 
         label_item = {}
         for i in range(self.num_label_timestamps):
             if self.precip_file_path is not None:
-                label_item[self.label_keys[i]] = np.expand_dims(
-                    label_file[label_idx + i], 0
-                )
+                label_item[self.label_keys[i]] = np.expand_dims(labels_data[i], 0)
             else:
-                label_item[self.label_keys[i]] = label_file[
-                    label_idx + i, self.vars_channel
-                ]
+                label_item[self.label_keys[i]] = labels_data[i]
 
         weight_shape = [1] * len(next(iter(label_item.values())).shape)
         weight_item = {
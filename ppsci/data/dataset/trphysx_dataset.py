@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import os
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
@@ -31,6 +32,34 @@ from paddle import io
 from ppsci.arch import base
 
 
+def _window_rows(
+    length: int, block_size: int, stride: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute rows of a trajectory covered by sliding windows, and start of each
+    window in these rows, so that windows can be sliced from covered rows on demand.
+
+    Args:
+        length (int): Length of trajectory.
+        block_size (int): Window size.
+        stride (int): Window stride.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of covered rows and start of each
+            window in covered rows.
+    """
+    starts = np.arange(0, length - block_size + 1, stride)
+    covered = np.zeros([length], dtype=bool)
+    covered[(starts[:, None] + np.arange(block_size)).reshape([-1])] = True
+    rows = np.flatnonzero(covered)
+    return rows, np.searchsorted(rows, starts)
+
+
+def _concat_window_starts(window_starts: List[np.ndarray]) -> np.ndarray:
+    if len(window_starts) == 0:
+        return np.zeros([0], dtype="int64")
+    return np.concatenate(window_starts).astype("int64")
+
+
 class LorenzDataset(io.Dataset):
     """Dataset for training Lorenz model.
 
@@ -85,48 +114,75 @@ class LorenzDataset(io.Dataset):
         if weight_dict is not None:
             self.weight_dict.update(weight_dict)
 
-        self.data = self.read_data(file_path, block_size, stride)
+        # windows are sliced on demand from rows of trajectories covered by them
+        self.trajectories, self.window_starts = self.read_data(
+            file_path, block_size, stride
+        )
         self.embedding_model = embedding_model
         if embedding_model is None:
-            self.embedding_data = None
+            self.embedding_trajectories = None
         else:
+            # encoder is applied on each time step independently, so embed every row
+            # once instead of every window
             embedding_model.eval()
             with paddle.no_grad():
-                data_tensor = paddle.to_tensor(self.data)
+                data_tensor = paddle.to_tensor(self.trajectories[:, None])
                 embedding_data_tensor = embedding_model.encoder(data_tensor)
-            self.embedding_data = embedding_data_tensor.numpy()
-
-    def read_data(self, file_path: str, block_size: int, stride: int):
-        data = []
+            self.embedding_trajectories = embedding_data_tensor.numpy()[:, 0]
+
+    def read_data(
+        self, file_path: str, block_size: int, stride: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        trajectories = []
+        window_starts = []
+        num_rows = 0
         with h5py.File(file_path, "r") as f:
-            data_num = 0
-            for key in f.keys():
+            for key in list(f.keys())[: self.ndata]:
+                rows, starts = _window_rows(f[key].shape[0], block_size, stride)
                 data_series = np.asarray(f[key], dtype=paddle.get_default_dtype())
-                for i in range(0, data_series.shape[0] - block_size + 1, stride):
-                    data.append(data_series[i : i + block_size])
-                data_num += 1
-                if self.ndata is not None and data_num >= self.ndata:
-                    break
-        return np.asarray(data)
+                trajectories.append(data_series[rows])
+                window_starts.append(starts + num_rows)
+                num_rows += len(rows)
+        return np.concatenate(trajectories), _concat_window_starts(window_starts)
+
+    @property
+    def data(self) -> np.ndarray:
+        """Materialized windows in shape of [num_windows, block_size, ...], which
+        costs block_size / stride times memory of trajectories, only for analysis
+        such as computing statistics or visualization.
+        """
+        return self.trajectories[self._window_index()]
+
+    @property
+    def embedding_data(self) -> Optional[np.ndarray]:
+        """Materialized windows of embedding, None if no embedding model given."""
+        if self.embedding_trajectories is None:
+            return None
+        return self.embedding_trajectories[self._window_index()]
+
+    def _window_index(self) -> np.ndarray:
+        return self.window_starts[:, None] + np.arange(self.block_size)
 
     def __len__(self):
-        return len(self.data)
+        return len(self.window_starts)
 
     def __getitem__(self, i):
+        start = self.window_starts[i]
+        end = start + self.block_size
         # when embedding data is None
-        if self.embedding_data is None:
-            data_item = self.data[i]
+        if self.embedding_trajectories is None:
+            data_item = self.trajectories[start:end]
             input_item = {self.input_keys[0]: data_item}
             label_item = {
                 self.label_keys[0]: data_item[1:, :],
                 self.label_keys[1]: data_item,
             }
         else:
-            data_item = self.embedding_data[i]
+            data_item = self.embedding_trajectories[start:end]
             input_item = {self.input_keys[0]: data_item[:-1, :]}
             label_item = {self.label_keys[0]: data_item[1:, :]}
             if len(self.label_keys) == 2:
-                label_item[self.label_keys[1]] = self.data[i][1:, :]
+                label_item[self.label_keys[1]] = self.trajectories[start + 1 : end]
 
         weight_shape = [1] * len(data_item.shape)
         weight_item = {
@@ -243,54 +299,81 @@ class CylinderDataset(io.Dataset):
         if weight_dict is not None:
             self.weight_dict.update(weight_dict)
 
-        self.data, self.visc = self.read_data(file_path, block_size, stride)
+        # windows are sliced on demand from rows of trajectories covered by them
+        (
+            self.trajectories,
+            self.window_starts,
+            self.trajectory_visc,
+        ) = self.read_data(file_path, block_size, stride)
+        self.visc = self.trajectory_visc[self.window_starts]
         self.embedding_model = embedding_model
         if embedding_model is None:
-            self.embedding_data = None
+            self.embedding_trajectories = None
         else:
+            # encoder is applied on each time step independently, so embed every row
+            # once instead of every window
             embedding_model.eval()
+            batch_rows = embedding_batch_size * block_size
             with paddle.no_grad():
-                data_tensor = paddle.to_tensor(self.data)
-                visc_tensor = paddle.to_tensor(self.visc)
                 embedding_data = []
-                for i in range(0, len(data_tensor), embedding_batch_size):
-                    start, end = i, min(i + embedding_batch_size, len(data_tensor))
+                for start in range(0, len(self.trajectories), batch_rows):
+                    end = min(start + batch_rows, len(self.trajectories))
                     embedding_data_batch = embedding_model.encoder(
-                        data_tensor[start:end], visc_tensor[start:end]
+                        paddle.to_tensor(self.trajectories[start:end, None]),
+                        paddle.to_tensor(self.trajectory_visc[start:end]),
                     )
-                    embedding_data.append(embedding_data_batch.numpy())
-                self.embedding_data = np.concatenate(embedding_data)
-
-    def read_data(self, file_path: str, block_size: int, stride: int):
-        data = []
+                    embedding_data.append(embedding_data_batch.numpy()[:, 0])
+                self.embedding_trajectories = np.concatenate(embedding_data)
+
+    def read_data(
+        self, file_path: str, block_size: int, stride: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        trajectories = []
+        window_starts = []
         visc = []
+        num_rows = 0
         with h5py.File(file_path, "r") as f:
-            data_num = 0
-            for key in f.keys():
+            for key in list(f.keys())[: self.ndata]:
                 visc0 = 2.0 / float(key)
+                rows, starts = _window_rows(f[key + "/ux"].shape[0], block_size, stride)
                 ux = np.asarray(f[key + "/ux"], dtype=paddle.get_default_dtype())
                 uy = np.asarray(f[key + "/uy"], dtype=paddle.get_default_dtype())
                 p = np.asarray(f[key + "/p"], dtype=paddle.get_default_dtype())
-                data_series = np.stack([ux, uy, p], axis=1)
-
-                for i in range(0, data_series.shape[0] - block_size + 1, stride):
-                    data.append(data_series[i : i + block_size])
-                    visc.append([visc0])
-
-                data_num += 1
-                if self.ndata is not None and data_num >= self.ndata:
-                    break
-
-        data = np.asarray(data)
-        visc = np.asarray(visc, dtype=paddle.get_default_dtype())
-        return data, visc
+                trajectories.append(np.stack([ux[rows], uy[rows], p[rows]], axis=1))
+                visc.append(np.full([len(rows), 1], visc0))
+                window_starts.append(starts + num_rows)
+                num_rows += len(rows)
+
+        trajectories = np.concatenate(trajectories)
+        visc = np.concatenate(visc).astype(paddle.get_default_dtype())
+        return trajectories, _concat_window_starts(window_starts), visc
+
+    @property
+    def data(self) -> np.ndarray:
+        """Materialized windows in shape of [num_windows, block_size, ...], which
+        costs block_size / stride times memory of trajectories, only for analysis
+        such as computing statistics or visualization.
+        """
+        return self.trajectories[self._window_index()]
+
+    @property
+    def embedding_data(self) -> Optional[np.ndarray]:
+        """Materialized windows of embedding, None if no embedding model given."""
+        if self.embedding_trajectories is None:
+            return None
+        return self.embedding_trajectories[self._window_index()]
+
+    def _window_index(self) -> np.ndarray:
+        return self.window_starts[:, None] + np.arange(self.block_size)
 
     def __len__(self):
-        return len(self.data)
+        return len(self.window_starts)
 
     def __getitem__(self, i):
-        if self.embedding_data is None:
-            data_item = self.data[i]
+        start = self.window_starts[i]
+        end = start + self.block_size
+        if self.embedding_trajectories is None:
+            data_item = self.trajectories[start:end]
             input_item = {
                 self.input_keys[0]: data_item,
                 self.input_keys[1]: self.visc[i],
@@ -300,7 +383,7 @@ class CylinderDataset(io.Dataset):
                 self.label_keys[1]: data_item,
             }
         else:
-            data_item = self.embedding_data[i]
+            data_item = self.embedding_trajectories[start:end]
             input_item = {self.input_keys[0]: data_item[:-1, :]}
             label_item = {self.label_keys[0]: data_item[1:, :]}
             if len(self.label_keys) == 2:
@@ -17,6 +17,8 @@ import copy
 from ppsci.equation.fpde import FractionalPoisson
 from ppsci.equation.ide import Volterra
 from ppsci.equation.pde import DETACH_FUNC_NAME
+from ppsci.equation.pde import HUTCHINSON_LAPLACIAN_FUNC_NAME
+from ppsci.equation.pde import LAPLACIAN_FUNC_NAME
 from ppsci.equation.pde import PDE
 from ppsci.equation.pde import Biharmonic
 from ppsci.equation.pde import Laplace
@@ -31,6 +33,8 @@ from ppsci.utils import misc
 __all__ = [
     "PDE",
     "DETACH_FUNC_NAME",
+    "LAPLACIAN_FUNC_NAME",
+    "HUTCHINSON_LAPLACIAN_FUNC_NAME",
     "Biharmonic",
     "Laplace",
     "LinearElasticity",
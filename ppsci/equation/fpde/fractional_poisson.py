@@ -50,18 +50,19 @@ class FractionalPoisson(PDE):
         self.geom = geom
         self.resolution = resolution
         self._w_init = self._init_weights()
+        # sparse integral matrix tensor, created at the first forward pass after
+        # collocation points are set by `get_x`
+        self._int_mat_tensor = None
 
         def compute_fpde_func(out):
             x = paddle.concat((out["x"], out["y"]), axis=1)
             y = out["u"]
-            indices, values, shape = self.int_mat
-            int_mat = sparse.sparse_coo_tensor(
-                [[p[0] for p in indices], [p[1] for p in indices]],
-                values,
-                shape,
-                stop_gradient=False,
-            )
-            lhs = sparse.matmul(int_mat, y)
+            if self._int_mat_tensor is None:
+                crows, cols, values, shape = self.int_mat
+                self._int_mat_tensor = sparse.sparse_csr_tensor(
+                    crows, cols, values, shape
+                )
+            lhs = sparse.matmul(self._int_mat_tensor, y)
             lhs = lhs[:, 0]
             lhs *= (
                 special.gamma((1 - self.alpha) / 2)
@@ -88,7 +89,8 @@ class FractionalPoisson(PDE):
         return np.array(w, dtype=self.dtype)
 
     def get_x(self, x_f):
-        if hasattr(self, "train_x"):
+        # reuse collocation points and integral matrix if points do not change
+        if hasattr(self, "train_x") and np.array_equal(self.x0, x_f):
             return self.train_x
 
         self.x0 = x_f
@@ -96,7 +98,7 @@ class FractionalPoisson(PDE):
             raise ValueError("x0 contains boundary points.")
 
         if self.geom.ndim == 1:
-            dirns, dirn_w = [-1, 1], [1, 1]
+            dirns, dirn_w = np.array([[-1.0], [1.0]]), np.array([1.0, 1.0])
         elif self.geom.ndim == 2:
             gauss_x, gauss_w = np.polynomial.legendre.leggauss(self.resolution[0])
             gauss_x, gauss_w = gauss_x.astype(self.dtype), gauss_w.astype(self.dtype)
@@ -108,87 +110,89 @@ class FractionalPoisson(PDE):
             gauss_x, gauss_w = gauss_x.astype(self.dtype), gauss_w.astype(self.dtype)
             thetas = (np.pi * gauss_x[: self.resolution[0]] + np.pi) / 2
             phis = np.pi * gauss_x[: self.resolution[1]] + np.pi
-            dirns, dirn_w = [], []
-            for i in range(self.resolution[0]):
-                for j in range(self.resolution[1]):
-                    dirns.append(
-                        [
-                            np.sin(thetas[i]) * np.cos(phis[j]),
-                            np.sin(thetas[i]) * np.sin(phis[j]),
-                            np.cos(thetas[i]),
-                        ]
-                    )
-                    dirn_w.append(gauss_w[i] * gauss_w[j] * np.sin(thetas[i]))
-            dirn_w = np.pi**2 / 2 * np.array(dirn_w)
-
-        x, self.w = [], []
-        for x0i in self.x0:
-            xi = list(
-                map(
-                    lambda dirn: self.background_points(
-                        x0i, dirn, self._dynamic_dist2npts, 0
-                    ),
-                    dirns,
-                )
-            )
-            wi = list(
-                map(
-                    lambda i: dirn_w[i]
-                    * np.linalg.norm(xi[i][1] - xi[i][0]) ** (-self.alpha)
-                    * self.get_weight(len(xi[i]) - 1),
-                    range(len(dirns)),
-                )
-            )
-            # first order
-            # xi, wi = zip(self.modify_first_order(xij, wij) for xij, wij in zip(xi, wi))
-            xi, wi = zip(*map(self.modify_first_order, xi, wi))
-            # second order
-            # xi, wi = zip(*map(self.modify_second_order, xi, wi))
-            # third order
-            # xi, wi = zip(*map(self.modify_third_order, xi, wi))
-            x.append(np.vstack(xi))
-            self.w.append(np.hstack(wi))
-        self.x = np.vstack([self.x0] + x)
+            thetas, phis = np.meshgrid(thetas, phis, indexing="ij")
+            dirns = np.stack(
+                (
+                    np.sin(thetas) * np.cos(phis),
+                    np.sin(thetas) * np.sin(phis),
+                    np.cos(thetas),
+                ),
+                axis=-1,
+            ).reshape([-1, 3])
+            dirn_w = (
+                np.pi**2
+                / 2
+                * np.outer(gauss_w[: self.resolution[0]], gauss_w[: self.resolution[1]])
+                * np.sin(thetas)
+            ).reshape([-1])
+
+        # compute background points of all points and directions at once,
+        # shape of dx, h, npts is [num_x0, num_dirns]
+        dirns = dirns / np.linalg.norm(dirns, axis=1, keepdims=True)
+        dx = self.distance2boundary_unitdirn(self.x0[:, None, :], -dirns[None, :, :])
+        npts = np.maximum(np.ceil(self.resolution[-1] * dx).astype("int64"), 1)
+        h = dx / npts
+
+        # there are npts + 1 points along each direction, the j-th of which is
+        # x0 - (j - 1) * h * dirn with weight w_init[j], which is the first order
+        # modification of background points
+        counts = (npts + 1).reshape([-1])
+        pair_index = np.repeat(np.arange(counts.size), counts)
+        j = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        x0_index, dirn_index = np.divmod(pair_index, len(dirns))
+        x = (
+            self.x0[x0_index]
+            - ((j - 1) * h.reshape([-1])[pair_index])[:, None] * dirns[dirn_index]
+        )
+        w = (
+            dirn_w[dirn_index]
+            * h.reshape([-1])[pair_index] ** (-self.alpha)
+            * self._w_init[j]
+        )
+
+        # drop the first point along a direction if it is out of geometry
+        keep_mask = np.ones_like(j, dtype=bool)
+        first_index = np.nonzero(j == 0)[0]
+        keep_mask[first_index] = self.geom.is_inside(x[first_index])
+        x, w, x0_index = x[keep_mask], w[keep_mask], x0_index[keep_mask]
+
+        self.x = np.vstack([self.x0, x]).astype(self.dtype)
+        self.w = w.astype(self.dtype)
+        self.w_index = x0_index
         self.int_mat = self._get_int_matrix(self.x0)
+        self._int_mat_tensor = None
         self.train_x = misc.convert_to_dict(self.x, ("x", "y"))
         return self.train_x
 
     def get_weight(self, n):
         return self._w_init[: n + 1]
 
-    def background_points(self, x, dirn, dist2npt, shift):
-        dirn = dirn / np.linalg.norm(dirn)
-        dx = self.distance2boundary_unitdirn(x, -dirn)
-        n = max(dist2npt(dx), 1)
-        h = dx / n
-        pts = x - np.arange(-shift, n - shift + 1, dtype=self.dtype)[:, None] * h * dirn
-        return pts
-
     def distance2boundary_unitdirn(self, x, dirn):
         # https://en.wikipedia.org/wiki/Line%E2%80%93sphere_intersection
         xc = x - self.geom.center
-        xc = xc
-        ad = np.dot(xc, dirn)
+        ad = np.sum(xc * dirn, axis=-1)
         return (
             -ad + (ad**2 - np.sum(xc * xc, axis=-1) + self.geom.radius**2) ** 0.5
         ).astype(self.dtype)
 
-    def modify_first_order(self, x, w):
-        x = np.vstack(([2 * x[0] - x[1]], x[:-1]))
-        if not self.geom.is_inside(x[0:1])[0]:
-            return x[1:], w[1:]
-        return x, w
-
     def _dynamic_dist2npts(self, dx):
         return int(math.ceil(self.resolution[-1] * dx))
 
-    def _get_int_matrix(self, x: np.ndarray) -> np.ndarray:
+    def _get_int_matrix(
+        self, x: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[int, int]]:
+        """Get integral matrix in CSR format, i-th row of which holds weights of
+        background points of x[i], stored in `self.x` right after all x.
+
+        Args:
+            x (np.ndarray): Collocation points with shape of [N, ndim].
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, Tuple[int, int]]: Compressed
+                row offsets, column indices, values and dense shape of the matrix.
+        """
         dense_shape = (x.shape[0], self.x.shape[0])
-        indices, values = [], []
-        beg = x.shape[0]
-        for i in range(x.shape[0]):
-            for _ in range(self.w[i].shape[0]):
-                indices.append([i, beg])
-                beg += 1
-            values = np.hstack((values, self.w[i]))
-        return indices, values.astype(self.dtype), dense_shape
+        crows = np.zeros([x.shape[0] + 1], dtype="int64")
+        crows[1:] = np.cumsum(np.bincount(self.w_index, minlength=x.shape[0]))
+        cols = np.arange(x.shape[0], x.shape[0] + len(self.w), dtype="int64")
+        return crows, cols, self.w.astype(self.dtype), dense_shape
@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 from typing import Callable
+from typing import Union
 
 import numpy as np
 import paddle
@@ -71,12 +72,22 @@ class Volterra(PDE):
 
         self.quad_w = self.quad_w.astype(Volterra.dtype)  # [Q, ]
 
+        # quadrature weights multiplied by kernel values, kept on device together
+        # with the points they are computed for, and recomputed when points change
+        self._int_weights = None  # [N, Q]
+        self._int_weights_x = None  # [N + N * Q, 1]
+
         def compute_volterra_func(out):
             x, u = out["x"], out["u"]
             lhs = self.func(out)
 
-            int_mat = paddle.to_tensor(self._get_int_matrix(x), stop_gradient=False)
-            rhs = paddle.mm(int_mat, u)  # (N, 1)
+            if not self._is_int_weights_valid(x):
+                self._int_weights = paddle.to_tensor(self._get_int_weights(x))
+                self._int_weights_x = x
+            # integral matrix is block diagonal, i.e. i-th row only has weights for
+            # quadrature points of i-th point, so compute it by row-wise reduction
+            u_quad = u[self.num_points :].reshape([self.num_points, self.quad_deg])
+            rhs = (self._int_weights * u_quad).sum(axis=1, keepdim=True)  # (N, 1)
 
             volterra = lhs[: len(rhs)] - rhs
             return volterra
@@ -96,30 +107,65 @@ class Volterra(PDE):
         a, b = self.bound, t
         return ((b - a) / 2) @ self.quad_x.T + (b + a) / 2
 
-    def _get_quad_weights(self, t: float) -> np.ndarray:
+    def _get_quad_weights(self, t: Union[float, np.ndarray]) -> np.ndarray:
         """Scale weights to range according to given t and lower bound of integral.
         reference: https://en.wikipedia.org/wiki/Gaussian_quadrature#Change_of_interval
 
         Args:
-            t (float): Array of upper bound 't' for integral.
+            t (Union[float, np.ndarray]): Upper bound 't' for integral, or array of
+                them with shape of [N, 1].
 
         Returns:
-            np.ndarray: Transformed weights in desired range with shape of [Q, ].
+            np.ndarray: Transformed weights in desired range with shape of [Q, ] or
+                [N, Q].
         """
         a, b = self.bound, t
         return (b - a) / 2 * self.quad_w
 
-    def _get_int_matrix(self, x: np.ndarray) -> np.ndarray:
-        int_mat = np.zeros(
-            (self.num_points, self.num_points + (self.num_points * self.quad_deg)),
-            dtype=Volterra.dtype,
+    def invalidate_int_weights(self):
+        """Drop cached integral weights, so that weights will be recomputed at the
+        next forward pass.
+        """
+        self._int_weights = None
+        self._int_weights_x = None
+
+    def _is_int_weights_valid(self, x: paddle.Tensor) -> bool:
+        """Whether cached integral weights are computed for given points.
+
+        Points are compared on device, which is much cheaper than recomputing weights
+        on host, and can be skipped if the same tensor is given.
+
+        Args:
+            x (paddle.Tensor): N collocation points followed by N * Q quadrature
+                points, with shape of [N + N * Q, 1].
+
+        Returns:
+            bool: Whether cached integral weights can be reused.
+        """
+        if self._int_weights is None:
+            return False
+        if x is self._int_weights_x:
+            return True
+        if tuple(x.shape) != tuple(self._int_weights_x.shape):
+            return False
+        return bool(paddle.equal_all(x, self._int_weights_x))
+
+    def _get_int_weights(self, x: paddle.Tensor) -> np.ndarray:
+        """Compute weights of integral for all collocation points at once.
+
+        Args:
+            x (paddle.Tensor): N collocation points followed by N * Q quadrature
+                points, with shape of [N + N * Q, 1].
+
+        Returns:
+            np.ndarray: Quadrature weights multiplied by kernel values with shape of
+                [N, Q].
+        """
+        x = x.numpy()
+        t = x[: self.num_points]  # [N, 1]
+        s = x[self.num_points :].reshape([self.num_points, self.quad_deg])  # [N, Q]
+        K = np.reshape(
+            self.kernel_func(np.broadcast_to(t, s.shape), s),
+            [self.num_points, self.quad_deg],
         )
-        for i in range(self.num_points):
-            xi = float(x[i])
-            beg = self.num_points + self.quad_deg * i
-            end = self.num_points + self.quad_deg * (i + 1)
-            K = np.ravel(
-                self.kernel_func(np.full((self.quad_deg, 1), xi), x[beg:end].numpy())
-            )
-            int_mat[i, beg:end] = self._get_quad_weights(xi) * K
-        return int_mat
+        return (self._get_quad_weights(t) * K).astype(Volterra.dtype)
@@ -13,6 +13,8 @@
 # limitations under the License.
 
 from ppsci.equation.pde.base import DETACH_FUNC_NAME
+from ppsci.equation.pde.base import HUTCHINSON_LAPLACIAN_FUNC_NAME
+from ppsci.equation.pde.base import LAPLACIAN_FUNC_NAME
 from ppsci.equation.pde.base import PDE
 from ppsci.equation.pde.biharmonic import Biharmonic
 from ppsci.equation.pde.laplace import Laplace
@@ -25,6 +27,8 @@ from ppsci.equation.pde.viv import Vibration
 __all__ = [
     "PDE",
     "DETACH_FUNC_NAME",
+    "LAPLACIAN_FUNC_NAME",
+    "HUTCHINSON_LAPLACIAN_FUNC_NAME",
     "Biharmonic",
     "Laplace",
     "LinearElasticity",
@@ -23,8 +23,11 @@ from typing import Tuple
 import paddle
 import sympy
 from paddle import nn
+from typing_extensions import Literal
 
 DETACH_FUNC_NAME = "detach"
+LAPLACIAN_FUNC_NAME = "laplacian"
+HUTCHINSON_LAPLACIAN_FUNC_NAME = "laplacian_hutchinson"
 
 
 class PDE:
@@ -69,6 +72,37 @@ class PDE:
             expr = sympy.Function(DETACH_FUNC_NAME)(expr)
         return expr
 
+    def create_laplacian(
+        self,
+        expr: sympy.Function,
+        invars: Tuple[sympy.Symbol, ...],
+        method: Literal["exact", "hutchinson"] = "exact",
+        num_probes: int = 1,
+    ) -> sympy.Function:
+        """Create laplacian of given function to invars, which will be computed by
+        `ppsci.autodiff.laplacian` in one node instead of a sum of second derivatives.
+
+        Args:
+            expr (sympy.Function): Function to be differentiated, such as u(x, y).
+            invars (Tuple[sympy.Symbol, ...]): Independent variables to be summed over.
+            method (Literal["exact", "hutchinson"], optional): "exact" computes trace
+                of Hessian exactly, "hutchinson" estimates it stochastically with
+                `num_probes` probe vectors, which is cheaper for high-dimensional
+                invars. Defaults to "exact".
+            num_probes (int, optional): Number of probe vectors for "hutchinson".
+                Defaults to 1.
+
+        Returns:
+            sympy.Function: Laplacian expression.
+        """
+        if method == "exact":
+            return sympy.Function(LAPLACIAN_FUNC_NAME)(expr, *invars)
+        if method == "hutchinson":
+            return sympy.Function(HUTCHINSON_LAPLACIAN_FUNC_NAME)(
+                expr, *invars, sympy.Integer(num_probes)
+            )
+        raise ValueError(f"method should be 'exact' or 'hutchinson', but got {method}.")
+
     def add_equation(self, name: str, equation: Callable):
         """Add an equation.
 
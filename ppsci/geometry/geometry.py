@@ -18,6 +18,7 @@ Code below is heavily based on [https://github.com/lululxvi/deepxde](https://git
 from __future__ import annotations
 
 import abc
+from typing import Dict
 from typing import Tuple
 
 import numpy as np
@@ -184,6 +185,40 @@ class Geometry:
 
         return {**x_dict, **normal_dict}
 
+    def sample_boundary_batched(
+        self,
+        n_groups: int,
+        n_per_group: int,
+        random: str = "pseudo",
+        criteria=None,
+    ) -> Dict[str, np.ndarray]:
+        """Sample `n_groups` groups of boundary points with `n_per_group` points in
+        each group by one vectorized call of `sample_boundary`.
+
+        Args:
+            n_groups (int): Number of groups.
+            n_per_group (int): Number of points in each group.
+            random (str, optional): Random method. Defaults to "pseudo".
+            criteria (Optional[Callable]): Criteria function. Defaults to None.
+
+        Returns:
+            Dict[str, np.ndarray]: Sampled data, shape of each value is
+                [n_groups, n_per_group, ...].
+        """
+        n = n_groups * n_per_group
+        data_dict = self.sample_boundary(n, random, criteria)
+        # shuffle before grouping, for some geometries return points ordered by
+        # boundary segment(e.g. triangles of mesh), which makes groups not i.i.d.
+        perm = np.random.permutation(n)
+        if "area" in data_dict:
+            # area is shared by all n points, rescale it so that areas in each
+            # group sum up to the whole area
+            data_dict["area"] = data_dict["area"] * n_groups
+        return {
+            key: value[perm].reshape([n_groups, n_per_group, *value.shape[1:]])
+            for key, value in data_dict.items()
+        }
+
     @abc.abstractmethod
     def random_points(self, n: int, random: str = "pseudo"):
         """Compute the random points in the geometry."""
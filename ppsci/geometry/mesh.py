@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 from typing import TYPE_CHECKING
 from typing import Callable
 from typing import Dict
@@ -27,6 +29,7 @@ from ppsci.geometry import geometry
 from ppsci.geometry import geometry_3d
 from ppsci.geometry import sampler
 from ppsci.utils import checker
+from ppsci.utils import logger
 from ppsci.utils import misc
 
 if TYPE_CHECKING:
@@ -38,13 +41,28 @@ class Mesh(geometry.Geometry):
 
     Args:
         mesh (Union[str, Mesh]): Mesh file path or mesh object, such as "/path/to/mesh.stl".
+        sdf_cache_resolution (Optional[int]): Number of voxels along the longest axis
+            of bounding box for caching SDF values on a grid, SDF and its derivatives
+            will be computed by trilinear interpolation on the grid if given, except
+            for points close to the surface or out of the grid, which still use exact
+            query. Defaults to None, which means SDF will always be queried exactly.
+        sdf_cache_dir (Optional[str]): Directory for saving and loading cached SDF
+            grid, file name is decided by hash of mesh and resolution. Defaults to None.
 
     Examples:
         >>> import ppsci
         >>> geom = ppsci.geometry.Mesh("/path/to/mesh.stl")  # doctest: +SKIP
+        >>> geom = ppsci.geometry.Mesh(
+        ...     "/path/to/mesh.stl", sdf_cache_resolution=128, sdf_cache_dir="./sdf_cache"
+        ... )  # doctest: +SKIP
     """
 
-    def __init__(self, mesh: Union["pymesh.Mesh", str]):
+    def __init__(
+        self,
+        mesh: Union["pymesh.Mesh", str],
+        sdf_cache_resolution: Optional[int] = None,
+        sdf_cache_dir: Optional[str] = None,
+    ):
         # check if pymesh is installed when using Mesh Class
         if not checker.dynamic_import_to_globals(["pymesh"]):
             raise ImportError(
@@ -60,6 +78,13 @@ class Mesh(geometry.Geometry):
         else:
             raise ValueError("arg `mesh` should be path string or or `pymesh.Mesh`")
 
+        if sdf_cache_resolution is not None and sdf_cache_resolution < 2:
+            raise ValueError(
+                f"sdf_cache_resolution({sdf_cache_resolution}) should be at least 2."
+            )
+        self.sdf_cache_resolution = sdf_cache_resolution
+        self.sdf_cache_dir = sdf_cache_dir
+
         self.init_mesh()
 
     def init_mesh(self):
@@ -94,6 +119,9 @@ class Mesh(geometry.Geometry):
         self.v2 = self.vectors[:, 2]
         self.num_vertices = self.py_mesh.num_vertices
         self.num_faces = self.py_mesh.num_faces
+        # cumulative area table for area-weighted face selection
+        self.triangle_areas = area_of_triangles(self.v0, self.v1, self.v2)
+        self.cum_triangle_areas = np.cumsum(self.triangle_areas)
 
         if not checker.dynamic_import_to_globals(["pysdf"]):
             raise ImportError(
@@ -108,6 +136,8 @@ class Mesh(geometry.Geometry):
             ((np.min(self.vectors[:, :, 1])), np.max(self.vectors[:, :, 1])),
             ((np.min(self.vectors[:, :, 2])), np.max(self.vectors[:, :, 2])),
         )
+        # SDF grid will be built lazily at the first query
+        self.sdf_grid = None
 
     def sdf_func(self, points: np.ndarray) -> np.ndarray:
         """Compute signed distance field.
@@ -132,9 +162,136 @@ class Mesh(geometry.Geometry):
             )
         import pymesh
 
-        sdf, _, _, _ = pymesh.signed_distance_to_mesh(self.py_mesh, points)
-        sdf = sdf[..., np.newaxis]
-        return sdf
+        if self.sdf_cache_resolution is None:
+            sdf, _, _, _ = pymesh.signed_distance_to_mesh(self.py_mesh, points)
+            return sdf[..., np.newaxis]
+
+        sdf, _, valid_mask = self._interpolate_sdf(points)
+        if not valid_mask.all():
+            sdf[~valid_mask], _, _, _ = pymesh.signed_distance_to_mesh(
+                self.py_mesh, points[~valid_mask]
+            )
+        return sdf[..., np.newaxis]
+
+    def sdf_derivatives(self, x: np.ndarray, epsilon: float = 1e-4) -> np.ndarray:
+        """Compute derivatives of SDF function. Derivatives are computed analytically
+        from trilinear interpolation if `sdf_cache_resolution` is given, otherwise by
+        central difference.
+
+        Args:
+            x (np.ndarray): Points for computing SDF derivatives. The shape is [N, 3].
+            epsilon (float): Derivative step for central difference.
+                Defaults to 1e-4.
+
+        Returns:
+            np.ndarray: Derivatives of SDF function with shape of [N, 3].
+        """
+        if self.sdf_cache_resolution is None:
+            return super().sdf_derivatives(x, epsilon)
+
+        _, sdf_derivs, valid_mask = self._interpolate_sdf(x)
+        if not valid_mask.all():
+            sdf_derivs[~valid_mask] = super().sdf_derivatives(x[~valid_mask], epsilon)
+        return sdf_derivs.astype(x.dtype)
+
+    @property
+    def sdf_cache_error_bound(self) -> float:
+        """Upper bound of absolute error of interpolated SDF value, which is the
+        length of voxel diagonal, for SDF is 1-Lipschitz and the interpolated value is
+        a convex combination of SDF values at the 8 corners of voxel.
+        """
+        if self.sdf_cache_resolution is None:
+            return 0.0
+        spacing = (self.bbox[1] - self.bbox[0]).max() / (self.sdf_cache_resolution - 1)
+        return float(np.sqrt(3) * spacing)
+
+    def _build_sdf_grid(self):
+        """Compute SDF values on a voxel grid covering the mesh, or load them from
+        `sdf_cache_dir` if exist.
+        """
+        import pymesh
+
+        spacing = (self.bbox[1] - self.bbox[0]).max() / (self.sdf_cache_resolution - 1)
+        # pad 2 voxels so that points on bounding box are surely covered
+        origin = self.bbox[0] - 2 * spacing
+        shape = np.ceil((self.bbox[1] - self.bbox[0]) / spacing).astype("int64") + 5
+
+        cache_path = None
+        if self.sdf_cache_dir is not None:
+            md5 = hashlib.md5()
+            md5.update(np.ascontiguousarray(self.vertices, "float64").tobytes())
+            md5.update(np.ascontiguousarray(self.faces, "int64").tobytes())
+            md5.update(str(self.sdf_cache_resolution).encode())
+            cache_path = os.path.join(self.sdf_cache_dir, f"sdf_{md5.hexdigest()}.npz")
+            if os.path.exists(cache_path):
+                self.sdf_grid = dict(np.load(cache_path))
+                logger.message(f"Load SDF grid from: {cache_path}")
+                return
+
+        axes = [origin[i] + spacing * np.arange(shape[i]) for i in range(self.ndim)]
+        grid_points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1)
+        grid_points = grid_points.reshape([-1, self.ndim])
+        chunk_size = 1 << 20
+        values = np.concatenate(
+            [
+                pymesh.signed_distance_to_mesh(
+                    self.py_mesh, grid_points[i : i + chunk_size]
+                )[0]
+                for i in range(0, len(grid_points), chunk_size)
+            ]
+        )
+        self.sdf_grid = {
+            "origin": origin,
+            "spacing": np.asarray(spacing),
+            "values": values.reshape(shape),
+        }
+        if cache_path is not None:
+            os.makedirs(self.sdf_cache_dir, exist_ok=True)
+            np.savez(cache_path, **self.sdf_grid)
+            logger.message(f"Save SDF grid to: {cache_path}")
+
+    def _interpolate_sdf(self, points: np.ndarray):
+        """Compute SDF values and derivatives by trilinear interpolation on SDF grid.
+
+        Args:
+            points (np.ndarray): Query points with shape of [N, 3].
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Interpolated SDF values with
+                shape of [N, ], derivatives with shape of [N, 3] and mask with shape
+                of [N, ] which is True where result is reliable, i.e. the point is in
+                the grid and its distance to surface exceeds `sdf_cache_error_bound`.
+        """
+        if self.sdf_grid is None:
+            self._build_sdf_grid()
+        values = self.sdf_grid["values"]
+        spacing = float(self.sdf_grid["spacing"])
+        shape = np.asarray(values.shape)
+
+        rel = (points - self.sdf_grid["origin"]) / spacing
+        in_grid = ((rel >= 0) & (rel <= shape - 1)).all(axis=1)
+        index = np.clip(np.floor(rel), 0, shape - 2).astype("int64")
+        t = np.clip(rel - index, 0.0, 1.0)
+
+        sdf = np.zeros([len(points)], "float64")
+        sdf_derivs = np.zeros([len(points), self.ndim], "float64")
+        for corner in np.ndindex(2, 2, 2):
+            corner_values = values[
+                index[:, 0] + corner[0],
+                index[:, 1] + corner[1],
+                index[:, 2] + corner[2],
+            ]
+            # weights of corner and their derivatives along each axis
+            w = [t[:, i] if corner[i] else 1.0 - t[:, i] for i in range(self.ndim)]
+            dw = [1.0 if corner[i] else -1.0 for i in range(self.ndim)]
+            sdf += w[0] * w[1] * w[2] * corner_values
+            sdf_derivs[:, 0] += dw[0] * w[1] * w[2] * corner_values
+            sdf_derivs[:, 1] += w[0] * dw[1] * w[2] * corner_values
+            sdf_derivs[:, 2] += w[0] * w[1] * dw[2] * corner_values
+        sdf_derivs /= spacing
+
+        valid_mask = in_grid & (np.abs(sdf) > self.sdf_cache_error_bound)
+        return sdf, sdf_derivs, valid_mask
 
     def is_inside(self, x):
         # NOTE: point on boundary is included
@@ -236,80 +393,53 @@ class Mesh(geometry.Geometry):
         Returns:
             np.ndarray: Approximated areas with shape of [n_faces, ].
         """
-        triangle_areas = area_of_triangles(self.v0, self.v1, self.v2)
-        triangle_probabilities = triangle_areas / np.linalg.norm(triangle_areas, ord=1)
-        triangle_index = np.arange(triangle_probabilities.shape[0])
-        npoint_per_triangle = np.random.choice(
-            triangle_index, n_appr, p=triangle_probabilities
-        )
-        npoint_per_triangle, _ = np.histogram(
-            npoint_per_triangle,
-            np.arange(triangle_probabilities.shape[0] + 1) - 0.5,
-        )
+        points, face_index = self._sample_on_surface(n_appr, random)
+        npoint_per_face = np.bincount(face_index, minlength=self.num_faces)
+        appr_areas = self.triangle_areas[face_index] / npoint_per_face[face_index]
 
-        appr_areas = []
+        # set invalid area to 0 by computing criteria mask with sampled points
         if criteria is not None:
-            aux_points = []
-
-        for i, npoint in enumerate(npoint_per_triangle):
-            if npoint == 0:
-                continue
-            # sample points for computing criteria mask if criteria is given
-            if criteria is not None:
-                points_at_triangle_i = sample_in_triangle(
-                    self.v0[i], self.v1[i], self.v2[i], npoint, random
-                )
-                aux_points.append(points_at_triangle_i)
+            criteria_mask = criteria(*np.split(points, self.ndim, 1)).flatten()
+            appr_areas = appr_areas * criteria_mask
+        return appr_areas.sum()
 
-            appr_areas.append(
-                np.full(
-                    (npoint, 1), triangle_areas[i] / npoint, paddle.get_default_dtype()
-                )
-            )
-        appr_areas = np.concatenate(appr_areas, axis=0)  # [n_appr, 1]
+    def _sample_on_surface(self, n: int, random: str = "pseudo"):
+        """Sample points on surface of mesh, the probability of choosing a face is
+        proportional to its area.
 
-        # set invalid area to 0 by computing criteria mask with auxiliary points
-        if criteria is not None:
-            aux_points = np.concatenate(aux_points, axis=0)  # [n_appr, 3]
-            criteria_mask = criteria(*np.split(aux_points, self.ndim, 1))
-            appr_areas *= criteria_mask
-        return appr_areas.sum()
+        Args:
+            n (int): Number of points.
+            random (str, optional): Random method. Defaults to "pseudo".
 
-    def random_boundary_points(self, n, random="pseudo"):
-        triangle_area = area_of_triangles(self.v0, self.v1, self.v2)
-        triangle_prob = triangle_area / np.linalg.norm(triangle_area, ord=1)
-        npoint_per_triangle = np.random.choice(
-            np.arange(len(triangle_prob)), n, p=triangle_prob
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sampled points with shape of [n, 3] and
+                index of face where each point located with shape of [n, ].
+        """
+        r = sampler.sample(n, 3, random)
+        face_index = np.searchsorted(
+            self.cum_triangle_areas,
+            r[:, 0] * self.cum_triangle_areas[-1],
+            side="right",
         )
-        npoint_per_triangle, _ = np.histogram(
-            npoint_per_triangle, np.arange(len(triangle_prob) + 1) - 0.5
+        face_index = np.minimum(face_index, self.num_faces - 1)
+        points = sample_in_triangles(
+            self.v0[face_index],
+            self.v1[face_index],
+            self.v2[face_index],
+            r[:, 1],
+            r[:, 2],
         )
+        return points, face_index
 
-        points = []
-        normal = []
-        areas = []
-        for i, npoint in enumerate(npoint_per_triangle):
-            if npoint == 0:
-                continue
-            points_at_triangle_i = sample_in_triangle(
-                self.v0[i], self.v1[i], self.v2[i], npoint, random
-            )
-            normal_at_triangle_i = np.tile(self.face_normal[i], (npoint, 1)).astype(
-                paddle.get_default_dtype()
-            )
-            areas_at_triangle_i = np.full(
-                (npoint, 1),
-                triangle_area[i] / npoint,
-                dtype=paddle.get_default_dtype(),
-            )
-
-            points.append(points_at_triangle_i)
-            normal.append(normal_at_triangle_i)
-            areas.append(areas_at_triangle_i)
-
-        points = np.concatenate(points, axis=0)
-        normal = np.concatenate(normal, axis=0)
-        areas = np.concatenate(areas, axis=0)
+    def random_boundary_points(self, n, random="pseudo"):
+        points, face_index = self._sample_on_surface(n, random)
+        normal = self.face_normal[face_index].astype(paddle.get_default_dtype())
+        # area of each point is the area of its face divided by number of points
+        # sampled in the face
+        npoint_per_face = np.bincount(face_index, minlength=self.num_faces)
+        areas = (self.triangle_areas[face_index] / npoint_per_face[face_index]).astype(
+            paddle.get_default_dtype()
+        )[:, np.newaxis]
 
         return points, normal, areas
 
@@ -603,3 +733,25 @@ def sample_in_triangle(v0, v1, v2, n, random="pseudo", criteria=None):
     zs = np.concatenate(zs, axis=0)
 
     return np.stack([xs, ys, zs], axis=1)
+
+
+def sample_in_triangles(v0, v1, v2, r1, r2):
+    """
+    Sample one point in each 3D triangle defined by 3 vertices v0, v1, v2 with given
+    uniform random numbers r1, r2, which is the vectorized version of
+    `sample_in_triangle`.
+
+    Args:
+        v0 (np.ndarray): Coordinates of the first vertex of triangles with shape of [N, 3].
+        v1 (np.ndarray): Coordinates of the second vertex of triangles with shape of [N, 3].
+        v2 (np.ndarray): Coordinates of the third vertex of triangles with shape of [N, 3].
+        r1 (np.ndarray): Uniform random numbers in [0, 1] with shape of [N, ].
+        r2 (np.ndarray): Uniform random numbers in [0, 1] with shape of [N, ].
+
+    Returns:
+        np.ndarray: Coordinates of sampled N points with shape of [N, 3].
+    """
+    s1 = np.sqrt(r1)[:, np.newaxis]
+    r2 = r2[:, np.newaxis]
+    points = v0 * (1.0 - s1) + v1 * (1.0 - r2) * s1 + v2 * r2 * s1
+    return points.astype(paddle.get_default_dtype())
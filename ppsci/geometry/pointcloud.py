@@ -21,6 +21,8 @@ from typing import Tuple
 import numpy as np
 
 from ppsci.geometry import geometry
+from ppsci.utils import checker
+from ppsci.utils import logger
 from ppsci.utils import misc
 
 
@@ -32,6 +34,11 @@ class PointCloud(geometry.Geometry):
         coord_keys (Tuple[str, ...]): Tuple of coordinate keys, such as ("x", "y").
         boundary (Dict[str, np.ndarray]): Boundary points of a point cloud. Defaults to None.
         boundary_normal (Dict[str, np.ndarray]): Boundary normal points of a point cloud. Defaults to None.
+        atol (float, optional): Absolute tolerance of each coordinate when checking
+            whether a point belongs to interior or boundary points. Defaults to 1e-6.
+        chunk_size (int, optional): Number of query points processed at a time when
+            scipy is not available and brute-force matching is used.
+            Defaults to 1024.
 
     Examples:
         >>> import ppsci
@@ -46,6 +53,8 @@ class PointCloud(geometry.Geometry):
         coord_keys: Tuple[str, ...],
         boundary: Optional[Dict[str, np.ndarray]] = None,
         boundary_normal: Optional[Dict[str, np.ndarray]] = None,
+        atol: float = 1e-6,
+        chunk_size: int = 1024,
     ):
         # Interior points
         self.interior = misc.convert_to_array(interior, coord_keys)
@@ -68,6 +77,12 @@ class PointCloud(geometry.Geometry):
                     f"to normal's shape({self.normal.shape})"
                 )
 
+        self.atol = atol
+        self.chunk_size = chunk_size
+        # KD-trees of interior and boundary points, built at the first query
+        self._interior_tree = None
+        self._boundary_tree = None
+
         self.input_keys = coord_keys
         super().__init__(
             len(coord_keys),
@@ -81,32 +96,65 @@ class PointCloud(geometry.Geometry):
 
     def is_inside(self, x):
         # NOTE: point on boundary is included
-        return (
-            np.isclose((x[:, None, :] - self.interior[None, :, :]), 0, atol=1e-6)
-            .all(axis=2)
-            .any(axis=1)
-        )
+        if self._interior_tree is None:
+            self._interior_tree = self._build_tree(self.interior)
+        return self._any_close(x, self.interior, self._interior_tree)
 
     def on_boundary(self, x):
-        if not self.boundary:
+        if self.boundary is None:
             raise ValueError(
                 "self.boundary must be initialized" " when call 'on_boundary' function"
             )
-        return (
-            np.isclose(
-                (x[:, None, :] - self.boundary[None, :, :]),
-                0,
-                atol=1e-6,
+        if self._boundary_tree is None:
+            self._boundary_tree = self._build_tree(self.boundary)
+        return self._any_close(x, self.boundary, self._boundary_tree)
+
+    def _build_tree(self, points: np.ndarray):
+        """Build KD-tree for given points, return False if scipy is not available."""
+        if not checker.dynamic_import_to_globals(["scipy"]):
+            logger.warning(
+                "Could not import scipy, brute-force matching in chunks will be used "
+                "for 'is_inside' and 'on_boundary' of PointCloud."
             )
-            .all(axis=2)
-            .any(axis=1)
-        )
+            return False
+        from scipy import spatial
+
+        return spatial.cKDTree(points)
+
+    def _any_close(self, x: np.ndarray, points: np.ndarray, tree) -> np.ndarray:
+        """Return a boolean array where x is close to any of given points, i.e. the
+        difference of each coordinate is not greater than `atol`.
+        """
+        if tree is not False:
+            # chebyshev distance(p=inf) equals to the maximum coordinate difference
+            dist, _ = tree.query(
+                x,
+                k=1,
+                p=np.inf,
+                distance_upper_bound=np.nextafter(self.atol, np.inf),
+            )
+            return np.isfinite(dist)
+
+        mask = np.empty([len(x)], dtype=bool)
+        for i in range(0, len(x), self.chunk_size):
+            mask[i : i + self.chunk_size] = (
+                np.isclose(
+                    (x[i : i + self.chunk_size, None, :] - points[None, :, :]),
+                    0,
+                    atol=self.atol,
+                )
+                .all(axis=2)
+                .any(axis=1)
+            )
+        return mask
 
     def translate(self, translation):
         for i, offset in enumerate(translation):
             self.interior[:, i] += offset
             if self.boundary:
                 self.boundary += offset
+        self._interior_tree = None
+        self._boundary_tree = None
         return self
 
     def scale(self, scale):
@@ -116,6 +164,8 @@ class PointCloud(geometry.Geometry):
                 self.boundary[:, i] *= _scale
             if self.normal:
                 self.normal[:, i] *= _scale
+        self._interior_tree = None
+        self._boundary_tree = None
         return self
 
     def uniform_boundary_points(self, n: int):
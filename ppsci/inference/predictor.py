@@ -0,0 +1,203 @@
+# Copyright (c) 2023 PaddlePaddle Authors. All Rights Reserved.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#     http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+import paddle
+from paddle import inference as paddle_inference
+from typing_extensions import Literal
+
+from ppsci.utils import logger
+
+
+class Predictor:
+    """Predictor of static inference model exported by `Solver.export`, which runs
+    with Paddle Inference API.
+
+    Args:
+        model_path (str): Path prefix of exported files, i.e. "{model_path}.pdmodel"
+            or "{model_path}.json"(PIR), "{model_path}.pdiparams" and
+            "{model_path}.keys.json".
+        device (Literal["cpu", "gpu"], optional): Runtime device. Defaults to "cpu".
+        num_cpu_threads (int, optional): Number of threads of CPU math library.
+            Defaults to 1.
+        enable_mkldnn (bool, optional): Whether enable MKLDNN(oneDNN) on CPU.
+            Defaults to False.
+        gpu_id (int, optional): GPU device id. Defaults to 0.
+        gpu_mem (int, optional): Initial GPU memory pool size in MB. Defaults to 500.
+        batch_size (Optional[int]): Predicting by batch size, can be tuned by
+            `tune_batch_size`. Defaults to None, which means predicting all samples
+            at once.
+
+    Examples:
+        >>> import ppsci
+        >>> predictor = ppsci.inference.Predictor(
+        ...     "./output/inference/inference",
+        ...     num_cpu_threads=4,
+        ...     enable_mkldnn=True,
+        ... )  # doctest: +SKIP
+        >>> pred = predictor.predict({"x": x, "y": y})  # doctest: +SKIP
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        device: Literal["cpu", "gpu"] = "cpu",
+        num_cpu_threads: int = 1,
+        enable_mkldnn: bool = False,
+        gpu_id: int = 0,
+        gpu_mem: int = 500,
+        batch_size: Optional[int] = None,
+    ):
+        # model structure is saved in ".json" instead of ".pdmodel" with PIR
+        for model_suffix in (".pdmodel", ".json"):
+            if os.path.exists(f"{model_path}{model_suffix}"):
+                break
+        else:
+            raise FileNotFoundError(
+                f"Neither {model_path}.pdmodel nor {model_path}.json exists."
+            )
+        if not os.path.exists(f"{model_path}.pdiparams"):
+            raise FileNotFoundError(f"{model_path}.pdiparams does not exist.")
+
+        config = paddle_inference.Config(
+            f"{model_path}{model_suffix}", f"{model_path}.pdiparams"
+        )
+        if device == "gpu":
+            config.enable_use_gpu(gpu_mem, gpu_id)
+        elif device == "cpu":
+            config.disable_gpu()
+            config.set_cpu_math_library_num_threads(num_cpu_threads)
+            if enable_mkldnn:
+                config.enable_mkldnn()
+        else:
+            raise ValueError(f"device should be 'cpu' or 'gpu', but got {device}.")
+        config.switch_ir_optim(True)
+        if model_suffix == ".pdmodel":
+            # memory optimize pass only exists for old IR, PIR runs inplace pass
+            config.enable_memory_optim()
+        config.switch_use_feed_fetch_ops(False)
+        config.disable_glog_info()
+        self.predictor = paddle_inference.create_predictor(config)
+
+        # map outputs of inference model to output keys
+        self.input_keys = tuple(self.predictor.get_input_names())
+        self.output_names = tuple(self.predictor.get_output_names())
+        self.output_keys = self.output_names
+        if os.path.exists(f"{model_path}.keys.json"):
+            with open(f"{model_path}.keys.json", "r") as f:
+                keys = json.load(f)
+            self.input_keys = tuple(keys["input_keys"])
+            self.output_keys = tuple(keys["output_keys"])
+        self.batch_size = batch_size
+
+    def _run(self, input_dict: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Run inference model once on given inputs."""
+        for key in self.input_keys:
+            handle = self.predictor.get_input_handle(key)
+            handle.reshape(input_dict[key].shape)
+            handle.copy_from_cpu(input_dict[key])
+        self.predictor.run()
+        return {
+            key: self.predictor.get_output_handle(name).copy_to_cpu()
+            for key, name in zip(self.output_keys, self.output_names)
+        }
+
+    def predict(
+        self,
+        input_dict: Dict[str, np.ndarray],
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Predict by inference model.
+
+        Args:
+            input_dict (Dict[str, np.ndarray]): Input data in dict.
+            batch_size (Optional[int]): Predicting by batch size. Defaults to None,
+                which means `self.batch_size` is used.
+
+        Returns:
+            Dict[str, np.ndarray]: Prediction in dict.
+        """
+        dtype = paddle.get_default_dtype()
+        input_dict = {
+            key: np.ascontiguousarray(input_dict[key], dtype=dtype)
+            for key in self.input_keys
+        }
+        num_samples = len(next(iter(input_dict.values())))
+        if batch_size is None:
+            batch_size = self.batch_size or num_samples
+        if batch_size >= num_samples:
+            return self._run(input_dict)
+
+        pred_dict = {key: [] for key in self.output_keys}
+        for st in range(0, num_samples, batch_size):
+            batch_output_dict = self._run(
+                {key: value[st : st + batch_size] for key, value in input_dict.items()}
+            )
+            for key, batch_output in batch_output_dict.items():
+                pred_dict[key].append(batch_output)
+        return {key: np.concatenate(value) for key, value in pred_dict.items()}
+
+    def tune_batch_size(
+        self,
+        input_dict: Dict[str, np.ndarray],
+        candidates: Sequence[int] = (256, 1024, 4096, 16384, 65536),
+        repeat: int = 3,
+    ) -> int:
+        """Choose batch size with the highest throughput on given inputs among
+        candidates, and set it as `self.batch_size`.
+
+        Args:
+            input_dict (Dict[str, np.ndarray]): Input data in dict, which should be
+                representative of data to be predicted.
+            candidates (Sequence[int], optional): Candidate batch sizes.
+                Defaults to (256, 1024, 4096, 16384, 65536).
+            repeat (int, optional): Number of repeated runs for each candidate.
+                Defaults to 3.
+
+        Returns:
+            int: Tuned batch size.
+        """
+        num_samples = len(next(iter(input_dict.values())))
+        best_batch_size, best_throughput = None, 0.0
+        for batch_size in sorted(candidates):
+            batch_size = min(batch_size, num_samples)
+            # warmup
+            self.predict(input_dict, batch_size)
+            tic = time.perf_counter()
+            for _ in range(repeat):
+                self.predict(input_dict, batch_size)
+            throughput = num_samples * repeat / (time.perf_counter() - tic)
+            logger.debug(
+                f"batch_size: {batch_size}, throughput: {throughput:.1f} samples/s"
+            )
+            if throughput > best_throughput:
+                best_batch_size, best_throughput = batch_size, throughput
+            if batch_size == num_samples:
+                break
+
+        self.batch_size = best_batch_size
+        logger.info(
+            f"Tuned batch size: {best_batch_size}, "
+            f"throughput: {best_throughput:.1f} samples/s"
+        )
+        return best_batch_size
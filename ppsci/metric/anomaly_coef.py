@@ -86,25 +86,27 @@ class LatitudeWeightedACC(base.Metric):
     def scale_expm1(self, x: paddle.Tensor):
         return self.scale * paddle.expm1(x)
 
+    def _sample_acc(self, output: paddle.Tensor, label: paddle.Tensor):
+        """Compute latitude weighted acc of each sample and channel with shape of
+        [N, C].
+        """
+        output = self.scale_expm1(output) if self.unlog else output
+        label = self.scale_expm1(label) if self.unlog else label
+
+        if self.mean is not None:
+            output = output - self.mean
+            label = label - self.mean
+
+        return paddle.sum(self.weight * output * label, axis=(-1, -2)) / paddle.sqrt(
+            paddle.sum(self.weight * output**2, axis=(-1, -2))
+            * paddle.sum(self.weight * label**2, axis=(-1, -2))
+        )
+
     @paddle.no_grad()
     def forward(self, output_dict, label_dict):
         metric_dict = {}
         for key in label_dict:
-            output = (
-                self.scale_expm1(output_dict[key]) if self.unlog else output_dict[key]
-            )
-            label = self.scale_expm1(label_dict[key]) if self.unlog else label_dict[key]
-
-            if self.mean is not None:
-                output = output - self.mean
-                label = label - self.mean
-
-            rmse = paddle.sum(
-                self.weight * output * label, axis=(-1, -2)
-            ) / paddle.sqrt(
-                paddle.sum(self.weight * output**2, axis=(-1, -2))
-                * paddle.sum(self.weight * label**2, axis=(-1, -2))
-            )
+            rmse = self._sample_acc(output_dict[key], label_dict[key])
 
             if self.variable_dict is not None:
                 for variable_name, idx in self.variable_dict.items():
@@ -118,3 +120,29 @@ class LatitudeWeightedACC(base.Metric):
                 else:
                     metric_dict[key] = rmse.mean()
         return metric_dict
+
+    @property
+    def support_streaming(self) -> bool:
+        return not self.keep_batch
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            acc = self._sample_acc(output_dict[key], label_dict[key])
+            self._accumulate(key, "sum", acc.sum(axis=0))
+            self._accumulate(key, "count", acc.shape[0])
+
+    def compute(self):
+        metric_dict = {}
+        for key in self._state_keys():
+            # mean acc of each channel over all samples, with shape of [C, ]
+            acc = (self._states[(key, "sum")] / self._states[(key, "count")]).astype(
+                paddle.get_default_dtype()
+            )
+            if self.variable_dict is not None:
+                for variable_name, idx in self.variable_dict.items():
+                    metric_dict[f"{key}.{variable_name}"] = acc[idx]
+            else:
+                metric_dict[key] = acc.mean()
+
+        return metric_dict
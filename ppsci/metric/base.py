@@ -14,12 +14,70 @@
 
 from __future__ import annotations
 
+from typing import Dict
+from typing import Tuple
+from typing import Union
+
+import paddle
 from paddle import nn
 
 
 class Metric(nn.Layer):
-    """Base class for metric."""
+    """Base class for metric.
+
+    Besides computing metric from given data by `forward`, metric can also be
+    computed in a streaming way: call `update` on each batch to accumulate sufficient
+    statistics, `reduce` to sum them up across ranks if data is split over ranks, and
+    `compute` to get the final metric. `reset` should be called before a new round.
+    Only metrics whose `support_streaming` is True implement this protocol.
+    """
 
     def __init__(self, keep_batch: bool = False):
         super().__init__()
         self.keep_batch = keep_batch
+        self._states: Dict[Tuple[str, str], paddle.Tensor] = {}
+
+    @property
+    def support_streaming(self) -> bool:
+        """Whether this metric can be computed by `update` and `compute`."""
+        return False
+
+    def reset(self):
+        """Clear accumulated statistics."""
+        self._states = {}
+
+    def update(
+        self,
+        output_dict: Dict[str, paddle.Tensor],
+        label_dict: Dict[str, paddle.Tensor],
+    ):
+        """Accumulate sufficient statistics of given batch."""
+        raise NotImplementedError(
+            f"{self.__class__.__name__}.update is not implemented"
+        )
+
+    def compute(self) -> Dict[str, paddle.Tensor]:
+        """Compute metric from accumulated statistics."""
+        raise NotImplementedError(
+            f"{self.__class__.__name__}.compute is not implemented"
+        )
+
+    def reduce(self):
+        """Sum up accumulated statistics across all ranks."""
+        for state in self._states.values():
+            paddle.distributed.all_reduce(state)
+
+    def _accumulate(self, key: str, stat: str, value: Union[paddle.Tensor, float]):
+        """Add value to statistic `stat` of data `key`, in float64 for precision."""
+        if isinstance(value, paddle.Tensor):
+            value = value.detach().astype("float64")
+        else:
+            value = paddle.to_tensor(value, dtype="float64")
+        if (key, stat) in self._states:
+            self._states[(key, stat)] = self._states[(key, stat)] + value
+        else:
+            self._states[(key, stat)] = value
+
+    def _state_keys(self) -> Tuple[str, ...]:
+        """Data keys of accumulated statistics, in order of first update."""
+        return tuple(dict.fromkeys(key for key, _ in self._states))
@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+import math
+
 import numpy as np
 import paddle
 
@@ -64,6 +66,27 @@ class L2Rel(base.Metric):
 
         return metric_dict
 
+    @property
+    def support_streaming(self) -> bool:
+        return True
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            self._accumulate(
+                key, "err_sq", ((label_dict[key] - output_dict[key]) ** 2).sum()
+            )
+            self._accumulate(key, "label_sq", (label_dict[key] ** 2).sum())
+
+    def compute(self):
+        return {
+            key: (
+                self._states[(key, "err_sq")] ** 0.5
+                / (self._states[(key, "label_sq")] ** 0.5).clip(min=self.EPS)
+            ).astype(paddle.get_default_dtype())
+            for key in self._state_keys()
+        }
+
 
 class MeanL2Rel(base.Metric):
     r"""Class for mean l2 relative error.
@@ -109,3 +132,24 @@ class MeanL2Rel(base.Metric):
                 metric_dict[key] = rel_l2.mean()
 
         return metric_dict
+
+    @property
+    def support_streaming(self) -> bool:
+        return not self.keep_batch
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            rel_l2 = paddle.norm(
+                label_dict[key] - output_dict[key], p=2, axis=1
+            ) / paddle.norm(label_dict[key], p=2, axis=1).clip(min=self.EPS)
+            self._accumulate(key, "sum", rel_l2.sum())
+            self._accumulate(key, "count", math.prod(rel_l2.shape))
+
+    def compute(self):
+        return {
+            key: (self._states[(key, "sum")] / self._states[(key, "count")]).astype(
+                paddle.get_default_dtype()
+            )
+            for key in self._state_keys()
+        }
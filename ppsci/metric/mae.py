@@ -14,6 +14,8 @@
 
 from __future__ import annotations
 
+import math
+
 import paddle
 import paddle.nn.functional as F
 
@@ -53,3 +55,22 @@ class MAE(base.Metric):
                 metric_dict[key] = mae.mean()
 
         return metric_dict
+
+    @property
+    def support_streaming(self) -> bool:
+        return not self.keep_batch
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            mae = F.l1_loss(output_dict[key], label_dict[key], "none")
+            self._accumulate(key, "sum", mae.sum())
+            self._accumulate(key, "count", math.prod(mae.shape))
+
+    def compute(self):
+        return {
+            key: (self._states[(key, "sum")] / self._states[(key, "count")]).astype(
+                paddle.get_default_dtype()
+            )
+            for key in self._state_keys()
+        }
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import math
 from typing import Dict
 from typing import Optional
 from typing import Tuple
@@ -59,6 +60,25 @@ class RMSE(base.Metric):
 
         return metric_dict
 
+    @property
+    def support_streaming(self) -> bool:
+        return True
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            mse = F.mse_loss(output_dict[key], label_dict[key], "none")
+            self._accumulate(key, "sum", mse.sum())
+            self._accumulate(key, "count", math.prod(mse.shape))
+
+    def compute(self):
+        return {
+            key: (
+                (self._states[(key, "sum")] / self._states[(key, "count")]) ** 0.5
+            ).astype(paddle.get_default_dtype())
+            for key in self._state_keys()
+        }
+
 
 class LatitudeWeightedRMSE(base.Metric):
     r"""Latitude weighted root mean square error.
@@ -121,19 +141,24 @@ class LatitudeWeightedRMSE(base.Metric):
     def scale_expm1(self, x: paddle.Tensor):
         return self.scale * paddle.expm1(x)
 
+    def _sample_rmse(self, output: paddle.Tensor, label: paddle.Tensor):
+        """Compute latitude weighted rmse of each sample and channel with shape of
+        [N, C].
+        """
+        output = self.scale_expm1(output) if self.unlog else output
+        label = self.scale_expm1(label) if self.unlog else label
+
+        mse = F.mse_loss(output, label, "none")
+        rmse = (mse * self.weight).mean(axis=(-1, -2)) ** 0.5
+        if self.std is not None:
+            rmse = rmse * self.std
+        return rmse
+
     @paddle.no_grad()
     def forward(self, output_dict, label_dict):
         metric_dict = {}
         for key in label_dict:
-            output = (
-                self.scale_expm1(output_dict[key]) if self.unlog else output_dict[key]
-            )
-            label = self.scale_expm1(label_dict[key]) if self.unlog else label_dict[key]
-
-            mse = F.mse_loss(output, label, "none")
-            rmse = (mse * self.weight).mean(axis=(-1, -2)) ** 0.5
-            if self.std is not None:
-                rmse = rmse * self.std
+            rmse = self._sample_rmse(output_dict[key], label_dict[key])
             if self.variable_dict is not None:
                 for variable_name, idx in self.variable_dict.items():
                     metric_dict[f"{key}.{variable_name}"] = (
@@ -143,3 +168,29 @@ class LatitudeWeightedRMSE(base.Metric):
                 metric_dict[key] = rmse.mean(axis=1) if self.keep_batch else rmse.mean()
 
         return metric_dict
+
+    @property
+    def support_streaming(self) -> bool:
+        return not self.keep_batch
+
+    @paddle.no_grad()
+    def update(self, output_dict, label_dict):
+        for key in label_dict:
+            rmse = self._sample_rmse(output_dict[key], label_dict[key])
+            self._accumulate(key, "sum", rmse.sum(axis=0))
+            self._accumulate(key, "count", rmse.shape[0])
+
+    def compute(self):
+        metric_dict = {}
+        for key in self._state_keys():
+            # mean rmse of each channel over all samples, with shape of [C, ]
+            rmse = (self._states[(key, "sum")] / self._states[(key, "count")]).astype(
+                paddle.get_default_dtype()
+            )
+            if self.variable_dict is not None:
+                for variable_name, idx in self.variable_dict.items():
+                    metric_dict[f"{key}.{variable_name}"] = rmse[idx]
+            else:
+                metric_dict[key] = rmse.mean()
+
+        return metric_dict
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import math
 from typing import Callable
 from typing import Dict
+from typing import Tuple
 
 import paddle
 from paddle import distribution
@@ -58,6 +60,12 @@ class HamiltonianMonteCarlo:
         >>>    return dist.log_prob(kwargs['x'])
         >>> HMC = HamiltonianMonteCarlo(log_posterior, path_len=1.5, step_size=0.25)
         >>> trial = HMC.run_chain(1000, {'x': paddle.to_tensor(0.0)})
+        >>> # run 8 chains in batch, log posterior should return shape of [8, ]
+        >>> def batched_log_posterior(**kwargs):
+        >>>    dist = paddle.distribution.Normal(loc=0, scale=1)
+        >>>    return dist.log_prob(kwargs['x']).sum(axis=-1)
+        >>> HMC = HamiltonianMonteCarlo(batched_log_posterior, num_warmup_steps=100)
+        >>> trial = HMC.run_chains(1000, {'x': paddle.zeros([8, 1])})
     """
 
     def __init__(
@@ -122,6 +130,160 @@ class HamiltonianMonteCarlo:
 
         return sampling_result
 
+    def run_chains(
+        self,
+        epochs: int,
+        initial_position: Dict[str, paddle.Tensor],
+        thinning: int = 1,
+        adapt_step_size: bool = True,
+        target_accept_prob: float = 0.8,
+    ) -> Dict[str, paddle.Tensor]:
+        """Run C independent chains in batch, where C is the size of leading
+        dimension of each tensor in `initial_position`. `distribution_fn` should
+        accept positions with leading dimension C and return log probabilities with
+        shape of [C, ].
+
+        Potential energy and its gradient are cached between leapfrog steps, so each
+        transition evaluates `distribution_fn` once per leapfrog step. Step size is
+        shared by all chains and tuned by dual averaging during warmup if
+        `adapt_step_size` is True, with path length kept unchanged. The adapted step
+        size is only used within this call, `self.step_size` and `self.steps` are
+        left unchanged so repeated calls start from the same configuration.
+
+        Args:
+            epochs (int): Number of transitions after warmup.
+            initial_position (Dict[str, paddle.Tensor]): Initial positions of chains,
+                each with shape of [C, ...].
+            thinning (int, optional): Keep one sample for every `thinning`
+                transitions. Defaults to 1.
+            adapt_step_size (bool, optional): Whether to adapt step size during
+                warmup. Defaults to True.
+            target_accept_prob (float, optional): Target acceptance probability of
+                step size adaptation. Defaults to 0.8.
+
+        Returns:
+            Dict[str, paddle.Tensor]: Samples of each chain with shape of
+                [C, epochs // thinning, ...].
+        """
+        pos = {k: v.detach() for k, v in initial_position.items()}
+        potential, grad = self._potential_energy_and_gradient(pos)
+        step_size, steps = self.step_size, self.steps
+
+        # warmup
+        if adapt_step_size and self.num_warmup_steps > 0:
+            # dual averaging from Hoffman & Gelman(2014), Algorithm 5
+            mu = math.log(10 * step_size)
+            gamma, t0, kappa = 0.05, 10.0, 0.75
+            h_bar, log_step_size_bar = 0.0, 0.0
+        for m in range(1, self.num_warmup_steps + 1):
+            pos, potential, grad, accept_prob = self._batched_transition(
+                pos, potential, grad, step_size, steps
+            )
+            if adapt_step_size:
+                eta = 1.0 / (m + t0)
+                h_bar = (1 - eta) * h_bar + eta * (
+                    target_accept_prob - float(accept_prob.mean())
+                )
+                log_step_size = mu - math.sqrt(m) / gamma * h_bar
+                m_kappa = m**-kappa
+                log_step_size_bar = (
+                    m_kappa * log_step_size + (1 - m_kappa) * log_step_size_bar
+                )
+                step_size = (
+                    math.exp(log_step_size_bar)
+                    if m == self.num_warmup_steps
+                    else math.exp(log_step_size)
+                )
+                steps = max(int(self.path_len / step_size), 1)
+
+        # begin collecting sampling result into preallocated buffers
+        num_samples = epochs // thinning
+        sampling_result = {
+            k: paddle.empty([v.shape[0], num_samples, *v.shape[1:]], dtype=v.dtype)
+            for k, v in pos.items()
+        }
+        for e in range(num_samples * thinning):
+            pos, potential, grad, _ = self._batched_transition(
+                pos, potential, grad, step_size, steps
+            )
+            if (e + 1) % thinning == 0:
+                for k, v in pos.items():
+                    sampling_result[k][:, e // thinning] = v
+
+        return sampling_result
+
+    def _batched_transition(
+        self,
+        q0: Dict[str, paddle.Tensor],
+        potential0: paddle.Tensor,
+        grad0: Dict[str, paddle.Tensor],
+        step_size: float,
+        steps: int,
+    ) -> Tuple[
+        Dict[str, paddle.Tensor],
+        paddle.Tensor,
+        Dict[str, paddle.Tensor],
+        paddle.Tensor,
+    ]:
+        """
+        Single transition for all chains, with cached potential and gradient at q0
+        """
+        p0 = {k: paddle.randn(v.shape, dtype=v.dtype) for k, v in q0.items()}
+
+        # leapfrog, gradient at the end of each step is reused by the next step
+        q1, potential1, grad1 = q0, potential0, grad0
+        p1 = {k: v - step_size * grad1[k] / 2 for k, v in p0.items()}
+        for s in range(steps):
+            q1 = {k: v + step_size * p1[k] for k, v in q1.items()}
+            potential1, grad1 = self._potential_energy_and_gradient(q1)
+            p_step_size = step_size if s < steps - 1 else step_size / 2
+            p1 = {k: v - p_step_size * grad1[k] for k, v in p1.items()}
+
+        # calculate the Metropolis acceptance probability of each chain
+        energy_current = potential0 + self._batched_k_energy_fn(p0)
+        energy_proposed = potential1 + self._batched_k_energy_fn(p1)
+        accept_prob = paddle.minimum(
+            paddle.ones_like(energy_current),
+            paddle.exp(energy_current - energy_proposed),
+        )
+        accept_prob = paddle.where(
+            paddle.isnan(accept_prob), paddle.zeros_like(accept_prob), accept_prob
+        )
+
+        # whether accept the proposed state position of each chain
+        accept = paddle.rand(accept_prob.shape, dtype=accept_prob.dtype) < accept_prob
+        q = {k: self._select(accept, v, q0[k]) for k, v in q1.items()}
+        grad = {k: self._select(accept, v, grad0[k]) for k, v in grad1.items()}
+        potential = paddle.where(accept, potential1, potential0)
+        return q, potential, grad, accept_prob
+
+    @staticmethod
+    def _select(
+        mask: paddle.Tensor, x: paddle.Tensor, y: paddle.Tensor
+    ) -> paddle.Tensor:
+        # broadcast mask with shape of [C, ] to shape of x
+        mask = mask.reshape([-1] + [1] * (x.ndim - 1)).expand(x.shape)
+        return paddle.where(mask, x, y)
+
+    def _potential_energy_and_gradient(
+        self, pos: Dict[str, paddle.Tensor]
+    ) -> Tuple[paddle.Tensor, Dict[str, paddle.Tensor]]:
+        """
+        Calculate potential energy with shape of [C, ] and its gradient of all chains
+        """
+        pos = {k: v.detach() for k, v in pos.items()}
+        for v in pos.values():
+            v.stop_gradient = False
+        potential = -self.distribution_fn(**pos)
+        grads = paddle.grad(potential.sum(), list(pos.values()))
+        return potential.detach(), {k: g.detach() for k, g in zip(pos.keys(), grads)}
+
+    def _batched_k_energy_fn(self, r: Dict[str, paddle.Tensor]) -> paddle.Tensor:
+        energy = 0.0
+        for v in r.values():
+            energy = energy + (v * v).reshape([v.shape[0], -1]).sum(axis=1)
+        return 0.5 * energy
+
     def _potential_energy_gradient(
         self, pos: Dict[str, paddle.Tensor]
     ) -> Dict[str, paddle.Tensor]:
@@ -29,6 +29,28 @@ if TYPE_CHECKING:
     from ppsci import solver
 
 
+def _num_valid_samples(
+    num_samples: int, num_seen: int, rank: int, local_batch_size: int
+) -> int:
+    """Number of leading samples in local batch of given rank which are not padded.
+
+    Batches of all ranks at each step are consecutive in total data, and padded
+    samples are at the tail of it, i.e. the same as concatenating gathered batches.
+
+    Args:
+        num_samples (int): Number of samples in dataset.
+        num_seen (int): Number of samples of all ranks in previous steps.
+        rank (int): Rank of local batch.
+        local_batch_size (int): Batch size of each rank at current step.
+
+    Returns:
+        int: Number of valid samples in local batch.
+    """
+    return min(
+        max(num_samples - num_seen - rank * local_batch_size, 0), local_batch_size
+    )
+
+
 def _eval_by_dataset(
     solver: "solver.Solver", epoch_id: int, log_freq: int
 ) -> Tuple[float, Dict[str, Dict[str, float]]]:
@@ -45,6 +67,15 @@ def _eval_by_dataset(
     """
     target_metric: float = None
     for _, _validator in solver.validator.items():
+        # accumulate statistics of metrics batch by batch instead of keeping
+        # all data if all metrics support it
+        streaming = all(
+            metric_func.support_streaming for metric_func in _validator.metric.values()
+        )
+        if streaming:
+            for metric_func in _validator.metric.values():
+                metric_func.reset()
+        num_seen = 0
         all_input = misc.Prettydefaultdict(list)
         all_output = misc.Prettydefaultdict(list)
         all_label = misc.Prettydefaultdict(list)
@@ -83,25 +114,44 @@ def _eval_by_dataset(
 
             loss_dict[f"loss({_validator.name})"] = float(validator_loss)
 
-            # collect batch data
-            for key, input in input_dict.items():
-                all_input[key].append(
-                    input.detach()
-                    if solver.world_size == 1
-                    else misc.all_gather(input.detach())
-                )
-            for key, output in output_dict.items():
-                all_output[key].append(
-                    output.detach()
-                    if solver.world_size == 1
-                    else misc.all_gather(output.detach())
-                )
-            for key, label in label_dict.items():
-                all_label[key].append(
-                    label.detach()
-                    if solver.world_size == 1
-                    else misc.all_gather(label.detach())
+            if streaming:
+                # update statistics on local batch without gathering, discarding
+                # padded sample(s) at the tail of all ranks' data, which is the
+                # same data as concatenating gathered batches of all ranks
+                local_batch_size = next(iter(input_dict.values())).shape[0]
+                num_valid = _num_valid_samples(
+                    num_samples, num_seen, solver.rank, local_batch_size
                 )
+                num_seen += local_batch_size * solver.world_size
+                batch_output = {
+                    key: output.detach()[:num_valid]
+                    for key, output in output_dict.items()
+                }
+                batch_label = {
+                    key: label.detach()[:num_valid] for key, label in label_dict.items()
+                }
+                for metric_func in _validator.metric.values():
+                    metric_func.update(batch_output, batch_label)
+            else:
+                # collect batch data
+                for key, input in input_dict.items():
+                    all_input[key].append(
+                        input.detach()
+                        if solver.world_size == 1
+                        else misc.all_gather(input.detach())
+                    )
+                for key, output in output_dict.items():
+                    all_output[key].append(
+                        output.detach()
+                        if solver.world_size == 1
+                        else misc.all_gather(output.detach())
+                    )
+                for key, label in label_dict.items():
+                    all_label[key].append(
+                        label.detach()
+                        if solver.world_size == 1
+                        else misc.all_gather(label.detach())
+                    )
 
             batch_cost = time.perf_counter() - batch_tic
             solver.eval_time_info["reader_cost"].update(reader_cost)
@@ -134,9 +184,17 @@ def _eval_by_dataset(
             if len(all_label[key]) > num_samples:
                 all_label[key] = all_label[key][:num_samples]
 
+        # sum up statistics of all ranks once instead of gathering every batch
+        if streaming and solver.world_size > 1:
+            for metric_func in _validator.metric.values():
+                metric_func.reduce()
+
         metric_dict_group = misc.PrettyOrderedDict()
         for metric_name, metric_func in _validator.metric.items():
-            metric_dict = metric_func(all_output, all_label)
+            if streaming:
+                metric_dict = metric_func.compute()
+            else:
+                metric_dict = metric_func(all_output, all_label)
             metric_dict_group[metric_name] = metric_dict
             for var_name, metric_value in metric_dict.items():
                 metric_str = f"{metric_name}.{var_name}({_validator.name})"
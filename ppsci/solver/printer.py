@@ -19,6 +19,7 @@ from __future__ import print_function
 import datetime
 from typing import TYPE_CHECKING
 from typing import Dict
+from typing import Tuple
 
 from ppsci.utils import logger
 from ppsci.utils import misc
@@ -48,6 +49,37 @@ def update_eval_loss(
         trainer.eval_output_info[key].update(float(loss_dict[key]), batch_size)
 
 
+def _derivative_cache_info(trainer: "solver.Solver") -> Tuple[str, Dict[str, float]]:
+    """Format counters of derivative cache accumulated since last log and reset them.
+
+    Returns:
+        Tuple[str, Dict[str, float]]: Message appended to train log and scalars.
+    """
+    stats = trainer.forward_helper.derivative_stats
+    num_lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    if num_lookups == 0:
+        stats.clear()
+        return "", {}
+
+    hit_rate = stats["hits"] / num_lookups
+    retained_mb = stats["retained_bytes"] / 1024**2
+    msg = (
+        f", derivative cache[hits: {stats['hits']}, misses: {stats['misses']}, "
+        f"hit rate: {hit_rate:.2%}, sweeps: {stats['sweeps']}, "
+        f"nodes: {stats['nodes']}, retained: {retained_mb:.2f} MB]"
+    )
+    scalars = {
+        "train/derivative_hits": stats["hits"],
+        "train/derivative_misses": stats["misses"],
+        "train/derivative_hit_rate": hit_rate,
+        "train/derivative_sweeps": stats["sweeps"],
+        "train/derivative_nodes": stats["nodes"],
+        "train/derivative_retained_mb": retained_mb,
+    }
+    stats.clear()
+    return msg, scalars
+
+
 def log_train_info(
     trainer: "solver.Solver", batch_size: int, epoch_id: int, iter_id: int
 ):
@@ -72,10 +104,11 @@ def log_train_info(
         (trainer.epochs - epoch_id + 1) * trainer.iters_per_epoch - iter_id
     ) * trainer.train_time_info["batch_cost"].avg
     eta_msg = f"eta: {str(datetime.timedelta(seconds=int(eta_sec))):s}"
+    derivative_msg, derivative_scalars = _derivative_cache_info(trainer)
     logger.info(
         f"[Train][Epoch {epoch_id}/{trainer.epochs}]"
         f"[Iter: {iter_id}/{trainer.iters_per_epoch}] {lr_msg}, "
-        f"{metric_msg}, {time_msg}, {ips_msg}, {eta_msg}"
+        f"{metric_msg}, {time_msg}, {ips_msg}, {eta_msg}{derivative_msg}"
     )
 
     logger.scaler(
@@ -85,6 +118,7 @@ def log_train_info(
                 f"train/{key}": trainer.train_output_info[key].avg
                 for key in trainer.train_output_info
             },
+            **derivative_scalars,
         },
         step=trainer.global_step,
         vdl_writer=trainer.vdl_writer,
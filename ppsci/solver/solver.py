@@ -16,12 +16,14 @@ from __future__ import annotations
 
 import contextlib
 import itertools
+import json
 import os
 import sys
 from typing import Any
 from typing import Callable
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import numpy as np
@@ -46,6 +48,19 @@ from ppsci.utils import misc
 from ppsci.utils import save_load
 
 
+class _ExportWrapper(nn.Layer):
+    """Wrap model and return outputs in a tuple ordered by given output keys."""
+
+    def __init__(self, model: nn.Layer, output_keys: Tuple[str, ...]):
+        super().__init__()
+        self.model = model
+        self.output_keys = output_keys
+
+    def forward(self, x: Dict[str, paddle.Tensor]) -> Tuple[paddle.Tensor, ...]:
+        y = self.model(x)
+        return tuple(y[key] for key in self.output_keys)
+
+
 class Solver:
     """Class for solver.
 
@@ -81,6 +96,27 @@ class Solver:
             involved during computation, generally for save GPU memory and accelerate computing. Defaults to False.
         to_static (bool, optional): Whether enable to_static for forward pass. Defaults to False.
         loss_aggregator (Optional[mtl.LossAggregator]): Loss aggregator, such as a multi-task learning loss aggregator. Defaults to None.
+        deferred_metrics (bool, optional): Whether keep training losses on device and only convert them to python
+            float every `log_freq` steps and at the end of each epoch, which avoids device-to-host synchronization
+            in every step. Defaults to False.
+        fuse_constraint_forward (bool, optional): Whether run model forward only once for constraints with the
+            same input keys by concatenating their inputs during training. Only valid for models which compute
+            every sample independently, such as MLP. Defaults to False.
+        prefetch_depth (int, optional): Number of batches prefetched by a background thread for each constraint
+            during training, 0 means no prefetching. Defaults to 0.
+        num_chunks (Optional[Union[int, Dict[str, int]]]): Number of micro-chunks each constraint's batch is split
+            into during training, either an integer for all constraints or a dict mapping constraint name to its
+            number of chunks. Forward and backward are done chunk by chunk with gradients accumulated, which bounds
+            peak memory and gives the same gradients as full batch. Defaults to None.
+        async_checkpoint (bool, optional): Whether save checkpoints in a background thread, only copying states to
+            host memory blocks training. Pending "latest" checkpoints are coalesced, and all checkpoints are written
+            before `train` returns. Defaults to False.
+        cse_output_expr (bool, optional): Whether convert sympy expressions in `output_expr` of each constraint,
+            validator and visualizer together into one shared graph by `ppsci.lambdify`, with common subexpressions
+            across them eliminated, so that every shared node is built and computed only once. Defaults to False.
+        lambdify_backend (Literal["node", "codegen"], optional): Backend of `ppsci.lambdify` for converting sympy
+            expressions in `output_expr`. "codegen" generates a flat python function for each expression, which
+            saves the overhead of calling converted nodes one by one. Defaults to "node".
 
     Examples:
         >>> import ppsci
@@ -140,11 +176,20 @@ class Solver:
         eval_with_no_grad: bool = False,
         to_static: bool = False,
         loss_aggregator: Optional[mtl.LossAggregator] = None,
+        deferred_metrics: bool = False,
+        fuse_constraint_forward: bool = False,
+        prefetch_depth: int = 0,
+        num_chunks: Optional[Union[int, Dict[str, int]]] = None,
+        async_checkpoint: bool = False,
+        cse_output_expr: bool = False,
+        lambdify_backend: Literal["node", "codegen"] = "node",
     ):
         # set model
         self.model = model
         # set constraint
         self.constraint = constraint
+        # number of batches prefetched in background thread during training
+        self.prefetch_depth = prefetch_depth
         # set output directory
         self.output_dir = output_dir
 
@@ -160,8 +205,14 @@ class Solver:
         self.update_freq = update_freq
         # set checkpoint saving frequency
         self.save_freq = save_freq
+        # write checkpoints in background thread if specified
+        self.checkpoint_writer = (
+            save_load.AsyncCheckpointWriter() if async_checkpoint else None
+        )
         # set logging frequency
         self.log_freq = log_freq
+        # whether materialize training losses only when logging
+        self.deferred_metrics = deferred_metrics
 
         # set evaluation hyper-parameter
         self.eval_during_train = eval_during_train
@@ -305,15 +356,48 @@ class Solver:
         )
         logger.info(f"Using paddlepaddle {paddle_version} on device {self.device}")
 
-        self.forward_helper = expression.ExpressionSolver()
+        self.forward_helper = expression.ExpressionSolver(fuse_constraint_forward)
 
         # whether enable static for forward pass, default to Fals
+        self.to_static = to_static
         jit.enable_to_static(to_static)
         logger.info(f"Set to_static={to_static} for forward computation.")
 
         # use loss aggregator, use summation if None
         self.loss_aggregator = loss_aggregator
 
+        # split batch of constraint into micro-chunks for forward and backward
+        self.num_chunks = None
+        if num_chunks is not None and self.constraint:
+            if isinstance(num_chunks, int):
+                num_chunks = {name: num_chunks for name in self.constraint}
+            unknown_names = [name for name in num_chunks if name not in self.constraint]
+            if unknown_names:
+                raise ValueError(
+                    f"Constraint(s) {unknown_names} in num_chunks do not exist, "
+                    f"valid constraint names are {list(self.constraint)}."
+                )
+            if any(_num_chunks < 1 for _num_chunks in num_chunks.values()):
+                raise ValueError(f"num_chunks({num_chunks}) should be >= 1.")
+            if any(_num_chunks > 1 for _num_chunks in num_chunks.values()):
+                if self.loss_aggregator is not None:
+                    raise ValueError(
+                        "loss_aggregator should be None when num_chunks is set."
+                    )
+                for name, _num_chunks in num_chunks.items():
+                    _loss = self.constraint[name].loss
+                    if _num_chunks > 1 and type(_loss) not in (
+                        ppsci.loss.MSELoss,
+                        ppsci.loss.L1Loss,
+                    ):
+                        raise TypeError(
+                            f"Loss of constraint({name}) should be MSELoss or L1Loss "
+                            f"when num_chunks > 1, but got {misc.typename(_loss)}."
+                        )
+                self.num_chunks = tuple(
+                    num_chunks.get(name, 1) for name in self.constraint
+                )
+
         # convert sympy to callable object if exist
         extra_parameters = []
         if self.equation:
@@ -331,6 +415,20 @@ class Solver:
             ]
         ) -> None:
             for container in container_dict.values():
+                exprs = {
+                    name: expr
+                    for name, expr in container.output_expr.items()
+                    if isinstance(expr, sp.Basic)
+                }
+                if cse_output_expr and len(exprs) > 1:
+                    funcs = ppsci.lambdify(
+                        list(exprs.values()),
+                        self.model,
+                        extra_parameters,
+                        backend=lambdify_backend,
+                    )
+                    container.output_expr.update(zip(exprs.keys(), funcs))
+                    continue
                 for name, expr in container.output_expr.items():
                     if isinstance(expr, sp.Basic):
                         container.output_expr[name] = ppsci.lambdify(
@@ -338,6 +436,7 @@ class Solver:
                             self.model,
                             extra_parameters,
                             # os.path.join(self.output_dir, container.name, name),  # HACK: Activate it for DEBUG.
+                            backend=lambdify_backend,
                         )
 
         if self.constraint:
@@ -442,73 +541,112 @@ class Solver:
         """Training."""
         self.global_step = self.best_metric["epoch"] * self.iters_per_epoch
 
-        for epoch_id in range(self.best_metric["epoch"] + 1, self.epochs + 1):
-            self.train_epoch_func(self, epoch_id, self.log_freq)
+        # prefetch batches of each constraint in background thread
+        if self.prefetch_depth > 0:
+            for _constraint in self.constraint.values():
+                _constraint.data_iter = ppsci.data.dataloader.PrefetchDataLoader(
+                    _constraint.data_loader, self.prefetch_depth
+                )
+
+        try:
+            for epoch_id in range(self.best_metric["epoch"] + 1, self.epochs + 1):
+                self.train_epoch_func(self, epoch_id, self.log_freq)
 
-            # log training summation at end of a epoch
-            metric_msg = ", ".join(
-                [self.train_output_info[key].avg_info for key in self.train_output_info]
-            )
-            logger.info(f"[Train][Epoch {epoch_id}/{self.epochs}][Avg] {metric_msg}")
-            self.train_output_info.clear()
-
-            cur_metric = float("inf")
-            # evaluate during training
-            if (
-                self.eval_during_train
-                and epoch_id % self.eval_freq == 0
-                and epoch_id >= self.start_eval_epoch
-            ):
-                cur_metric = self.eval(epoch_id)
-                cur_metric, metric_dict = self.eval(epoch_id)
-                if cur_metric < self.best_metric["metric"]:
-                    self.best_metric["metric"] = cur_metric
-                    self.best_metric["epoch"] = epoch_id
+                # log training summation at end of a epoch
+                metric_msg = ", ".join(
+                    [
+                        self.train_output_info[key].avg_info
+                        for key in self.train_output_info
+                    ]
+                )
+                logger.info(
+                    f"[Train][Epoch {epoch_id}/{self.epochs}][Avg] {metric_msg}"
+                )
+                self.train_output_info.clear()
+
+                # residual-based adaptive refinement for constraint(s) if specified
+                for _constraint in self.constraint.values():
+                    if (
+                        isinstance(_constraint, ppsci.constraint.InteriorConstraint)
+                        and _constraint.rar_cfg is not None
+                        and epoch_id % _constraint.rar_cfg["freq"] == 0
+                    ):
+                        _constraint.refine(self.model)
+
+                cur_metric = float("inf")
+                # evaluate during training
+                if (
+                    self.eval_during_train
+                    and epoch_id % self.eval_freq == 0
+                    and epoch_id >= self.start_eval_epoch
+                ):
+                    cur_metric = self.eval(epoch_id)
+                    cur_metric, metric_dict = self.eval(epoch_id)
+                    if cur_metric < self.best_metric["metric"]:
+                        self.best_metric["metric"] = cur_metric
+                        self.best_metric["epoch"] = epoch_id
+                        save_load.save_checkpoint(
+                            self.model,
+                            self.optimizer,
+                            self.best_metric,
+                            self.scaler,
+                            self.output_dir,
+                            "best_model",
+                            self.equation,
+                            self.checkpoint_writer,
+                        )
+                    logger.info(
+                        f"[Eval][Epoch {epoch_id}]"
+                        f"[best metric: {self.best_metric['metric']}]"
+                    )
+                    logger.scaler(
+                        metric_dict, epoch_id, self.vdl_writer, self.wandb_writer
+                    )
+
+                    # visualize after evaluation
+                    if self.visualizer is not None:
+                        self.visualize(epoch_id)
+
+                # update learning rate by epoch
+                if self.lr_scheduler is not None and self.lr_scheduler.by_epoch:
+                    self.lr_scheduler.step()
+
+                # save epoch model every save_freq epochs
+                if self.save_freq > 0 and epoch_id % self.save_freq == 0:
                     save_load.save_checkpoint(
                         self.model,
                         self.optimizer,
-                        self.best_metric,
+                        {"metric": cur_metric, "epoch": epoch_id},
                         self.scaler,
                         self.output_dir,
-                        "best_model",
+                        f"epoch_{epoch_id}",
                         self.equation,
+                        self.checkpoint_writer,
                     )
-                logger.info(
-                    f"[Eval][Epoch {epoch_id}]"
-                    f"[best metric: {self.best_metric['metric']}]"
-                )
-                logger.scaler(metric_dict, epoch_id, self.vdl_writer, self.wandb_writer)
 
-                # visualize after evaluation
-                if self.visualizer is not None:
-                    self.visualize(epoch_id)
-
-            # update learning rate by epoch
-            if self.lr_scheduler is not None and self.lr_scheduler.by_epoch:
-                self.lr_scheduler.step()
-
-            # save epoch model every save_freq epochs
-            if self.save_freq > 0 and epoch_id % self.save_freq == 0:
+                # save the latest model for convenient resume training
                 save_load.save_checkpoint(
                     self.model,
                     self.optimizer,
                     {"metric": cur_metric, "epoch": epoch_id},
                     self.scaler,
                     self.output_dir,
-                    f"epoch_{epoch_id}",
+                    "latest",
                     self.equation,
+                    self.checkpoint_writer,
                 )
-
-            # save the latest model for convenient resume training
-            save_load.save_checkpoint(
-                self.model,
-                self.optimizer,
-                {"metric": cur_metric, "epoch": epoch_id},
-                self.scaler,
-                self.output_dir,
-                "latest",
-                self.equation,
-            )
+        finally:
+            # stop background threads of prefetching
+            for _constraint in self.constraint.values():
+                if isinstance(
+                    _constraint.data_iter, ppsci.data.dataloader.PrefetchDataLoader
+                ):
+                    _constraint.data_iter.close()
+                    _constraint.data_iter = iter(_constraint.data_loader)
+
+        # wait for checkpoints being written in background
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.flush()
 
         # close VisualDL
         if self.vdl_writer is not None:
@@ -658,9 +796,80 @@ class Solver:
         return pred_dict
 
     @misc.run_on_eval_mode
-    def export(self):
-        """Export to inference model."""
-        raise NotImplementedError("model export is not supported yet.")
+    def export(
+        self,
+        export_path: Optional[str] = None,
+        input_shape: Optional[Dict[str, Tuple[Optional[int], ...]]] = None,
+    ) -> str:
+        """Export model to static inference model, which can be loaded by
+        `ppsci.inference.Predictor`.
+
+        Model structure is saved as "{export_path}.pdmodel", or "{export_path}.json"
+        if PIR is enabled, together with parameters in "{export_path}.pdiparams".
+        Input and output keys are recorded in "{export_path}.keys.json" so that
+        outputs of inference model can be mapped back to output keys.
+
+        Args:
+            export_path (Optional[str]): Path prefix of exported files. Defaults to
+                None, which means "{output_dir}/inference/inference".
+            input_shape (Optional[Dict[str, Tuple[Optional[int], ...]]]): Shape of
+                each input, None in shape means variable dimension. Defaults to None,
+                which means [None, 1] for every input key.
+
+        Returns:
+            str: Path prefix of exported files.
+
+        Examples:
+            >>> import ppsci
+            >>> model = ppsci.arch.MLP(("x", "y"), ("u",), 5, 20)
+            >>> solver = ppsci.solver.Solver(model, output_dir="./output")  # doctest: +SKIP
+            >>> solver.export()  # doctest: +SKIP
+        """
+        model = self.model._layers if self.world_size > 1 else self.model
+        if isinstance(model, ppsci.arch.ModelList):
+            sub_models = model.model_list
+        else:
+            sub_models = [model]
+        input_keys = []
+        output_keys = []
+        for sub_model in sub_models:
+            input_keys.extend(k for k in sub_model.input_keys if k not in input_keys)
+            output_keys.extend(sub_model.output_keys)
+
+        if input_shape is None:
+            input_shape = {}
+        input_spec = [
+            {
+                key: paddle.static.InputSpec(
+                    input_shape.get(key, [None, 1]), paddle.get_default_dtype(), key
+                )
+                for key in input_keys
+            }
+        ]
+
+        if export_path is None:
+            export_path = os.path.join(self.output_dir, "inference", "inference")
+        os.makedirs(os.path.dirname(os.path.abspath(export_path)), exist_ok=True)
+
+        # outputs of static program are flattened in order of sorted keys, so wrap
+        # model to return outputs in a fixed order of `output_keys`.
+        # dynamic-to-static conversion is required by exporting even if `to_static`
+        # is disabled for training.
+        jit.enable_to_static(True)
+        try:
+            static_model = jit.to_static(
+                _ExportWrapper(model, tuple(output_keys)),
+                input_spec=input_spec,
+                full_graph=True,
+            )
+            jit.save(static_model, export_path)
+        finally:
+            jit.enable_to_static(self.to_static)
+        with open(f"{export_path}.keys.json", "w") as f:
+            json.dump({"input_keys": input_keys, "output_keys": output_keys}, f)
+
+        logger.info(f"Inference model has been exported to: {export_path}")
+        return export_path
 
     def autocast_context_manager(
         self, enable: bool, level: Literal["O0", "O1", "O2"] = "O1"
@@ -14,7 +14,11 @@
 
 import time
 from typing import TYPE_CHECKING
+from typing import Dict
+from typing import List
+from typing import Tuple
 
+import paddle
 from paddle.distributed.fleet.utils import hybrid_parallel_util as hpu
 
 from ppsci.solver import printer
@@ -26,6 +30,38 @@ if TYPE_CHECKING:
     from ppsci import solver
 
 
+def _flush_deferred_loss(
+    solver: "solver.Solver",
+    pending_losses: List[Tuple[Dict[str, "paddle.Tensor"], int]],
+):
+    """Materialize deferred losses of several steps with only one device-to-host
+    synchronization, then update them into printer step by step.
+
+    Args:
+        solver (solver.Solver): Main solver.
+        pending_losses (List[Tuple[Dict[str, paddle.Tensor], int]]): Loss dict and
+            batch size of each step which is not updated into printer yet.
+    """
+    if not pending_losses:
+        return
+    keys = list(pending_losses[0][0].keys())
+    loss_values = paddle.concat(
+        [
+            paddle.reshape(paddle.cast(loss_dict[key], "float32"), [1])
+            for loss_dict, _ in pending_losses
+            for key in keys
+        ]
+    ).numpy()
+    loss_values = loss_values.reshape([len(pending_losses), len(keys)])
+    for i, (_, batch_size) in enumerate(pending_losses):
+        printer.update_train_loss(
+            solver,
+            {key: float(loss_values[i][j]) for j, key in enumerate(keys)},
+            batch_size,
+        )
+    pending_losses.clear()
+
+
 def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
     """Train program for one epoch
 
@@ -35,6 +71,9 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
         log_freq (int): Log training information every `log_freq` steps.
     """
     batch_tic = time.perf_counter()
+    # losses of steps which are not updated into printer yet, only used when
+    # `solver.deferred_metrics` is True
+    pending_losses = []
 
     for iter_id in range(1, solver.iters_per_epoch + 1):
         total_loss = 0
@@ -71,32 +110,68 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
             total_batch_size += next(iter(input_dict.values())).shape[0]
             reader_tic = time.perf_counter()
 
+        def chunk_backward_func(chunk_loss):
+            """Backward function for loss of each chunk in chunked mode."""
+            if solver.update_freq > 1:
+                chunk_loss = chunk_loss / solver.update_freq
+            if solver.use_amp:
+                solver.scaler.scale(chunk_loss).backward()
+            else:
+                chunk_loss.backward()
+
         with solver.no_sync_context_manager(solver.world_size > 1, solver.model):
             # forward for every constraint, including model and equation expression
             with solver.autocast_context_manager(solver.use_amp, solver.amp_level):
-                constraint_losses = solver.forward_helper.train_forward(
-                    tuple(
-                        _constraint.output_expr
-                        for _constraint in solver.constraint.values()
-                    ),
-                    input_dicts,
-                    solver.model,
-                    solver.constraint,
-                    label_dicts,
-                    weight_dicts,
-                )
+                if solver.num_chunks is None:
+                    constraint_losses = solver.forward_helper.train_forward(
+                        tuple(
+                            _constraint.output_expr
+                            for _constraint in solver.constraint.values()
+                        ),
+                        input_dicts,
+                        solver.model,
+                        solver.constraint,
+                        label_dicts,
+                        weight_dicts,
+                    )
+                else:
+                    # backward is done chunk by chunk within forward
+                    constraint_losses = solver.forward_helper.train_forward_chunked(
+                        tuple(
+                            _constraint.output_expr
+                            for _constraint in solver.constraint.values()
+                        ),
+                        input_dicts,
+                        solver.model,
+                        solver.constraint,
+                        label_dicts,
+                        weight_dicts,
+                        solver.num_chunks,
+                        chunk_backward_func,
+                    )
                 # accumulate all losses
                 for i, _constraint in enumerate(solver.constraint.values()):
                     total_loss += constraint_losses[i]
-                    loss_dict[_constraint.name] += (
-                        float(constraint_losses[i]) / solver.update_freq
-                    )
+                    if solver.deferred_metrics:
+                        loss_dict[_constraint.name] = (
+                            constraint_losses[i].detach() / solver.update_freq
+                        )
+                    else:
+                        loss_dict[_constraint.name] += (
+                            float(constraint_losses[i]) / solver.update_freq
+                        )
                 if solver.update_freq > 1:
                     total_loss = total_loss / solver.update_freq
-                loss_dict["loss"] = float(total_loss)
+                if solver.deferred_metrics:
+                    loss_dict["loss"] = total_loss.detach()
+                else:
+                    loss_dict["loss"] = float(total_loss)
 
-            # backward
-            if solver.loss_aggregator is None:
+            # backward, which has been done within forward in chunked mode
+            if solver.num_chunks is not None:
+                if solver.use_amp:
+                    total_loss_scaled = solver.scaler.scale(total_loss)
+            elif solver.loss_aggregator is None:
                 if solver.use_amp:
                     total_loss_scaled = solver.scaler.scale(total_loss)
                     total_loss_scaled.backward()
@@ -127,7 +202,16 @@ def train_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int):
         solver.global_step += 1
         solver.train_time_info["reader_cost"].update(reader_cost)
         solver.train_time_info["batch_cost"].update(batch_cost)
-        printer.update_train_loss(solver, loss_dict, total_batch_size)
+        if solver.deferred_metrics:
+            pending_losses.append((loss_dict, total_batch_size))
+            if (
+                iter_id == 1
+                or iter_id % log_freq == 0
+                or iter_id == solver.iters_per_epoch
+            ):
+                _flush_deferred_loss(solver, pending_losses)
+        else:
+            printer.update_train_loss(solver, loss_dict, total_batch_size)
         if iter_id == 1 or iter_id % log_freq == 0:
             printer.log_train_info(solver, total_batch_size, epoch_id, iter_id)
 
@@ -143,6 +227,9 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
         log_freq (int): Log training information every `log_freq` steps.
     """
     batch_tic = time.perf_counter()
+    # losses of steps which are not updated into printer yet, only used when
+    # `solver.deferred_metrics` is True
+    pending_losses = []
 
     for iter_id in range(1, solver.iters_per_epoch + 1):
         loss_dict = misc.Prettydefaultdict(float)
@@ -180,33 +267,56 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
             """
             total_loss = 0
             with solver.no_sync_context_manager(solver.world_size > 1, solver.model):
+                solver.optimizer.clear_grad()
                 with solver.autocast_context_manager(solver.use_amp, solver.amp_level):
                     # forward for every constraint, including model and equation expression
-                    constraint_losses = solver.forward_helper.train_forward(
-                        tuple(
-                            _constraint.output_expr
-                            for _constraint in solver.constraint.values()
-                        ),
-                        input_dicts,
-                        solver.model,
-                        solver.constraint,
-                        label_dicts,
-                        weight_dicts,
-                    )
+                    if solver.num_chunks is None:
+                        constraint_losses = solver.forward_helper.train_forward(
+                            tuple(
+                                _constraint.output_expr
+                                for _constraint in solver.constraint.values()
+                            ),
+                            input_dicts,
+                            solver.model,
+                            solver.constraint,
+                            label_dicts,
+                            weight_dicts,
+                        )
+                    else:
+                        # backward is done chunk by chunk within forward
+                        constraint_losses = solver.forward_helper.train_forward_chunked(
+                            tuple(
+                                _constraint.output_expr
+                                for _constraint in solver.constraint.values()
+                            ),
+                            input_dicts,
+                            solver.model,
+                            solver.constraint,
+                            label_dicts,
+                            weight_dicts,
+                            solver.num_chunks,
+                            lambda chunk_loss: chunk_loss.backward(),
+                        )
                     # accumulate all losses
                     for i, _constraint in enumerate(solver.constraint.values()):
                         total_loss += constraint_losses[i]
-                        loss_dict[_constraint.name] = float(constraint_losses[i])
-                    loss_dict["loss"] = float(total_loss)
-
-                # backward
-                solver.optimizer.clear_grad()
-                if solver.loss_aggregator is None:
-                    total_loss.backward()
-                else:
-                    solver.loss_aggregator(
-                        constraint_losses, solver.global_step
-                    ).backward()
+                        if solver.deferred_metrics:
+                            loss_dict[_constraint.name] = constraint_losses[i].detach()
+                        else:
+                            loss_dict[_constraint.name] = float(constraint_losses[i])
+                    if solver.deferred_metrics:
+                        loss_dict["loss"] = total_loss.detach()
+                    else:
+                        loss_dict["loss"] = float(total_loss)
+
+                # backward, which has been done within forward in chunked mode
+                if solver.num_chunks is None:
+                    if solver.loss_aggregator is None:
+                        total_loss.backward()
+                    else:
+                        solver.loss_aggregator(
+                            constraint_losses, solver.global_step
+                        ).backward()
 
             if solver.world_size > 1:
                 # fuse + allreduce manually before optimization if use DDP model
@@ -228,7 +338,16 @@ def train_LBFGS_epoch_func(solver: "solver.Solver", epoch_id: int, log_freq: int
         solver.global_step += 1
         solver.train_time_info["reader_cost"].update(reader_cost)
         solver.train_time_info["batch_cost"].update(batch_cost)
-        printer.update_train_loss(solver, loss_dict, total_batch_size)
+        if solver.deferred_metrics:
+            pending_losses.append((loss_dict, total_batch_size))
+            if (
+                iter_id == 1
+                or iter_id % log_freq == 0
+                or iter_id == solver.iters_per_epoch
+            ):
+                _flush_deferred_loss(solver, pending_losses)
+        else:
+            printer.update_train_loss(solver, loss_dict, total_batch_size)
         if iter_id == 1 or iter_id % log_freq == 0:
             printer.log_train_info(solver, total_batch_size, epoch_id, iter_id)
 
@@ -17,33 +17,43 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
+import paddle
 from paddle import jit
 from paddle import nn
 
 if TYPE_CHECKING:
-    import paddle
     from ppsci import constraint
     from ppsci import validate
     from ppsci import arch
 
-from ppsci.autodiff import clear
+from ppsci.autodiff import DerivativeCache
 
 
 class ExpressionSolver(nn.Layer):
     """Expression computing helper, which compute named result according to corresponding
     function and related inputs.
 
+    Args:
+        fuse_forward (bool, optional): Whether concatenate inputs of constraints which
+            have the same input keys and run model forward only once for them in
+            `train_forward`. Only valid for models which compute every sample
+            independently, such as MLP. Defaults to False.
+
     Examples:
         >>> import ppsci
         >>> model = ppsci.arch.MLP(("x", "y"), ("u", "v"), 5, 128)
         >>> expr_solver = ExpressionSolver()
     """
 
-    def __init__(self):
+    def __init__(self, fuse_forward: bool = False):
         super().__init__()
+        self.fuse_forward = fuse_forward
+        # counters of derivative cache in training, accumulated until being logged
+        self.derivative_stats: Dict[str, int] = {}
 
     def forward(self, *args, **kwargs):
         raise NotImplementedError(
@@ -74,16 +84,24 @@ class ExpressionSolver(nn.Layer):
         Returns:
             Tuple[paddle.Tensor, ...]: Tuple of losses for each constraint.
         """
+        if self.fuse_forward:
+            # model forward for all constraints in a fused way
+            fused_output_dicts = self._fused_model_forward(input_dicts, model)
+
         output_dicts = []
         for i, expr_dict in enumerate(expr_dicts):
             # model forward
-            output_dict = model(input_dicts[i])
+            if self.fuse_forward:
+                output_dict = fused_output_dicts[i]
+            else:
+                output_dict = model(input_dicts[i])
 
-            # equation forward
+            # equation forward, differentiation cache is cleared at the end of scope
             data_dict = {k: v for k, v in input_dicts[i].items()}
             data_dict.update(output_dict)
-            for name, expr in expr_dict.items():
-                output_dict[name] = expr(data_dict)
+            with DerivativeCache(self.derivative_stats):
+                for name, expr in expr_dict.items():
+                    output_dict[name] = expr(data_dict)
 
             # put field 'area' into output_dict
             if "area" in input_dicts[i]:
@@ -91,9 +109,6 @@ class ExpressionSolver(nn.Layer):
 
             output_dicts.append(output_dict)
 
-            # clear differentiation cache
-            clear()
-
         # compute loss for each constraint according to its' own output, label and weight
         constraint_losses = []
         for i, _constraint in enumerate(constraint.values()):
@@ -105,6 +120,148 @@ class ExpressionSolver(nn.Layer):
             constraint_losses.append(constraint_loss)
         return constraint_losses
 
+    def train_forward_chunked(
+        self,
+        expr_dicts: Tuple[Dict[str, Callable], ...],
+        input_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        model: arch.Arch,
+        constraint: Dict[str, "constraint.Constraint"],
+        label_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        weight_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        num_chunks: Tuple[int, ...],
+        backward_func: Callable[["paddle.Tensor"], None],
+    ) -> Tuple["paddle.Tensor", ...]:
+        """Forward and backward computation for training, which splits batch of each
+        constraint into micro-chunks and runs model forward, equation forward, loss and
+        backward chunk by chunk, so only computational graph of one chunk is kept in
+        memory at the same time. Gradients are accumulated into parameters and equal to
+        those of full batch, as chunk losses are rescaled by their size for "mean"
+        reduction.
+
+        NOTE: Only loss which is a sum or mean over samples can be computed by chunks,
+        such as MSELoss and L1Loss.
+
+        Args:
+            expr_dicts (Tuple[Dict[str, Callable], ...]): Tuple of expression dicts.
+            input_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of input dicts.
+            model (arch.Arch): NN model.
+            constraint (Dict[str, "constraint.Constraint"]): Constraint dict.
+            label_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of label dicts.
+            weight_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of weight dicts.
+            num_chunks (Tuple[int, ...]): Number of chunks for each constraint.
+            backward_func (Callable[[paddle.Tensor], None]): Function for backward of
+                loss of each chunk, such as `lambda loss: loss.backward()`.
+
+        Returns:
+            Tuple[paddle.Tensor, ...]: Tuple of detached losses for each constraint.
+        """
+
+        def slice_dict(data_dict, st, ed, as_leaf=False):
+            if not data_dict:
+                return data_dict
+            chunk_dict = {}
+            for key, value in data_dict.items():
+                if as_leaf:
+                    # create new leaf tensor, so that graph of each chunk is independent
+                    chunk_dict[key] = value[st:ed].detach()
+                    chunk_dict[key].stop_gradient = value.stop_gradient
+                else:
+                    chunk_dict[key] = value[st:ed]
+            return chunk_dict
+
+        constraint_losses = []
+        for i, (expr_dict, _constraint) in enumerate(
+            zip(expr_dicts, constraint.values())
+        ):
+            batch_size = next(iter(input_dicts[i].values())).shape[0]
+            chunk_size = (batch_size + num_chunks[i] - 1) // num_chunks[i]
+            constraint_loss = 0
+            for st in range(0, batch_size, chunk_size):
+                ed = min(st + chunk_size, batch_size)
+                input_dict = slice_dict(input_dicts[i], st, ed, as_leaf=True)
+                label_dict = slice_dict(label_dicts[i], st, ed)
+                weight_dict = slice_dict(weight_dicts[i], st, ed)
+
+                # model forward
+                output_dict = model(input_dict)
+
+                # equation forward, differentiation cache is cleared at the end of
+                # scope
+                data_dict = {k: v for k, v in input_dict.items()}
+                data_dict.update(output_dict)
+                with DerivativeCache(self.derivative_stats):
+                    for name, expr in expr_dict.items():
+                        output_dict[name] = expr(data_dict)
+
+                # put field 'area' into output_dict
+                if "area" in input_dict:
+                    output_dict["area"] = input_dict["area"]
+
+                # compute loss of current chunk and rescale it to full batch
+                chunk_loss = _constraint.loss(output_dict, label_dict, weight_dict)
+                if _constraint.loss.reduction == "mean":
+                    chunk_loss = chunk_loss * ((ed - st) / batch_size)
+
+                # backward and free computational graph of current chunk
+                backward_func(chunk_loss)
+                constraint_loss += chunk_loss.detach()
+
+            constraint_losses.append(constraint_loss)
+        return constraint_losses
+
+    def _fused_model_forward(
+        self,
+        input_dicts: Tuple[Dict[str, "paddle.Tensor"], ...],
+        model: arch.Arch,
+    ) -> List[Dict[str, "paddle.Tensor"]]:
+        """Run model forward once for each group of input dicts which have the same
+        keys, per-sample shapes and dtypes, by concatenating them along batch axis and
+        splitting outputs back.
+
+        Args:
+            input_dicts (Tuple[Dict[str, paddle.Tensor], ...]): Tuple of input dicts.
+            model (arch.Arch): NN model.
+
+        Returns:
+            List[Dict[str, paddle.Tensor]]: Output dict of each input dict.
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for i, input_dict in enumerate(input_dicts):
+            group_key = tuple(
+                (key, tuple(input_dict[key].shape[1:]), input_dict[key].dtype)
+                for key in sorted(input_dict.keys())
+            )
+            groups.setdefault(group_key, []).append(i)
+
+        output_dicts = [None] * len(input_dicts)
+        for indices in groups.values():
+            if len(indices) == 1:
+                output_dicts[indices[0]] = model(input_dicts[indices[0]])
+                continue
+
+            # concatenate inputs, the original input tensors are kept as the leaves of
+            # computation graph, so derivatives w.r.t. them are still available
+            batch_sizes = [
+                next(iter(input_dicts[i].values())).shape[0] for i in indices
+            ]
+            fused_input_dict = {
+                key: paddle.concat([input_dicts[i][key] for i in indices])
+                for key in input_dicts[indices[0]]
+            }
+            fused_output_dict = model(fused_input_dict)
+
+            # split outputs back to each constraint
+            split_outputs = {
+                key: paddle.split(value, batch_sizes)
+                for key, value in fused_output_dict.items()
+            }
+            for j, i in enumerate(indices):
+                output_dicts[i] = {
+                    key: value[j] for key, value in split_outputs.items()
+                }
+
+        return output_dicts
+
     @jit.to_static
     def eval_forward(
         self,
@@ -133,19 +290,17 @@ class ExpressionSolver(nn.Layer):
         # model forward
         output_dict = model(input_dict)
 
-        # equation forward
+        # equation forward, differentiation cache is cleared at the end of scope
         data_dict = {k: v for k, v in input_dict.items()}
         data_dict.update(output_dict)
-        for name, expr in expr_dict.items():
-            output_dict[name] = expr(data_dict)
+        with DerivativeCache():
+            for name, expr in expr_dict.items():
+                output_dict[name] = expr(data_dict)
 
         # put field 'area' into output_dict
         if "area" in input_dict:
             output_dict["area"] = input_dict["area"]
 
-        # clear differentiation cache
-        clear()
-
         # compute loss for each validator according to its' own output, label and weight
         validator_loss = validator.loss(
             output_dict,
@@ -175,13 +330,11 @@ class ExpressionSolver(nn.Layer):
         output_dict = model(input_dict)
 
         if isinstance(expr_dict, dict):
-            # equation forward
+            # equation forward, differentiation cache is cleared at the end of scope
             data_dict = {k: v for k, v in input_dict.items()}
             data_dict.update(output_dict)
-            for name, expr in expr_dict.items():
-                output_dict[name] = expr(data_dict)
-
-            # clear differentiation cache
-            clear()
+            with DerivativeCache():
+                for name, expr in expr_dict.items():
+                    output_dict[name] = expr(data_dict)
 
         return output_dict
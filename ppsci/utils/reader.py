@@ -16,8 +16,12 @@ from __future__ import annotations
 
 import collections
 import csv
+import itertools
+import json
+import os
 import sys
 from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
@@ -37,21 +41,181 @@ __all__ = [
 ]
 
 
+# number of lines parsed at a time by `np.loadtxt`
+_CSV_CHUNK_LINES = 65536
+
+
+def _read_csv_header(file_path: str, delimeter: str, encoding: str) -> List[str]:
+    """Read header(first line) of csv file."""
+    with open(file_path, "r", encoding=encoding, newline="") as csv_file:
+        return next(csv.reader(csv_file, delimiter=delimeter), [])
+
+
+def _parse_csv_columns_by_row(
+    file_path: str,
+    names: List[str],
+    delimeter: str,
+    encoding: str,
+    dtype: str,
+) -> List[np.ndarray]:
+    """Parse given columns of csv file row by row, which supports quoted fields."""
+    with open(file_path, "r", encoding=encoding) as csv_file:
+        reader = csv.DictReader(csv_file, delimiter=delimeter)
+        raw_data = collections.defaultdict(list)
+        for line_dict in reader:
+            for key, value in line_dict.items():
+                raw_data[key].append(value)
+    return [np.asarray(raw_data[name], dtype) for name in names]
+
+
+def _parse_csv_columns(
+    file_path: str,
+    header: List[str],
+    names: List[str],
+    delimeter: str,
+    encoding: str,
+    dtype: str,
+) -> List[np.ndarray]:
+    """Parse given columns of csv file by `np.loadtxt` chunk by chunk, and fall back
+    to row by row parsing if the content can't be handled by `np.loadtxt`, e.g.
+    quoted fields.
+    """
+    # the last one wins for duplicated column names, same as csv.DictReader
+    col_index = {name: i for i, name in enumerate(header)}
+    usecols = [col_index[name] for name in names]
+    chunks = []
+    try:
+        with open(file_path, "r", encoding=encoding) as csv_file:
+            next(csv_file)
+            while True:
+                lines = list(itertools.islice(csv_file, _CSV_CHUNK_LINES))
+                if not lines:
+                    break
+                chunks.append(
+                    np.loadtxt(
+                        lines,
+                        dtype=dtype,
+                        delimiter=delimeter,
+                        usecols=usecols,
+                        comments=None,
+                        ndmin=2,
+                    )
+                )
+    except ValueError:
+        return _parse_csv_columns_by_row(file_path, names, delimeter, encoding, dtype)
+
+    data = np.concatenate(chunks) if chunks else np.empty([0, len(usecols)], dtype)
+    return [np.ascontiguousarray(data[:, i]) for i in range(len(usecols))]
+
+
+def _load_csv_columns(
+    file_path: str,
+    header: List[str],
+    names: List[str],
+    delimeter: str,
+    encoding: str,
+    dtype: str,
+    use_cache: bool,
+) -> Dict[str, np.ndarray]:
+    """Load given columns of csv file, through sidecar cache if `use_cache` is True.
+
+    The cache is a hidden directory ".{file_name}.cache" beside csv file, contains
+    one .npy file per column and "meta.json" which records modification time and
+    size of csv file. Cached columns are memory-mapped in copy-on-write mode, and
+    the whole cache is discarded once csv file is modified.
+    """
+    csv_dir, csv_name = os.path.split(os.path.abspath(file_path))
+    cache_dir = os.path.join(csv_dir, f".{csv_name}.cache")
+    meta_path = os.path.join(cache_dir, "meta.json")
+    stat = os.stat(file_path)
+    meta = {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "delimeter": delimeter,
+        "dtype": dtype,
+        "header": header,
+    }
+    col_index = {name: i for i, name in enumerate(header)}
+
+    columns = {}
+    cache_valid = False
+    if use_cache and os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r") as f:
+                cache_valid = json.load(f) == meta
+            if cache_valid:
+                for name in names:
+                    col_path = os.path.join(cache_dir, f"{col_index[name]}.npy")
+                    if os.path.exists(col_path):
+                        columns[name] = np.load(col_path, mmap_mode="c")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load csv cache from {cache_dir}: {e}")
+            cache_valid = False
+            columns = {}
+
+    missing_names = [name for name in names if name not in columns]
+    if not missing_names:
+        return columns
+    columns.update(
+        zip(
+            missing_names,
+            _parse_csv_columns(
+                file_path, header, missing_names, delimeter, encoding, dtype
+            ),
+        )
+    )
+
+    if use_cache:
+        # write to temporary files then rename, so that concurrent readers never
+        # see a partially written file
+        tmp_suffix = f".{os.getpid()}.tmp"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            if not cache_valid:
+                if os.path.exists(meta_path):
+                    os.remove(meta_path)
+                for file_name in os.listdir(cache_dir):
+                    if file_name.endswith(".npy"):
+                        os.remove(os.path.join(cache_dir, file_name))
+            for name in missing_names:
+                col_path = os.path.join(cache_dir, f"{col_index[name]}.npy")
+                with open(f"{col_path}{tmp_suffix}", "wb") as f:
+                    np.save(f, columns[name])
+                os.replace(f"{col_path}{tmp_suffix}", col_path)
+            if not cache_valid:
+                with open(f"{meta_path}{tmp_suffix}", "w") as f:
+                    json.dump(meta, f)
+                os.replace(f"{meta_path}{tmp_suffix}", meta_path)
+        except OSError as e:
+            logger.warning(f"Failed to save csv cache to {cache_dir}: {e}")
+
+    return columns
+
+
 def load_csv_file(
     file_path: str,
     keys: Tuple[str, ...],
     alias_dict: Optional[Dict[str, str]] = None,
     delimeter: str = ",",
     encoding: str = "utf-8",
+    use_cache: bool = True,
 ) -> Dict[str, np.ndarray]:
     """Load *.csv file and fetch data as given keys.
 
+    Only required columns are parsed. Parsed columns are cached as .npy files in a
+    hidden directory ".{file_name}.cache" beside csv file and memory-mapped on
+    subsequent loads, the cache is validated by modification time and size of csv
+    file.
+
     Args:
         file_path (str): CSV file path.
         keys (Tuple[str, ...]): Required fetching keys.
         alias_dict (Optional[Dict[str, str]]): Alias for keys,
             i.e. {inner_key: outer_key}. Defaults to None.
+        delimeter (str, optional): Delimiter of csv file. Defaults to ",".
         encoding (str, optional): Encoding code when open file. Defaults to "utf-8".
+        use_cache (bool, optional): Whether load and save parsed columns through
+            sidecar cache. Defaults to True.
 
     Returns:
         Dict[str, np.ndarray]: Loaded data in dict.
@@ -60,26 +224,35 @@ def load_csv_file(
         alias_dict = {}
 
     try:
-        # read all data from csv file
-        with open(file_path, "r", encoding=encoding) as csv_file:
-            reader = csv.DictReader(csv_file, delimiter=delimeter)
-            raw_data = collections.defaultdict(list)
-            for _, line_dict in enumerate(reader):
-                for key, value in line_dict.items():
-                    raw_data[key].append(value)
+        header = _read_csv_header(file_path, delimeter, encoding)
     except FileNotFoundError:
         logger.error(f"{file_path} isn't a valid csv file.")
         sys.exit()
 
+    fetch_keys = [alias_dict[key] if key in alias_dict else key for key in keys]
+    for fetch_key in fetch_keys:
+        if fetch_key not in header:
+            raise KeyError(f"fetch_key({fetch_key}) do not exist in raw_data.")
+
+    columns = _load_csv_columns(
+        file_path,
+        header,
+        list(dict.fromkeys(fetch_keys)),
+        delimeter,
+        encoding,
+        paddle.get_default_dtype(),
+        use_cache,
+    )
+
     # convert to numpy array
     data_dict = {}
-    for key in keys:
-        fetch_key = alias_dict[key] if key in alias_dict else key
-        if fetch_key not in raw_data:
-            raise KeyError(f"fetch_key({fetch_key}) do not exist in raw_data.")
-        data_dict[key] = np.asarray(
-            raw_data[fetch_key], paddle.get_default_dtype()
-        ).reshape([-1, 1])
+    fetched_keys = set()
+    for key, fetch_key in zip(keys, fetch_keys):
+        data_dict[key] = np.asarray(columns[fetch_key]).reshape([-1, 1])
+        # keep arrays of the same column independent
+        if fetch_key in fetched_keys:
+            data_dict[key] = data_dict[key].copy()
+        fetched_keys.add(fetch_key)
 
     return data_dict
 
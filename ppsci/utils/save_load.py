@@ -14,7 +14,12 @@
 
 from __future__ import annotations
 
+import atexit
+import collections
 import os
+import shutil
+import tempfile
+import threading
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
@@ -33,7 +38,12 @@ if TYPE_CHECKING:
     from ppsci import equation
 
 
-__all__ = ["load_checkpoint", "save_checkpoint", "load_pretrain"]
+__all__ = [
+    "load_checkpoint",
+    "save_checkpoint",
+    "load_pretrain",
+    "AsyncCheckpointWriter",
+]
 
 
 def _load_pretrain_from_path(
@@ -131,6 +141,153 @@ def load_checkpoint(
     return metric_dict
 
 
+def _snapshot(obj: Any) -> Any:
+    """Copy tensors in nested dict/list/tuple to host memory, containers are copied
+    as well so that later in-place updates during training do not affect snapshot.
+    """
+    if isinstance(obj, paddle.Tensor):
+        # `cpu()` returns the tensor itself if it is already on host
+        obj = obj.detach()
+        return obj.clone() if obj.place.is_cpu_place() else obj.cpu()
+    if isinstance(obj, dict):
+        return obj.__class__((k, _snapshot(v)) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return obj.__class__(_snapshot(v) for v in obj)
+    return obj
+
+
+def _write_checkpoint(ckpt_path: str, states: Dict[str, Any]):
+    """Write states into a temporary directory beside checkpoint, then move each file
+    to "{ckpt_path}{suffix}" by atomic rename, so that an interrupted writing never
+    leaves a truncated checkpoint file.
+
+    Args:
+        ckpt_path (str): Path prefix of checkpoint.
+        states (Dict[str, Any]): Objects to be saved, keyed by file suffix, such as
+            {".pdparams": model.state_dict()}.
+    """
+    ckpt_dir, prefix = os.path.split(ckpt_path)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{prefix}_", dir=ckpt_dir)
+    try:
+        for suffix, obj in states.items():
+            paddle.save(obj, os.path.join(tmp_dir, f"{prefix}{suffix}"))
+        # ".pdstates" is moved at last for it records the epoch to resume from
+        for suffix in sorted(states, key=lambda suffix: suffix == ".pdstates"):
+            os.replace(
+                os.path.join(tmp_dir, f"{prefix}{suffix}"), f"{ckpt_path}{suffix}"
+            )
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class AsyncCheckpointWriter:
+    """Write checkpoints in a background thread, so that training is only blocked
+    by copying states to host memory instead of writing them to disk.
+
+    Pending checkpoints are kept in a bounded queue, a new checkpoint with the same
+    path as a pending one(e.g. "latest" of consecutive epochs) replaces it instead
+    of being queued. `submit` blocks when the queue is full. All pending checkpoints
+    are written before the interpreter exits.
+
+    Args:
+        max_pending (int, optional): Maximum number of pending checkpoints.
+            Defaults to 2.
+
+    Examples:
+        >>> import ppsci
+        >>> writer = ppsci.utils.save_load.AsyncCheckpointWriter()
+        >>> ppsci.utils.save_checkpoint(
+        ...     model, optimizer, {"metric": 0.1, "epoch": 1}, output_dir="./output",
+        ...     writer=writer,
+        ... )  # doctest: +SKIP
+        >>> writer.flush()  # doctest: +SKIP
+    """
+
+    def __init__(self, max_pending: int = 2):
+        if max_pending < 1:
+            raise ValueError(f"max_pending({max_pending}) should be >= 1.")
+        self.max_pending = max_pending
+        self._pending: "collections.OrderedDict[str, Dict[str, Any]]" = (
+            collections.OrderedDict()
+        )
+        self._cond = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._error: Optional[Exception] = None
+        self._thread = threading.Thread(target=self._consume, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _raise_error(self):
+        """Raise exception raised in background thread, if any."""
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def submit(self, ckpt_path: str, states: Dict[str, Any]):
+        """Add a checkpoint to be written.
+
+        Args:
+            ckpt_path (str): Path prefix of checkpoint.
+            states (Dict[str, Any]): Objects to be saved, keyed by file suffix, which
+                should be snapshots that are not modified afterwards.
+        """
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                raise RuntimeError("AsyncCheckpointWriter has been closed.")
+            if ckpt_path in self._pending:
+                # coalesce with the pending one, which is not started yet
+                self._pending[ckpt_path] = states
+                return
+            while len(self._pending) >= self.max_pending:
+                self._cond.wait()
+            self._pending[ckpt_path] = states
+            self._cond.notify_all()
+
+    def _consume(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                ckpt_path, states = self._pending.popitem(last=False)
+                self._writing = True
+                self._cond.notify_all()
+            try:
+                _write_checkpoint(ckpt_path, states)
+                logger.message(f"Finish saving checkpoint to {ckpt_path}")
+            except Exception as e:
+                # pass exception to the training thread
+                with self._cond:
+                    self._error = e
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def flush(self):
+        """Block until all pending checkpoints are written."""
+        with self._cond:
+            while self._pending or self._writing:
+                self._cond.wait()
+            self._raise_error()
+
+    def close(self):
+        """Write all pending checkpoints and stop background thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        atexit.unregister(self.close)
+        if self._error is not None:
+            logger.error(f"Failed to save checkpoint: {self._error}")
+            self._raise_error()
+
+
 def save_checkpoint(
     model: nn.Layer,
     optimizer: optimizer.Optimizer,
@@ -139,6 +296,7 @@ def save_checkpoint(
     output_dir: Optional[str] = None,
     prefix: str = "model",
     equation: Optional[Dict[str, equation.PDE]] = None,
+    writer: Optional[AsyncCheckpointWriter] = None,
 ):
     """Save checkpoint, including model params, optimizer params, metric information.
 
@@ -150,6 +308,9 @@ def save_checkpoint(
         output_dir (Optional[str]): Directory for checkpoint storage.
         prefix (str, optional): Prefix for storage. Defaults to "model".
         equation (Optional[Dict[str, equation.PDE]]): Equations. Defaults to None.
+        writer (Optional[AsyncCheckpointWriter]): Writer for saving checkpoint in
+            background, states are copied to host memory before returning. Defaults
+            to None, which means saving synchronously.
     """
     if paddle.distributed.get_rank() != 0:
         return
@@ -162,15 +323,19 @@ def save_checkpoint(
     ckpt_path = os.path.join(ckpt_dir, prefix)
     os.makedirs(ckpt_dir, exist_ok=True)
 
-    paddle.save(model.state_dict(), f"{ckpt_path}.pdparams")
-    paddle.save(optimizer.state_dict(), f"{ckpt_path}.pdopt")
-    paddle.save(metric, f"{ckpt_path}.pdstates")
+    states = {
+        ".pdparams": model.state_dict(),
+        ".pdopt": optimizer.state_dict(),
+        ".pdstates": metric,
+    }
     if grad_scaler is not None:
-        paddle.save(grad_scaler.state_dict(), f"{ckpt_path}.pdscaler")
+        states[".pdscaler"] = grad_scaler.state_dict()
     if equation is not None:
-        paddle.save(
-            {key: eq.state_dict() for key, eq in equation.items()},
-            f"{ckpt_path}.pdeqn",
-        )
+        states[".pdeqn"] = {key: eq.state_dict() for key, eq in equation.items()}
+
+    if writer is not None:
+        writer.submit(ckpt_path, _snapshot(states))
+        return
 
+    _write_checkpoint(ckpt_path, states)
     logger.message(f"Finish saving checkpoint to {ckpt_path}")
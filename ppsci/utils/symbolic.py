@@ -19,7 +19,11 @@ Sympy to python function conversion module
 from __future__ import annotations
 
 import functools
+import hashlib
 import os
+import os.path as osp
+from types import CodeType
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -30,12 +34,15 @@ from typing import Union
 import paddle
 import sympy as sp
 from paddle import nn
+from typing_extensions import Literal
 from typing_extensions import TypeAlias
 
 from ppsci import arch
 from ppsci import equation
+from ppsci.autodiff import current_derivative_cache
 from ppsci.autodiff import hessian
 from ppsci.autodiff import jacobian
+from ppsci.autodiff import laplacian
 
 __all__ = [
     "lambdify",
@@ -44,6 +51,11 @@ __all__ = [
 
 DATA_DICT: TypeAlias = Dict[str, paddle.Tensor]
 
+# directory of source files generated by "codegen" backend of lambdify
+CODEGEN_HOME = osp.expanduser("~/.paddlesci/lambdify")
+# compiled code of generated source files, keyed by hash of source
+_GENERATED_CODE: Dict[str, Tuple[str, CodeType]] = {}
+
 SYMPY_BUILTIN_FUNC: TypeAlias = Union[
     sp.sin,
     sp.sinh,
@@ -105,6 +117,14 @@ SYMPT_TO_PADDLE = {
 }
 
 
+def _is_laplacian(expr: sp.Function) -> bool:
+    """Whether given function is a laplacian created by `PDE.create_laplacian`."""
+    return getattr(expr, "name", None) in (
+        equation.LAPLACIAN_FUNC_NAME,
+        equation.HUTCHINSON_LAPLACIAN_FUNC_NAME,
+    )
+
+
 def _cvt_to_key(expr: sp.Basic) -> str:
     """Convert sympy expression to a string key, mainly as retrieval key in dict.
 
@@ -114,6 +134,9 @@ def _cvt_to_key(expr: sp.Basic) -> str:
     Returns:
         str: Converted string key.
     """
+    if isinstance(expr, sp.Function) and _is_laplacian(expr):
+        # laplacian of different functions should not share the same name
+        return str(expr)
     if isinstance(expr, (sp.Symbol, sp.core.function.UndefinedFunction, sp.Function)):
         if hasattr(expr, "name"):
             # use name of custom function instead of itself.
@@ -130,6 +153,47 @@ def _cvt_to_key(expr: sp.Basic) -> str:
         return str(expr)
 
 
+def _compute_derivative(
+    derivate_func: Callable,
+    ys: paddle.Tensor,
+    xs: paddle.Tensor,
+    ys_key: str,
+    xs_key: str,
+    order: int,
+) -> paddle.Tensor:
+    """Compute derivative of `ys` to `xs` by `derivate_func`, through active
+    derivative cache keyed by (ys_key, xs_key, order) if any.
+    """
+    derivative_cache = current_derivative_cache()
+    if derivative_cache is None:
+        return derivate_func(ys, xs)
+    return derivative_cache.lookup(
+        (ys_key, xs_key, order), lambda: derivate_func(ys, xs)
+    )
+
+
+def _prefetch_grad_group(
+    ys: paddle.Tensor, data_dict: DATA_DICT, grad_group: Tuple[str, ...]
+):
+    """Compute first order derivatives of `ys` to all of its differentiable inputs
+    in `grad_group` together, for they cost only one reverse sweep.
+    """
+    xs = [
+        data_dict[key]
+        for key in grad_group
+        if key in data_dict and not data_dict[key].stop_gradient
+    ]
+    if len(xs) > 1:
+        jacobian.prefetch(ys, xs)
+
+
+def _record_derivative_reuse():
+    """Record reuse of a computed derivative as a hit of active derivative cache."""
+    derivative_cache = current_derivative_cache()
+    if derivative_cache is not None:
+        derivative_cache.hits += 1
+
+
 class Node(nn.Layer):
     """The base class of the node in expression tree.
 
@@ -176,6 +240,41 @@ class DetachNode(nn.Layer):
         return data_dict
 
 
+class LaplacianNode(Node):
+    """Class for laplacian operation in converted expression tree.
+
+    Args:
+        expr (sp.Function): Laplacian expression created by `PDE.create_laplacian`,
+            such as laplacian(u(x, y), x, y).
+    """
+
+    def __init__(self, expr: sp.Function):
+        super().__init__(expr)
+        self.child = _cvt_to_key(self.expr.args[0])
+        invars = self.expr.args[1:]
+        self.num_probes = 1
+        if self.expr.name == equation.HUTCHINSON_LAPLACIAN_FUNC_NAME:
+            self.method = "hutchinson"
+            self.num_probes = int(invars[-1])
+            invars = invars[:-1]
+        else:
+            self.method = "exact"
+        self.invars = tuple(_cvt_to_key(arg) for arg in invars)
+
+    def forward(self, data_dict: DATA_DICT) -> DATA_DICT:
+        # use cache
+        if self.key in data_dict:
+            return data_dict
+
+        data_dict[self.key] = laplacian(
+            data_dict[self.child],
+            [data_dict[key] for key in self.invars],
+            method=self.method,
+            num_probes=self.num_probes,
+        )
+        return data_dict
+
+
 class OperatorNode(Node):
     """Class for operator node in converted expression tree.
 
@@ -191,6 +290,9 @@ class OperatorNode(Node):
             self.childs = [_cvt_to_key(self.expr.args[0])] + [
                 (_cvt_to_key(arg), order) for (arg, order) in self.expr.args[1:]
             ]
+            # first order derivatives of a function computed together by one
+            # reverse sweep, set by `_assign_grad_groups` when lambdifying
+            self.grad_group = ()
         else:
             self.childs = [_cvt_to_key(arg) for arg in self.expr.args]
 
@@ -214,10 +316,18 @@ class OperatorNode(Node):
     def forward(self, data_dict: DATA_DICT):
         # use cache
         if self.key in data_dict:
+            self.record_reuse()
             return data_dict
 
         return self._apply_func(data_dict)
 
+    def record_reuse(self):
+        """Record reuse of computed result as a hit of active derivative cache, if
+        this is a derivative node.
+        """
+        if self.expr.func == sp.Derivative:
+            _record_derivative_reuse()
+
     def _add_operator_func(self, data_dict: DATA_DICT) -> DATA_DICT:
         data_dict[self.key] = data_dict[self.childs[0]]
         for p in self.childs[1:]:
@@ -232,15 +342,45 @@ class OperatorNode(Node):
 
     def _derivate_operator_func(self, data_dict: DATA_DICT) -> DATA_DICT:
         data_dict[self.key] = data_dict[self.childs[0]]
+        _prefetch_grad_group(data_dict[self.key], data_dict, self.grad_group)
+        # key of intermediate derivative, such as "u__x" for Derivative(u, x, y)
+        ys_key = self.childs[0]
         for child, order in self.childs[1:]:
             if order & 1:
-                data_dict[self.key] = jacobian(data_dict[self.key], data_dict[child])
+                data_dict[self.key] = self._derivate(
+                    jacobian, data_dict, ys_key, child, 1
+                )
+                ys_key += f"__{child}"
                 order -= 1
             for _ in range(0, order, 2):
-                data_dict[self.key] = hessian(data_dict[self.key], data_dict[child])
+                data_dict[self.key] = self._derivate(
+                    hessian, data_dict, ys_key, child, 2
+                )
+                ys_key += f"__{child}" * 2
                 order -= 2
         return data_dict
 
+    def _derivate(
+        self,
+        derivate_func: Callable,
+        data_dict: DATA_DICT,
+        ys_key: str,
+        xs_key: str,
+        order: int,
+    ) -> paddle.Tensor:
+        """Compute derivative of current result to `data_dict[xs_key]` by
+        `derivate_func`, through active derivative cache keyed by (ys_key, xs_key,
+        order) if any.
+        """
+        return _compute_derivative(
+            derivate_func,
+            data_dict[self.key],
+            data_dict[xs_key],
+            ys_key,
+            xs_key,
+            order,
+        )
+
     def _heaviside_operator_func(self, data_dict: DATA_DICT) -> DATA_DICT:
         data_dict[self.key] = self._auxiliary_func(data_dict[self.childs[0]])
         return data_dict
@@ -251,8 +391,7 @@ class OperatorNode(Node):
         )
         for i in range(2, len(self.childs)):
             data_dict[self.key] = paddle.minimum(
-                data_dict[data_dict[self.key]],
-                data_dict[data_dict[self.childs[i]]],
+                data_dict[self.key], data_dict[self.childs[i]]
             )
         return data_dict
 
@@ -262,8 +401,7 @@ class OperatorNode(Node):
         )
         for i in range(2, len(self.childs)):
             data_dict[self.key] = paddle.maximum(
-                data_dict[data_dict[self.key]],
-                data_dict[data_dict[self.childs[i]]],
+                data_dict[self.key], data_dict[self.childs[i]]
             )
         return data_dict
 
@@ -353,21 +491,267 @@ class ParameterNode(Node):
 class ComposedNode(nn.Layer):
     """
     Compose list of several callable objects together.
+
+    Args:
+        callable_nodes (List[Node]): Callable nodes in topo-order.
+        output_key (Optional[str]): Key of result to be returned, key of the last node
+            will be used if None. Defaults to None.
     """
 
-    def __init__(self, callable_nodes: List[Node]):
+    def __init__(self, callable_nodes: List[Node], output_key: Optional[str] = None):
         super().__init__()
         self.callable_nodes = callable_nodes
+        self.output_key = output_key
 
     def forward(self, data_dict: DATA_DICT) -> DATA_DICT:
-        # call all callable_nodes in order
+        # call all callable_nodes in order, skip nodes computed before, such as
+        # nodes shared with other expressions
         for func in self.callable_nodes:
-            data_dict = func(data_dict)
+            if func.key not in data_dict:
+                data_dict = func(data_dict)
+            elif isinstance(func, OperatorNode):
+                func.record_reuse()
 
         # return result of last node(root node) for target
+        if self.output_key is not None:
+            return data_dict[self.output_key]
         return data_dict[self.callable_nodes[-1].key]
 
 
+class GeneratedNode(ComposedNode):
+    """
+    Compose list of several callable nodes into one generated python function, which
+    computes nodes in topo-order with local variables and direct paddle calls instead
+    of calling each node with dict lookups.
+
+    Source of the generated function is written to `CODEGEN_HOME` and named by its
+    hash, so it can be inspected, debugged and converted by `jit.to_static` like
+    hand-written code. Compiled code is cached by the hash and shared by all
+    expressions with the same structure.
+
+    Args:
+        callable_nodes (List[Node]): Callable nodes in topo-order.
+        output_key (Optional[str]): Key of result to be returned, key of the last node
+            will be used if None. Defaults to None.
+        shared_keys (Sequence[str]): Keys of nodes shared with other functions, whose
+            results are stored to and reused from data dict. Defaults to ().
+    """
+
+    def __init__(
+        self,
+        callable_nodes: List[Node],
+        output_key: Optional[str] = None,
+        shared_keys: Sequence[str] = (),
+    ):
+        super().__init__(callable_nodes, output_key)
+        if output_key is None:
+            output_key = callable_nodes[-1].key
+        source, bindings = _generate_source(callable_nodes, output_key, shared_keys)
+        self.source_path, code = _compile_source(source)
+        namespace = {"__name__": "ppsci_lambdify", "__file__": self.source_path}
+        namespace.update(bindings)
+        exec(code, namespace)
+        self._forward_func = namespace["forward"]
+
+    def forward(self, data_dict: DATA_DICT) -> paddle.Tensor:
+        return self._forward_func(data_dict)
+
+
+def _generate_source(
+    callable_nodes: List[Node], output_key: str, shared_keys: Sequence[str] = ()
+) -> Tuple[str, Dict[str, object]]:
+    """Generate source of a python module for callable nodes, which defines function
+    `forward(data_dict)` computing them in topo-order.
+
+    Results of model, derivative, detach and laplacian nodes, as well as nodes in
+    `shared_keys` and the output node, are stored to data dict and reused if already
+    in it, just like `ComposedNode`. Other nodes are kept in local variables only.
+
+    Args:
+        callable_nodes (List[Node]): Callable nodes in topo-order.
+        output_key (str): Key of result to be returned.
+        shared_keys (Sequence[str]): Keys of nodes shared with other functions.
+            Defaults to ().
+
+    Returns:
+        Tuple[str, Dict[str, object]]: Source of module and objects to be bound to
+            global names in it, such as models, parameters and constants.
+    """
+    bindings: Dict[str, object] = {}
+    bound_names: Dict[int, str] = {}
+
+    def bind(obj: object, prefix: str) -> str:
+        if id(obj) not in bound_names:
+            bound_names[id(obj)] = f"{prefix}_{len(bindings)}"
+            bindings[bound_names[id(obj)]] = obj
+        return bound_names[id(obj)]
+
+    body: List[str] = []
+    var_names: Dict[str, str] = {}
+
+    def ref(key: str, inline: bool = False) -> str:
+        """Reference result of `key`, inputs are loaded from data dict at first use
+        unless `inline` is True.
+        """
+        if key in var_names:
+            return var_names[key]
+        if inline:
+            return f"data_dict[{key!r}]"
+        var_names[key] = f"in_{len(var_names)}"
+        body.append(f"{var_names[key]} = data_dict[{key!r}]")
+        return var_names[key]
+
+    def paddle_func(func: Callable) -> str:
+        # call public paddle api directly, or bind it if not found, such as partial
+        for name, obj in vars(paddle).items():
+            if obj is func and not name.startswith("_"):
+                return f"paddle.{name}"
+        return bind(func, "func")
+
+    for i, node in enumerate(callable_nodes):
+        var = f"v_{i}"
+        if isinstance(node, ParameterNode):
+            var_names[node.key] = bind(node.parameter, "param")
+            continue
+        if isinstance(node, ConstantNode):
+            var_names[node.key] = bind(node.expr, "const")
+            continue
+
+        body.append(f"# {node.expr}")
+        if isinstance(node, LayerNode):
+            model = bind(node.model, "model")
+            body.append(f"if {node.key!r} not in data_dict:")
+            body.append(f"    data_dict.update({model}(data_dict))")
+            body.append(f"{var} = data_dict[{node.key!r}]")
+            var_names[node.key] = var
+            continue
+
+        stored = (
+            node.key == output_key
+            or node.key in shared_keys
+            or isinstance(node, (DetachNode, LaplacianNode))
+            or node.expr.func == sp.Derivative
+        )
+        lines: List[str] = []
+        if isinstance(node, DetachNode):
+            lines.append(f"{var} = {ref(node.child)}.detach()")
+        elif isinstance(node, LaplacianNode):
+            invars = ", ".join(ref(key, True) for key in node.invars)
+            lines.append(
+                f"{var} = laplacian({ref(node.child)}, [{invars}], "
+                f"method={node.method!r}, num_probes={node.num_probes})"
+            )
+        elif node.expr.func == sp.Derivative:
+            ys_key = node.childs[0]
+            ys = ref(ys_key)
+            if len(node.grad_group) > 1:
+                lines.append(
+                    f"_prefetch_grad_group({ys}, data_dict, {node.grad_group!r})"
+                )
+            for child, order in node.childs[1:]:
+                xs = ref(child, True)
+                if order & 1:
+                    lines.append(
+                        f"{var} = _compute_derivative(jacobian, {ys}, {xs}, "
+                        f"{ys_key!r}, {child!r}, 1)"
+                    )
+                    ys, ys_key = var, ys_key + f"__{child}"
+                    order -= 1
+                for _ in range(0, order, 2):
+                    lines.append(
+                        f"{var} = _compute_derivative(hessian, {ys}, {xs}, "
+                        f"{ys_key!r}, {child!r}, 2)"
+                    )
+                    ys, ys_key = var, ys_key + f"__{child}" * 2
+        else:
+            childs = [ref(child) for child in node.childs]
+            if node.expr.func == sp.Add:
+                lines.append(f"{var} = {' + '.join(childs)}")
+            elif node.expr.func == sp.Mul:
+                lines.append(f"{var} = {' * '.join(childs)}")
+            elif node.expr.func in (sp.Min, sp.Max):
+                func = (
+                    "paddle.minimum" if node.expr.func == sp.Min else "paddle.maximum"
+                )
+                result = childs[0]
+                for child in childs[1:]:
+                    result = f"{func}({result}, {child})"
+                lines.append(f"{var} = {result}")
+            elif node.expr.func == sp.Heaviside:
+                func = paddle_func(SYMPT_TO_PADDLE[sp.Heaviside])
+                lines.append(f"{var} = {func}({childs[0]})")
+            else:
+                func = paddle_func(SYMPT_TO_PADDLE[node.expr.func])
+                lines.append(f"{var} = {func}({', '.join(childs)})")
+
+        if stored:
+            body.append(f"if {node.key!r} in data_dict:")
+            if node.expr.func == sp.Derivative:
+                body.append("    _record_derivative_reuse()")
+            body.append(f"    {var} = data_dict[{node.key!r}]")
+            body.append("else:")
+            body.extend(f"    {line}" for line in lines)
+            body.append(f"    data_dict[{node.key!r}] = {var}")
+        else:
+            body.extend(lines)
+        var_names[node.key] = var
+
+    body.append(f"return {ref(output_key)}")
+
+    header = [
+        "# Generated by ppsci.lambdify, do not edit.",
+        f"# Output: {output_key}",
+    ]
+    if bindings:
+        header.append("# Bound objects:")
+        header.extend(
+            f"#     {name}: {obj.__class__.__name__}" for name, obj in bindings.items()
+        )
+    source = "\n".join(
+        header
+        + [
+            "import paddle",
+            "",
+            "from ppsci.autodiff import hessian",
+            "from ppsci.autodiff import jacobian",
+            "from ppsci.autodiff import laplacian",
+            "from ppsci.utils.symbolic import _compute_derivative",
+            "from ppsci.utils.symbolic import _prefetch_grad_group",
+            "from ppsci.utils.symbolic import _record_derivative_reuse",
+            "",
+            "",
+            "def forward(data_dict):",
+        ]
+        + [f"    {line}" for line in body]
+    )
+    return source + "\n", bindings
+
+
+def _compile_source(source: str) -> Tuple[str, CodeType]:
+    """Write source to `CODEGEN_HOME` and compile it, with compiled code cached by
+    hash of source.
+
+    Args:
+        source (str): Source of generated module.
+
+    Returns:
+        Tuple[str, CodeType]: Path of source file and compiled code.
+    """
+    digest = hashlib.md5(source.encode()).hexdigest()[:16]
+    if digest not in _GENERATED_CODE:
+        source_path = osp.join(CODEGEN_HOME, f"lambdify_{digest}.py")
+        if not osp.isfile(source_path):
+            os.makedirs(CODEGEN_HOME, exist_ok=True)
+            # write to a temporary file at first for processes may generate the same
+            # file at the same time
+            tmp_path = f"{source_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                f.write(source)
+            os.replace(tmp_path, source_path)
+        _GENERATED_CODE[digest] = (source_path, compile(source, source_path, "exec"))
+    return _GENERATED_CODE[digest]
+
+
 def _post_traverse(cur_node: sp.Basic, nodes: List[sp.Basic]) -> List[sp.Basic]:
     """Traverse sympy expression tree in postorder.
 
@@ -493,16 +877,74 @@ def _visualize_graph(nodes: List[sp.Basic], graph_filename: str):
     )
 
 
+def _cvt_to_callable(
+    node: sp.Basic,
+    models: Tuple[arch.Arch, ...],
+    extra_parameters: Sequence[paddle.Tensor],
+) -> nn.Layer:
+    """Convert sympy node to callable node.
+
+    Args:
+        node (sp.Basic): Sympy node.
+        models (Tuple[arch.Arch, ...]): Model(s) for computing forward result in
+            `LayerNode`.
+        extra_parameters (Sequence[paddle.Tensor]): Extra learnable parameters.
+
+    Returns:
+        nn.Layer: Callable node.
+    """
+    if isinstance(
+        node, tuple(SYMPT_TO_PADDLE.keys()) + (sp.Add, sp.Mul, sp.Derivative)
+    ):
+        return OperatorNode(node)
+    elif isinstance(node, sp.Function):
+        if node.name == equation.DETACH_FUNC_NAME:
+            return DetachNode(node)
+        elif _is_laplacian(node):
+            return LaplacianNode(node)
+        else:
+            match_index = None
+            for j, model in enumerate(models):
+                if str(node.func.name) in model.output_keys:
+                    if match_index is not None:
+                        raise ValueError(
+                            f"Name of function({node}) should be unique along given"
+                            f" models, but got same output_key({node.func.name}) "
+                            f"in models[{match_index}] and models[{j}]."
+                        )
+                    match_index = j
+            if match_index is None:
+                raise ValueError(
+                    f"Node {node} can not match any model in given model(s)."
+                )
+            return LayerNode(node, models[match_index])
+    elif node.is_Number or node.is_NumberSymbol:
+        return ConstantNode(node)
+    elif isinstance(node, sp.Symbol):
+        return ParameterNode(
+            node,
+            *[param for param in extra_parameters if param.name == node.name],
+        )
+    else:
+        raise NotImplementedError(f"The node {node} is not supported in lambdify.")
+
+
 def lambdify(
-    expr: sp.Expr,
+    expr: Union[sp.Expr, Sequence[sp.Expr]],
     models: Optional[Union[arch.Arch, Tuple[arch.Arch, ...]]] = None,
     extra_parameters: Optional[Sequence[paddle.Tensor]] = None,
     graph_filename: Optional[str] = None,
-) -> ComposedNode:
+    backend: Literal["node", "codegen"] = "node",
+) -> Union[ComposedNode, List[ComposedNode]]:
     """Convert sympy expression to callable function.
 
+    If a sequence of expressions is given, common subexpressions among them are
+    eliminated by `sympy.cse` and a list of callable functions is returned, which share
+    nodes of one graph. Each shared node is computed only once when these functions
+    are called with the same data dict in turn, such as equations of a constraint.
+
     Args:
-        expr (sp.Expr): Sympy expression to be converted.
+        expr (Union[sp.Expr, Sequence[sp.Expr]]): Sympy expression(s) to be converted.
         models (Optional[Union[arch.Arch, Tuple[arch.Arch, ...]]]): Model(s) for
             computing forward result in `LayerNode`.
         extra_parameters (Optional[nn.ParameterList]): Extra learnable parameters.
@@ -510,10 +952,13 @@ def lambdify(
         graph_filename (Optional[str]): Save computational graph to `graph_filename.png`
             for given `expr`, if `graph_filename` is not None and a valid string,
             such as 'momentum_x'. Defaults to None.
+        backend (Literal["node", "codegen"], optional): "node" calls converted nodes
+            one by one, "codegen" generates a flat python function from them with
+            less overhead of dispatching, see `GeneratedNode`. Defaults to "node".
 
     Returns:
-        ComposedNode: Callable object for computing expr with necessary input(s) data
-            in dict given.
+        Union[ComposedNode, List[ComposedNode]]: Callable object(s) for computing
+            expr with necessary input(s) data in dict given.
 
     Examples:
         >>> import paddle
@@ -553,7 +998,29 @@ def lambdify(
 
         >>> paddle.allclose(z_tensor_manually, z_tensor_sympy).item()
         True
+
+        >>> funcs = ppsci.lambdify([u * v + a, (u * v + a) * b], model)
+        >>> data_dict = {
+        ...     "a": a_tensor,
+        ...     "b": b_tensor,
+        ...     "x": x_tensor,
+        ...     "y": y_tensor,
+        ... }
+        >>> z1_tensor, z2_tensor = [func(data_dict) for func in funcs]
+        >>> paddle.allclose(z1_tensor * b_tensor, z2_tensor).item()
+        True
     """
+    if backend not in ("node", "codegen"):
+        raise ValueError(f"backend should be 'node' or 'codegen', but got {backend}")
+    if not extra_parameters:
+        extra_parameters = ()
+    if isinstance(models, arch.ModelList):
+        models = tuple(models.model_list[i] for i in range(len(models.model_list)))
+    if not isinstance(models, (tuple, list)):
+        models = (models,)
+
+    if not isinstance(expr, sp.Basic):
+        return _lambdify_cse(expr, models, extra_parameters, graph_filename, backend)
 
     # NOTE: Those simplify methods may complicate given expr instead, so not use here
     # simplify expression to reduce nodes in tree
@@ -569,8 +1036,6 @@ def lambdify(
     sympy_nodes = _post_traverse(expr, sympy_nodes)
 
     # remove unnecessary symbol nodes already in input dict(except for paramter symbol)
-    if not extra_parameters:
-        extra_parameters = ()
     _parameter_names = tuple(param.name for param in extra_parameters)
     sympy_nodes = [
         node
@@ -581,57 +1046,190 @@ def lambdify(
     # remove duplicates with topo-order kept
     sympy_nodes = list(dict.fromkeys(sympy_nodes))
 
-    if isinstance(models, arch.ModelList):
-        models = tuple(models.model_list[i] for i in range(len(models.model_list)))
-    if not isinstance(models, (tuple, list)):
-        models = (models,)
-
     # convert sympy node to callable node
-    callable_nodes = []
-    for i, node in enumerate(sympy_nodes):
-        if isinstance(
-            node, tuple(SYMPT_TO_PADDLE.keys()) + (sp.Add, sp.Mul, sp.Derivative)
-        ):
-            callable_nodes.append(OperatorNode(node))
-        elif isinstance(node, sp.Function):
-            if node.name == equation.DETACH_FUNC_NAME:
-                callable_nodes.append(DetachNode(node))
-            else:
-                match_index = None
-                for j, model in enumerate(models):
-                    if str(node.func.name) in model.output_keys:
-                        callable_nodes.append(
-                            LayerNode(
-                                node,
-                                model,
-                            )
-                        )
-                        if match_index is not None:
-                            raise ValueError(
-                                f"Name of function({node}) should be unique along given"
-                                f" models, but got same output_key({node.func.name}) "
-                                f"in models[{match_index}] and models[{j}]."
-                            )
-                        match_index = j
-                if match_index is None:
-                    raise ValueError(
-                        f"Node {node} can not match any model in given model(s)."
-                    )
-        elif node.is_Number or node.is_NumberSymbol:
-            callable_nodes.append(ConstantNode(node))
-        elif isinstance(node, sp.Symbol):
-            callable_nodes.append(
-                ParameterNode(
-                    node,
-                    *[param for param in extra_parameters if param.name == node.name],
-                )
-            )
-        else:
-            raise NotImplementedError(f"The node {node} is not supported in lambdify.")
+    callable_nodes = [
+        _cvt_to_callable(node, models, extra_parameters) for node in sympy_nodes
+    ]
+    _assign_grad_groups(sympy_nodes, callable_nodes, models)
 
     # NOTE: Visualize computational graph using 'pygraphviz'
     if isinstance(graph_filename, str):
         _visualize_graph(sympy_nodes, graph_filename)
 
     # Compose callable nodes into one callable object
+    if backend == "codegen":
+        return GeneratedNode(callable_nodes)
     return ComposedNode(callable_nodes)
+
+
+def _assign_grad_groups(
+    sympy_nodes: Sequence[sp.Basic],
+    callable_nodes: Sequence[nn.Layer],
+    models: Tuple[arch.Arch, ...],
+):
+    """Set `grad_group` of each derivative node to the variables which derivatives of
+    the same function are taken to first among given nodes, so that these first order
+    derivatives are computed by one reverse sweep. Outputs of models are excluded, for
+    they are not independent variables even if they are arguments of the function.
+
+    Args:
+        sympy_nodes (Sequence[sp.Basic]): Sympy nodes of all expressions.
+        callable_nodes (Sequence[nn.Layer]): Callable node of each sympy node.
+        models (Tuple[arch.Arch, ...]): Model(s) for computing forward result in
+            `LayerNode`.
+    """
+    output_keys = {key for model in models for key in model.output_keys}
+    grad_groups: Dict[sp.Basic, List[str]] = {}
+    for node in sympy_nodes:
+        if isinstance(node, sp.Derivative) and isinstance(
+            node.args[0].func, sp.core.function.UndefinedFunction
+        ):
+            xs_key = _cvt_to_key(node.args[1][0])
+            if xs_key not in output_keys:
+                grad_groups.setdefault(node.args[0], []).append(xs_key)
+    for node, callable_node in zip(sympy_nodes, callable_nodes):
+        if isinstance(node, sp.Derivative) and node.args[0] in grad_groups:
+            callable_node.grad_group = tuple(dict.fromkeys(grad_groups[node.args[0]]))
+
+
+def _cse_symbol(expr: sp.Basic) -> sp.Symbol:
+    """Create symbol for common subexpression named by hash of it, so that the same
+    key always refers to the same subexpression, even across different calls of
+    lambdify.
+    """
+    return sp.Symbol(f"cse_{hashlib.md5(sp.srepr(expr).encode()).hexdigest()[:16]}")
+
+
+def _num_nodes(exprs: Sequence[sp.Basic]) -> int:
+    """Number of distinct non-symbol nodes in given expressions."""
+    nodes = set()
+    for expr in exprs:
+        nodes.update(node for node in _post_traverse(expr, []) if not node.is_Symbol)
+    return len(nodes)
+
+
+def _lambdify_cse(
+    exprs: Sequence[sp.Expr],
+    models: Tuple[arch.Arch, ...],
+    extra_parameters: Sequence[paddle.Tensor],
+    graph_filename: Optional[str] = None,
+    backend: Literal["node", "codegen"] = "node",
+) -> List[ComposedNode]:
+    """Convert sympy expressions to callable functions sharing one graph, with common
+    subexpressions eliminated.
+
+    Args:
+        exprs (Sequence[sp.Expr]): Sympy expressions to be converted.
+        models (Tuple[arch.Arch, ...]): Model(s) for computing forward result in
+            `LayerNode`.
+        extra_parameters (Sequence[paddle.Tensor]): Extra learnable parameters.
+        graph_filename (Optional[str]): Save computational graph to
+            `graph_filename.png` if given. Defaults to None.
+        backend (Literal["node", "codegen"], optional): Backend of returned callable
+            objects. Defaults to "node".
+
+    Returns:
+        List[ComposedNode]: Callable object for each expression.
+    """
+    # remove 1.0 from sympy expression tree
+    exprs = [expr.subs(1.0, 1) for expr in exprs]
+
+    # replace derivatives and functions with symbols named by their keys, so that
+    # cse only works on algebraic part of expressions and keeps them as a whole
+    atom_symbols = {}
+    for expr in exprs:
+        for atom in _post_traverse(expr, []):
+            if isinstance(atom, (sp.Derivative, sp.core.function.AppliedUndef)):
+                atom_symbols[atom] = sp.Symbol(_cvt_to_key(atom))
+    symbol_atoms = {symbol: atom for atom, symbol in atom_symbols.items()}
+
+    replacements, reduced_exprs = sp.cse(
+        [expr.xreplace(atom_symbols) for expr in exprs]
+    )
+
+    # inline common subexpressions which do not reduce number of nodes, such as
+    # partial products extracted from different products, for identical subtrees
+    # are already computed only once by their keys
+    subexprs = dict(replacements)
+    for symbol in reversed(list(subexprs)):
+        inline_map = {symbol: subexprs[symbol]}
+        inlined_subexprs = {
+            k: v.xreplace(inline_map) for k, v in subexprs.items() if k != symbol
+        }
+        inlined_exprs = [expr.xreplace(inline_map) for expr in reduced_exprs]
+        if _num_nodes(inlined_exprs + list(inlined_subexprs.values())) <= _num_nodes(
+            reduced_exprs + list(subexprs.values())
+        ):
+            subexprs, reduced_exprs = inlined_subexprs, inlined_exprs
+
+    # rename common subexpressions by their contents
+    renames = {}
+    renamed_subexprs = {}
+    for symbol, subexpr in subexprs.items():
+        subexpr = subexpr.xreplace(renames)
+        renames[symbol] = _cse_symbol(subexpr)
+        renamed_subexprs[renames[symbol]] = subexpr
+    subexprs = renamed_subexprs
+    reduced_exprs = [expr.xreplace(renames) for expr in reduced_exprs]
+
+    _parameter_names = tuple(param.name for param in extra_parameters)
+
+    def collect_nodes(expr: sp.Basic, nodes: List[sp.Basic]) -> List[sp.Basic]:
+        """Collect nodes required by expr in topo-order, including nodes of
+        common subexpressions and replaced atoms it refers to.
+        """
+        for node in _post_traverse(expr, []):
+            if not node.is_Symbol:
+                nodes.append(node)
+            elif node in subexprs:
+                collect_nodes(subexprs[node], nodes)
+            elif node in symbol_atoms:
+                collect_nodes(symbol_atoms[node], nodes)
+            elif _cvt_to_key(node) in _parameter_names:
+                nodes.append(node)
+        return nodes
+
+    # result of common subexpression is stored by name of its symbol
+    alias_keys = {subexpr: _cvt_to_key(symbol) for symbol, subexpr in subexprs.items()}
+    callable_dict = {}
+    sympy_nodes_list = []
+    all_sympy_nodes = []
+    for expr in reduced_exprs:
+        sympy_nodes = list(dict.fromkeys(collect_nodes(expr, [])))
+        for node in sympy_nodes:
+            if node not in callable_dict:
+                callable_dict[node] = _cvt_to_callable(node, models, extra_parameters)
+                if node in alias_keys:
+                    callable_dict[node].key = alias_keys[node]
+                all_sympy_nodes.append(node)
+        sympy_nodes_list.append(sympy_nodes)
+    # group derivatives of the same function across all expressions
+    _assign_grad_groups(
+        all_sympy_nodes, [callable_dict[node] for node in all_sympy_nodes], models
+    )
+
+    # nodes required by more than one expression should be stored in data dict
+    # for reusing by generated functions
+    shared_keys = set()
+    seen_nodes = set()
+    for sympy_nodes in sympy_nodes_list:
+        shared_keys.update(
+            callable_dict[node].key for node in sympy_nodes if node in seen_nodes
+        )
+        seen_nodes.update(sympy_nodes)
+
+    composed_nodes = []
+    for expr, sympy_nodes in zip(reduced_exprs, sympy_nodes_list):
+        callable_nodes = [callable_dict[node] for node in sympy_nodes]
+        if backend == "codegen":
+            composed_nodes.append(
+                GeneratedNode(callable_nodes, _cvt_to_key(expr), shared_keys)
+            )
+        else:
+            composed_nodes.append(ComposedNode(callable_nodes, _cvt_to_key(expr)))
+
+    # NOTE: Visualize computational graph using 'pygraphviz'
+    if isinstance(graph_filename, str):
+        _visualize_graph(all_sympy_nodes, graph_filename)
+
+    return composed_nodes
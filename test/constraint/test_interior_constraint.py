@@ -0,0 +1,178 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+from ppsci import arch
+from ppsci import constraint
+from ppsci import equation
+from ppsci import geometry
+from ppsci import loss
+
+NUM_POINTS = 64
+NUM_REFINE = 8
+
+
+def _build_constraint(dataset_name, rar_cfg):
+    ppsci.utils.misc.set_random_seed(42)
+    model = arch.MLP(("x", "y"), ("p",), 2, 16)
+    poisson = equation.Poisson(2)
+    pde_constraint = constraint.InteriorConstraint(
+        poisson.equations,
+        {"poisson": 0},
+        geometry.Rectangle((0, 0), (1, 1)),
+        {
+            "dataset": dataset_name,
+            "batch_size": NUM_POINTS,
+            "iters_per_epoch": 1,
+            "sampler": {"name": "BatchSampler", "shuffle": False, "drop_last": False},
+        },
+        loss.MSELoss(),
+        name="EQ",
+        rar_cfg=rar_cfg,
+    )
+    # convert sympy expressions as solver does
+    pde_constraint.output_expr = {
+        name: ppsci.lambdify(expr, model)
+        for name, expr in pde_constraint.output_expr.items()
+    }
+    return pde_constraint, model
+
+
+def _get_dataset(pde_constraint):
+    if isinstance(pde_constraint.data_loader, paddle.io.DataLoader):
+        return pde_constraint.data_loader.dataset
+    return pde_constraint.data_loader
+
+
+def _dataset_dicts(pde_constraint):
+    _dataset = _get_dataset(pde_constraint)
+    return [
+        {
+            key: (value.numpy() if paddle.is_tensor(value) else value.copy())
+            for key, value in data_dict.items()
+        }
+        for data_dict in (_dataset.input, _dataset.label, _dataset.weight)
+    ]
+
+
+def test_rar_cfg_default():
+    pde_constraint, _ = _build_constraint(
+        "NamedArrayDataset", {"num_refine": NUM_REFINE}
+    )
+    assert pde_constraint.rar_cfg == {
+        "freq": 1,
+        "num_refine": NUM_REFINE,
+        "mode": "add",
+        "batch_size": 8192,
+        "num_candidates": NUM_REFINE * 100,
+    }
+    with pytest.raises(ValueError, match="freq"):
+        _build_constraint("NamedArrayDataset", {"freq": 0})
+    with pytest.raises(ValueError, match="mode"):
+        _build_constraint("NamedArrayDataset", {"mode": "remove"})
+
+
+@pytest.mark.parametrize("mode", ("add", "replace"))
+@pytest.mark.parametrize(
+    "dataset_name", ("NamedArrayDataset", "IterableNamedArrayDataset")
+)
+def test_refine(dataset_name, mode):
+    pde_constraint, model = _build_constraint(
+        dataset_name,
+        {"num_refine": NUM_REFINE, "num_candidates": 256, "mode": mode},
+    )
+    old_input, old_label, _ = _dataset_dicts(pde_constraint)
+    old_residual = pde_constraint.compute_residual(model, old_input, old_label)
+
+    pde_constraint.refine(model)
+    new_input, new_label, new_weight = _dataset_dicts(pde_constraint)
+    num_points = NUM_POINTS + NUM_REFINE if mode == "add" else NUM_POINTS
+    assert _get_dataset(pde_constraint)._len == num_points
+    for data_dict in (new_input, new_label, new_weight):
+        for value in data_dict.values():
+            assert len(value) == num_points
+
+    old_points = np.concatenate((old_input["x"], old_input["y"]), axis=1)
+    new_points = np.concatenate((new_input["x"], new_input["y"]), axis=1)
+    if mode == "add":
+        np.testing.assert_array_equal(new_points[:NUM_POINTS], old_points)
+        refined_points = new_points[NUM_POINTS:]
+    else:
+        # points with smallest residual are replaced, others are kept in place
+        replace_index = np.argsort(old_residual.flatten())[:NUM_REFINE]
+        keep_mask = np.ones(NUM_POINTS, dtype=bool)
+        keep_mask[replace_index] = False
+        np.testing.assert_array_equal(new_points[keep_mask], old_points[keep_mask])
+        refined_points = new_points[replace_index]
+
+    # refined points are new points with large residual
+    assert not (refined_points[:, None] == old_points[None]).all(axis=-1).any()
+    refined_residual = pde_constraint.compute_residual(
+        model,
+        {"x": refined_points[:, 0:1], "y": refined_points[:, 1:2]},
+        {"poisson": np.zeros([NUM_REFINE, 1], paddle.get_default_dtype())},
+    )
+    assert refined_residual.min() >= np.median(old_residual)
+    if mode == "replace":
+        assert refined_residual.min() >= old_residual[replace_index].max()
+
+    # data iterator is restarted on refined dataset
+    input_dict, _, _ = next(pde_constraint.data_iter)
+    if dataset_name == "IterableNamedArrayDataset":
+        assert len(input_dict["x"]) == num_points
+    else:
+        assert len(input_dict["x"]) == NUM_POINTS
+
+
+def test_refine_distributed_batch_sampler():
+    pde_constraint, model = _build_constraint(
+        "NamedArrayDataset",
+        {"num_refine": NUM_REFINE, "num_candidates": 256, "mode": "add"},
+    )
+    # simulate data loader of rank 0 of 2 ranks, as built by build_dataloader when
+    # world_size > 1
+    _dataset = _get_dataset(pde_constraint)
+    batch_size = 10
+    pde_constraint.data_loader = paddle.io.DataLoader(
+        _dataset,
+        batch_sampler=paddle.io.DistributedBatchSampler(
+            _dataset, batch_size, num_replicas=2, rank=0
+        ),
+    )
+    pde_constraint.data_iter = iter(pde_constraint.data_loader)
+
+    pde_constraint.refine(model)
+    num_points = NUM_POINTS + NUM_REFINE
+    # iterate sampler first, as errors raised by sampler hang the data loader
+    assert sum(map(len, pde_constraint.data_loader.batch_sampler)) == num_points // 2
+
+    # samples of rank 0 and a new data loader of rank 1 cover all points
+    data_loaders = (
+        pde_constraint.data_loader,
+        paddle.io.DataLoader(
+            _dataset,
+            batch_sampler=paddle.io.DistributedBatchSampler(
+                _dataset, batch_size, num_replicas=2, rank=1
+            ),
+        ),
+    )
+    points = np.concatenate(
+        [
+            np.concatenate((input_dict["x"].numpy(), input_dict["y"].numpy()), axis=1)
+            for data_loader in data_loaders
+            for input_dict, _, _ in data_loader
+        ]
+    )
+    new_input, _, _ = _dataset_dicts(pde_constraint)
+    new_points = np.concatenate((new_input["x"], new_input["y"]), axis=1)
+    assert len(points) == num_points
+    np.testing.assert_array_equal(
+        np.unique(points, axis=0), np.unique(new_points, axis=0)
+    )
+    input_dict, _, _ = next(pde_constraint.data_iter)
+    assert len(input_dict["x"]) == batch_size
+
+
+if __name__ == "__main__":
+    pytest.main()
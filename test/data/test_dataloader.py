@@ -0,0 +1,53 @@
+import pytest
+
+from ppsci.data import dataloader
+
+
+class _CountingLoader:
+    """Finite loader which counts how many times it has been iterated."""
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.num_epochs = 0
+
+    def __iter__(self):
+        self.num_epochs += 1
+        yield from self.batches
+
+    def __len__(self):
+        return len(self.batches)
+
+
+class _FailingLoader:
+    def __iter__(self):
+        yield 0
+        raise RuntimeError("broken batch")
+
+
+@pytest.mark.parametrize("prefetch_depth", (1, 3))
+def test_prefetch_restart(prefetch_depth):
+    loader = _CountingLoader([0, 1, 2])
+    prefetch_loader = dataloader.PrefetchDataLoader(loader, prefetch_depth)
+    assert len(prefetch_loader) == 3
+    # wrapped loader is restarted when exhausted, with batches in order
+    assert [next(prefetch_loader) for _ in range(7)] == [0, 1, 2, 0, 1, 2, 0]
+    prefetch_loader.close()
+    assert not prefetch_loader._thread.is_alive()
+    assert loader.num_epochs >= 3
+
+
+def test_prefetch_exception():
+    prefetch_loader = dataloader.PrefetchDataLoader(_FailingLoader(), 2)
+    assert next(prefetch_loader) == 0
+    with pytest.raises(RuntimeError, match="broken batch"):
+        next(prefetch_loader)
+    prefetch_loader.close()
+
+    prefetch_loader = dataloader.PrefetchDataLoader(_CountingLoader([]), 2)
+    with pytest.raises(ValueError, match="no batch"):
+        next(prefetch_loader)
+    prefetch_loader.close()
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,88 @@
+import h5py
+import numpy as np
+import pytest
+
+from ppsci.data import dataset
+
+NUM_STEPS = 12
+NUM_CHANNELS = 6
+VARS_CHANNEL = (0, 1, 2, 4, 5)
+
+
+@pytest.fixture(scope="module")
+def era5_dir(tmp_path_factory):
+    """Two years of fields and precipitation, chunked along time axis."""
+    root = tmp_path_factory.mktemp("era5")
+    rng = np.random.default_rng(42)
+    fields, tps = [], []
+    for name in ("field", "precip"):
+        (root / name).mkdir()
+    for year in (2016, 2017):
+        field = rng.random([NUM_STEPS, NUM_CHANNELS, 4, 5], dtype="float32")
+        tp = rng.random([NUM_STEPS, 4, 5], dtype="float32")
+        with h5py.File(root / "field" / f"{year}.h5", "w") as f:
+            f.create_dataset("fields", data=field, chunks=(3, NUM_CHANNELS, 4, 5))
+        with h5py.File(root / "precip" / f"{year}.h5", "w") as f:
+            f.create_dataset("tp", data=tp, chunks=(3, 4, 5))
+        fields.append(field)
+        tps.append(tp)
+    return root, fields, tps
+
+
+def test_to_slice_runs():
+    assert dataset.era5_dataset._to_slice_runs([0, 1, 2, 5, 6, 3]) == [
+        (0, 3),
+        (5, 7),
+        (3, 4),
+    ]
+    assert dataset.era5_dataset._to_slice_runs([]) == []
+
+
+@pytest.mark.parametrize("with_precip", (False, True))
+@pytest.mark.parametrize(
+    "cache_size, prefetch_depth",
+    (
+        (0, 0),
+        (1, 0),
+        (1, 4),
+        # holds about 3 time steps, so blocks are evicted while reading
+        (0.001, 2),
+    ),
+)
+def test_era5_dataset(era5_dir, with_precip, cache_size, prefetch_depth):
+    root, fields, tps = era5_dir
+    label_keys = ("output_0", "output_1")
+    era5_dataset = dataset.ERA5Dataset(
+        str(root / "field"),
+        ("input",),
+        label_keys,
+        precip_file_path=str(root / "precip") if with_precip else None,
+        vars_channel=VARS_CHANNEL,
+        num_label_timestamps=2,
+        cache_size=cache_size,
+        prefetch_depth=prefetch_depth,
+    )
+    assert len(era5_dataset) == 2 * NUM_STEPS
+
+    # consecutive indices trigger prefetching, then in random order
+    indices = list(range(len(era5_dataset)))
+    indices += list(np.random.default_rng(0).permutation(len(era5_dataset)))
+    for idx in indices:
+        input_item, label_item, _ = era5_dataset[idx]
+        year_idx, input_idx, label_idx = era5_dataset._locate(idx)
+        np.testing.assert_array_equal(
+            input_item["input"], fields[year_idx][input_idx, VARS_CHANNEL]
+        )
+        for i, key in enumerate(label_keys):
+            if with_precip:
+                expected = tps[year_idx][label_idx + i][None]
+            else:
+                expected = fields[year_idx][label_idx + i, VARS_CHANNEL]
+            np.testing.assert_array_equal(label_item[key], expected)
+
+        # returned arrays can be modified without affecting cached data
+        input_item["input"][:] = -1
+
+
+if __name__ == "__main__":
+    pytest.main()
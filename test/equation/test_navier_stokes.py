@@ -1,3 +1,5 @@
+import os
+
 import paddle
 import pytest
 import sympy as sp
@@ -5,6 +7,7 @@ import sympy as sp
 import ppsci
 from ppsci import arch
 from ppsci import equation
+from ppsci.utils import symbolic
 
 
 def jacobian(y: paddle.Tensor, x: paddle.Tensor) -> paddle.Tensor:
@@ -176,5 +179,174 @@ def test_navierstokes(nu, rho, dim, time):
         assert paddle.allclose(expected_output[name], test_output[name]), f"{name}"
 
 
+@pytest.mark.parametrize(
+    "dim,cse,expected_num_sweeps",
+    [
+        # first order derivatives of a function taken in the same expression are
+        # grouped, i.e. one sweep for derivatives of each output in each equation
+        # which are not computed yet, plus one sweep for each second order
+        # derivative of each velocity component
+        (2, False, 2 + (1 + 1) * 2 + 2 * 2),
+        (3, False, 3 + (1 + 1) * 3 + 3 * 3),
+        # grouped across all equations if they are lambdified together, i.e. one
+        # sweep for first order derivatives of each output
+        (2, True, 3 + 2 * 2),
+        (3, True, 4 + 3 * 3),
+    ],
+)
+def test_navierstokes_num_reverse_sweeps(dim, cse, expected_num_sweeps):
+    batch_size = 13
+    input_dims = ("t", "x", "y") if dim == 2 else ("t", "x", "y", "z")
+    output_dims = ("u", "v", "p") if dim == 2 else ("u", "v", "w", "p")
+    data_dict = {}
+    for key in input_dims:
+        data_dict[key] = paddle.randn([batch_size, 1])
+        data_dict[key].stop_gradient = False
+
+    model = arch.MLP(input_dims, output_dims, 2, 16)
+    data_dict.update(model(data_dict))
+
+    navier_stokes_equation = equation.NavierStokes(nu=0.1, rho=1.0, dim=dim, time=True)
+    exprs = list(navier_stokes_equation.equations.values())
+    if cse:
+        funcs = ppsci.lambdify(exprs, model)
+    else:
+        funcs = [ppsci.lambdify(expr, model) for expr in exprs]
+    ppsci.autodiff.num_reverse_sweeps(reset=True)
+    for func in funcs:
+        func(data_dict)
+    assert ppsci.autodiff.num_reverse_sweeps() == expected_num_sweeps
+    ppsci.autodiff.clear()
+
+
+@pytest.mark.parametrize("backend", ("node", "codegen"))
+@pytest.mark.parametrize("cse", (False, True))
+def test_navierstokes_nu_output(tmp_path, monkeypatch, cse, backend):
+    """Test for viscosity predicted by model, which is an argument of other outputs
+    but never differentiated by.
+    """
+    monkeypatch.setattr(symbolic, "CODEGEN_HOME", str(tmp_path))
+    monkeypatch.setattr(symbolic, "_GENERATED_CODE", {})
+    batch_size = 13
+    input_dict = {}
+    for key in ("x", "y"):
+        input_dict[key] = paddle.randn([batch_size, 1])
+        input_dict[key].stop_gradient = False
+
+    model = arch.MLP(("x", "y"), ("u", "v", "p", "nu"), 2, 16)
+    navier_stokes_equation = equation.NavierStokes(nu="nu", rho=1.0, dim=2, time=False)
+    exprs = [
+        navier_stokes_equation.equations[name]
+        for name in ("continuity", "momentum_x", "momentum_y")
+    ]
+    if cse:
+        funcs = ppsci.lambdify(exprs, model, backend=backend)
+    else:
+        funcs = [ppsci.lambdify(expr, model, backend=backend) for expr in exprs]
+    data_dict = {**input_dict}
+    test_outputs = [func(data_dict) for func in funcs]
+    ppsci.autodiff.clear()
+
+    # derivatives are only grouped by variables differentiated by
+    for func in funcs:
+        for node in func.callable_nodes:
+            assert "nu" not in getattr(node, "grad_group", ())
+
+    x, y = input_dict["x"], input_dict["y"]
+    output_dict = model(input_dict)
+    u, v, p, nu = (output_dict[key] for key in ("u", "v", "p", "nu"))
+    expected_outputs = (
+        continuity_compute_func(x=x, y=y, u=u, v=v, dim=2),
+        momentum_x_compute_func(nu=nu, p=p, rho=1.0, x=x, y=y, u=u, v=v, dim=2),
+        momentum_y_compute_func(nu=nu, p=p, rho=1.0, x=x, y=y, u=u, v=v, dim=2),
+    )
+    for expected_output, test_output in zip(expected_outputs, test_outputs):
+        assert paddle.allclose(expected_output, test_output, atol=1e-6)
+
+
+@pytest.mark.parametrize("nu", (0.1, "0.01 + 0.1 * x * y"))
+@pytest.mark.parametrize("dim", (2, 3))
+def test_navierstokes_cse(dim, nu):
+    batch_size = 13
+    input_dims = ("t", "x", "y") if dim == 2 else ("t", "x", "y", "z")
+    output_dims = ("u", "v", "p") if dim == 2 else ("u", "v", "w", "p")
+    data_dict = {}
+    for key in input_dims:
+        data_dict[key] = paddle.randn([batch_size, 1])
+        data_dict[key].stop_gradient = False
+
+    model = arch.MLP(input_dims, output_dims, 2, 16)
+    data_dict.update(model(data_dict))
+
+    navier_stokes_equation = equation.NavierStokes(nu=nu, rho=1.0, dim=dim, time=True)
+    exprs = list(navier_stokes_equation.equations.values())
+    separate_funcs = [ppsci.lambdify(expr, model) for expr in exprs]
+    shared_funcs = ppsci.lambdify(exprs, model)
+
+    expected_results = [func({**data_dict}) for func in separate_funcs]
+    ppsci.autodiff.clear()
+    shared_data_dict = {**data_dict}
+    test_results = [func(shared_data_dict) for func in shared_funcs]
+    ppsci.autodiff.clear()
+    for expected_result, test_result in zip(expected_results, test_results):
+        assert paddle.allclose(expected_result, test_result, atol=1e-6)
+
+    # nodes are shared among functions, and never more than distinct nodes of
+    # separate functions
+    shared_nodes = {id(node) for func in shared_funcs for node in func.callable_nodes}
+    separate_keys = {
+        node.key for func in separate_funcs for node in func.callable_nodes
+    }
+    assert len(shared_nodes) <= len(separate_keys)
+
+
+@pytest.mark.parametrize("cse", (False, True))
+@pytest.mark.parametrize("nu", (0.1, "0.01 + 0.1 * x * y"))
+@pytest.mark.parametrize("dim", (2, 3))
+def test_navierstokes_codegen(tmp_path, monkeypatch, dim, nu, cse):
+    monkeypatch.setattr(symbolic, "CODEGEN_HOME", str(tmp_path))
+    monkeypatch.setattr(symbolic, "_GENERATED_CODE", {})
+    batch_size = 13
+    input_dims = ("t", "x", "y") if dim == 2 else ("t", "x", "y", "z")
+    output_dims = ("u", "v", "p") if dim == 2 else ("u", "v", "w", "p")
+    input_dict = {}
+    for key in input_dims:
+        input_dict[key] = paddle.randn([batch_size, 1])
+        input_dict[key].stop_gradient = False
+
+    model = arch.MLP(input_dims, output_dims, 2, 16)
+    navier_stokes_equation = equation.NavierStokes(nu=nu, rho=1.0, dim=dim, time=True)
+    exprs = list(navier_stokes_equation.equations.values())
+    if cse:
+        node_funcs = ppsci.lambdify(exprs, model)
+        codegen_funcs = ppsci.lambdify(exprs, model, backend="codegen")
+    else:
+        node_funcs = [ppsci.lambdify(expr, model) for expr in exprs]
+        codegen_funcs = [
+            ppsci.lambdify(expr, model, backend="codegen") for expr in exprs
+        ]
+
+    results = []
+    for funcs in (node_funcs, codegen_funcs):
+        data_dict = {**input_dict}
+        with ppsci.autodiff.DerivativeCache() as derivative_cache:
+            outputs = [func(data_dict) for func in funcs]
+            results.append((outputs, derivative_cache.hits, derivative_cache.misses))
+    (expected_outputs, *expected_counts), (test_outputs, *test_counts) = results
+    for expected_output, test_output in zip(expected_outputs, test_outputs):
+        assert paddle.allclose(expected_output, test_output)
+    assert expected_counts == test_counts
+
+    # generated source is written to disk, and its compiled code is reused by
+    # functions converted from the same expression
+    for func in codegen_funcs:
+        assert os.path.dirname(func.source_path) == str(tmp_path)
+    assert len(symbolic._GENERATED_CODE) == len(os.listdir(tmp_path))
+    if not cse:
+        func = ppsci.lambdify(exprs[0], model, backend="codegen")
+        assert func.source_path == codegen_funcs[0].source_path
+        assert len(symbolic._GENERATED_CODE) == len(os.listdir(tmp_path))
+
+
 if __name__ == "__main__":
     pytest.main()
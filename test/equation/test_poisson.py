@@ -79,5 +79,66 @@ def test_poisson(dim):
     assert paddle.allclose(expected_result, test_result)
 
 
+@pytest.mark.parametrize("dim", (2, 3))
+def test_poisson_laplacian(dim):
+    """Test for laplacian node against sum of second derivatives."""
+    batch_size = 13
+    input_dims = ("x", "y", "z")[:dim]
+    model = arch.MLP(input_dims, ("p",), 2, 16)
+
+    pde = equation.PDE()
+    invars = pde.create_symbols(" ".join(input_dims))
+    p = pde.create_function("p", invars)
+    expected_expr = sum(p.diff(invar, 2) for invar in invars)
+    laplacian_expr = pde.create_laplacian(p, invars)
+
+    data_dict = {}
+    for key in input_dims:
+        data_dict[key] = paddle.randn([batch_size, 1])
+        data_dict[key].stop_gradient = False
+
+    expected_result = ppsci.lambdify(expected_expr, model)({**data_dict})
+    ppsci.autodiff.clear()
+    _ = ppsci.autodiff.num_reverse_sweeps(reset=True)
+    test_result = ppsci.lambdify(laplacian_expr, model)({**data_dict})
+    assert paddle.allclose(expected_result, test_result)
+    # one sweep for first derivatives and one for each second derivative
+    assert ppsci.autodiff.num_reverse_sweeps() == dim + 1
+
+
+@pytest.mark.parametrize("num_probes", (1, 4))
+def test_hutchinson_laplacian(num_probes):
+    """Test for hutchinson laplacian, which is exact for diagonal hessian."""
+    batch_size = 13
+    x = paddle.randn([batch_size, 1])
+    y = paddle.randn([batch_size, 2])
+    x.stop_gradient = False
+    y.stop_gradient = False
+    u = x * x + 3 * (y * y).sum(axis=1, keepdim=True)
+
+    ppsci.autodiff.clear()
+    _ = ppsci.autodiff.num_reverse_sweeps(reset=True)
+    test_result = ppsci.autodiff.laplacian(
+        u, (x, y), method="hutchinson", num_probes=num_probes
+    )
+    assert paddle.allclose(test_result, paddle.full([batch_size, 1], 14.0))
+    assert ppsci.autodiff.num_reverse_sweeps() == num_probes + 1
+    ppsci.autodiff.clear()
+
+
+def test_hutchinson_laplacian_zero_hessian():
+    """Test for hutchinson laplacian of output linear to all inputs."""
+    batch_size = 13
+    x = paddle.randn([batch_size, 1])
+    y = paddle.randn([batch_size, 2])
+    x.stop_gradient = False
+    y.stop_gradient = False
+    u = 2 * x + y.sum(axis=1, keepdim=True)
+
+    test_result = ppsci.autodiff.laplacian(u, (x, y), method="hutchinson")
+    assert paddle.allclose(test_result, paddle.zeros([batch_size, 1]))
+    ppsci.autodiff.clear()
+
+
 if __name__ == "__main__":
     pytest.main()
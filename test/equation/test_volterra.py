@@ -0,0 +1,52 @@
+import numpy as np
+import paddle
+import pytest
+
+from ppsci import equation
+
+NUM_POINTS = 6
+QUAD_DEG = 4
+
+
+def _build_equation():
+    return equation.Volterra(
+        0,
+        NUM_POINTS,
+        QUAD_DEG,
+        lambda t, s: np.exp(s - t),
+        lambda out: out["u"],
+    )
+
+
+def _sample_points(vol_eq: equation.Volterra, t: np.ndarray) -> paddle.Tensor:
+    """Collocation points followed by their quadrature points."""
+    t = paddle.to_tensor(t.astype(paddle.get_default_dtype()))
+    s = vol_eq.get_quad_points(t).reshape([-1, 1])
+    return paddle.concat([t, s], axis=0)
+
+
+def test_volterra_int_weights_cache():
+    vol_eq = _build_equation()
+    volterra_func = vol_eq.equations["volterra"]
+    u = paddle.randn([NUM_POINTS * (QUAD_DEG + 1), 1])
+
+    x1 = _sample_points(vol_eq, np.random.rand(NUM_POINTS, 1))
+    volterra_func({"x": x1, "u": u})
+    int_weights = vol_eq._int_weights
+
+    # reused for the same tensor and for a tensor with the same points
+    volterra_func({"x": x1, "u": u})
+    assert vol_eq._int_weights is int_weights
+    volterra_func({"x": x1.clone(), "u": u})
+    assert vol_eq._int_weights is int_weights
+
+    # recomputed when points change, giving the same result as a new equation
+    x2 = _sample_points(vol_eq, np.random.rand(NUM_POINTS, 1) + 1)
+    result = volterra_func({"x": x2, "u": u})
+    assert vol_eq._int_weights is not int_weights
+    expected_result = _build_equation().equations["volterra"]({"x": x2, "u": u})
+    assert paddle.allclose(result, expected_result)
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,42 @@
+import numpy as np
+import paddle
+import pytest
+
+import ppsci
+
+
+def test_export_and_predict(tmp_path):
+    ppsci.utils.misc.set_random_seed(42)
+    model = ppsci.arch.MLP(("x", "y"), ("u", "v"), 2, 16)
+    solver = ppsci.solver.Solver(model, output_dir=str(tmp_path), device="cpu")
+    export_path = solver.export()
+    # keys are recorded in a separate file, not overwriting exported model
+    assert (tmp_path / "inference" / "inference.keys.json").exists()
+
+    predictor = ppsci.inference.Predictor(export_path)
+    assert predictor.input_keys == ("x", "y")
+    assert predictor.output_keys == ("u", "v")
+
+    input_dict = {
+        key: np.random.rand(10, 1).astype(paddle.get_default_dtype())
+        for key in ("x", "y")
+    }
+    expected = {
+        key: value.numpy()
+        for key, value in model(
+            {key: paddle.to_tensor(value) for key, value in input_dict.items()}
+        ).items()
+    }
+    for batch_size in (None, 4):
+        pred = predictor.predict(input_dict, batch_size)
+        for key in ("u", "v"):
+            np.testing.assert_allclose(pred[key], expected[key], rtol=1e-5, atol=1e-6)
+
+
+def test_predictor_missing_model(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ppsci.inference.Predictor(str(tmp_path / "inference"))
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,123 @@
+import numpy as np
+import paddle
+import pytest
+
+from ppsci import metric
+from ppsci.solver import eval as solver_eval
+
+NUM_LAT = 6
+WORLD_SIZE = 2
+BATCH_SIZE = 4
+
+
+class _IndexDataset(paddle.io.Dataset):
+    def __init__(self, num_samples):
+        self.num_samples = num_samples
+
+    def __getitem__(self, idx):
+        return idx
+
+    def __len__(self):
+        return self.num_samples
+
+
+def _build_data(num_samples, shape):
+    return [
+        {
+            key: paddle.to_tensor(
+                np.random.randn(num_samples, *shape).astype("float32")
+            )
+            for key in ("u", "v")
+        }
+        for _ in range(2)
+    ]
+
+
+def _streaming_compute(metric_funcs, output, label, num_samples):
+    """Update metric of each rank by its local batches with padded samples
+    discarded as evaluation by dataset, then sum up statistics as `reduce`.
+    """
+    rank_batches = [
+        list(
+            paddle.io.DistributedBatchSampler(
+                _IndexDataset(num_samples), BATCH_SIZE, WORLD_SIZE, rank
+            )
+        )
+        for rank in range(WORLD_SIZE)
+    ]
+    for metric_func in metric_funcs:
+        metric_func.reset()
+    num_seen = 0
+    for step_indices in zip(*rank_batches):
+        local_batch_size = len(step_indices[0])
+        for rank, indices in enumerate(step_indices):
+            num_valid = solver_eval._num_valid_samples(
+                num_samples, num_seen, rank, local_batch_size
+            )
+            indices = paddle.to_tensor(indices[:num_valid], "int64")
+            metric_funcs[rank].update(
+                {key: paddle.gather(value, indices) for key, value in output.items()},
+                {key: paddle.gather(value, indices) for key, value in label.items()},
+            )
+        num_seen += local_batch_size * WORLD_SIZE
+
+    states = metric_funcs[0]._states
+    for metric_func in metric_funcs[1:]:
+        assert metric_func._states.keys() == states.keys()
+        for key, state in metric_func._states.items():
+            states[key] = states[key] + state
+    return metric_funcs[0].compute()
+
+
+@pytest.mark.parametrize(
+    "build_metric, shape",
+    (
+        (metric.MSE, (3,)),
+        (metric.MAE, (3,)),
+        (metric.RMSE, (3,)),
+        (metric.L2Rel, (3,)),
+        (metric.MeanL2Rel, (3,)),
+        (
+            lambda: metric.LatitudeWeightedRMSE(NUM_LAT, std=np.arange(1, 3)),
+            (2, NUM_LAT, 4),
+        ),
+        (
+            lambda: metric.LatitudeWeightedRMSE(
+                NUM_LAT, variable_dict={"a": 0, "b": 1}
+            ),
+            (2, NUM_LAT, 4),
+        ),
+        (
+            lambda: metric.LatitudeWeightedACC(
+                NUM_LAT, mean=np.linspace(0, 1, 2 * NUM_LAT * 4).reshape(2, NUM_LAT, 4)
+            ),
+            (2, NUM_LAT, 4),
+        ),
+        (
+            lambda: metric.LatitudeWeightedACC(
+                NUM_LAT, mean=None, variable_dict={"a": 0, "b": 1}
+            ),
+            (2, NUM_LAT, 4),
+        ),
+    ),
+)
+# the tail batch of the last rank is truncated for 29 samples and empty for 25
+@pytest.mark.parametrize("num_samples", (25, 29, 32))
+def test_streaming_metric(build_metric, shape, num_samples):
+    metric_funcs = [build_metric() for _ in range(WORLD_SIZE)]
+    assert metric_funcs[0].support_streaming
+    output, label = _build_data(num_samples, shape)
+    expected = metric_funcs[0](output, label)
+
+    # run twice to check reset
+    for _ in range(2):
+        result = _streaming_compute(metric_funcs, output, label, num_samples)
+        assert result.keys() == expected.keys()
+        for key in expected:
+            np.testing.assert_allclose(
+                result[key].numpy(), expected[key].numpy(), rtol=1e-5, atol=1e-6
+            )
+
+
+if __name__ == "__main__":
+    pytest.main()
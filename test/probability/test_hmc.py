@@ -38,5 +38,29 @@ def test_HamiltonianMonteCarlo(true_mean, true_std):
     )
 
 
+@pytest.mark.parametrize("true_mean", [5.0])
+@pytest.mark.parametrize("true_std", [1.0])
+def test_HamiltonianMonteCarlo_run_chains(true_mean, true_std):
+    num_chains = 8
+    initial_params = {"x": paddle.zeros([num_chains, 1])}
+
+    def log_posterior(**kwargs):
+        dist = paddle.distribution.Normal(true_mean, true_std)
+        return dist.log_prob(kwargs["x"]).sum(axis=-1)
+
+    HMC = HamiltonianMonteCarlo(
+        log_posterior, path_len=1.5, step_size=0.25, num_warmup_steps=200
+    )
+    trial = HMC.run_chains(1000, initial_params, thinning=2)
+    # adapted step size is local to the call
+    assert HMC.step_size == 0.25 and HMC.steps == 6
+
+    assert trial["x"].shape == [num_chains, 500, 1]
+    assert paddle.allclose(trial["x"].mean(), paddle.to_tensor(true_mean), rtol=0.05)
+    assert paddle.allclose(
+        paddle.std(trial["x"]), paddle.to_tensor(true_std), rtol=0.05
+    )
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,171 @@
+import paddle
+import pytest
+import sympy as sp
+
+import ppsci
+from ppsci import arch
+from ppsci import equation
+from ppsci.utils import expression
+
+paddle.jit.enable_to_static(False)
+
+
+def _build_constraint_data(input_keys, batch_sizes):
+    input_dicts, label_dicts, weight_dicts = [], [], []
+    for i, batch_size in enumerate(batch_sizes):
+        input_dict = {}
+        for key in input_keys:
+            input_dict[key] = paddle.randn([batch_size, 1])
+            input_dict[key].stop_gradient = False
+        input_dicts.append(input_dict)
+        if i == 0:
+            label_keys = ("continuity", "momentum_x", "momentum_y")
+        else:
+            label_keys = ("u", "v")
+        label_dicts.append({key: paddle.randn([batch_size, 1]) for key in label_keys})
+        weight_dicts.append({key: paddle.ones([batch_size, 1]) for key in label_keys})
+    return input_dicts, label_dicts, weight_dicts
+
+
+class _DummyConstraint:
+    def __init__(self):
+        self.loss = ppsci.loss.MSELoss("mean")
+
+
+@pytest.mark.parametrize("batch_sizes", [(32, 8, 5), (16, 16)])
+def test_fused_train_forward(batch_sizes):
+    paddle.seed(42)
+    input_keys = ("t", "x", "y")
+    model = arch.MLP(input_keys, ("u", "v", "p"), 3, 16)
+    navier_stokes = equation.NavierStokes(0.01, 1.0, 2, True)
+    ns_exprs = {
+        name: ppsci.lambdify(expr, model)
+        for name, expr in navier_stokes.equations.items()
+        if isinstance(expr, sp.Basic)
+    }
+    expr_dicts = (ns_exprs,) + tuple(
+        {"u": lambda out: out["u"], "v": lambda out: out["v"]} for _ in batch_sizes[1:]
+    )
+    constraint = {f"c{i}": _DummyConstraint() for i in range(len(batch_sizes))}
+    input_dicts, label_dicts, weight_dicts = _build_constraint_data(
+        input_keys, batch_sizes
+    )
+
+    results = []
+    for fuse_forward in (False, True):
+        expr_solver = expression.ExpressionSolver(fuse_forward)
+        losses = expr_solver.train_forward(
+            expr_dicts, input_dicts, model, constraint, label_dicts, weight_dicts
+        )
+        paddle.add_n(losses).backward()
+        grads = [param.grad.clone() for param in model.parameters()]
+        model.clear_gradients()
+        results.append((losses, grads))
+
+    for loss_ref, loss_fused in zip(results[0][0], results[1][0]):
+        assert paddle.allclose(loss_ref, loss_fused, rtol=1e-5, atol=1e-6)
+    for grad_ref, grad_fused in zip(results[0][1], results[1][1]):
+        assert paddle.allclose(grad_ref, grad_fused, rtol=1e-4, atol=1e-6)
+
+
+@pytest.mark.parametrize("num_chunks", [(1, 1, 1), (4, 3, 1), (7, 8, 5)])
+def test_train_forward_chunked(num_chunks):
+    paddle.seed(42)
+    input_keys = ("t", "x", "y")
+    batch_sizes = (30, 8, 5)
+    model = arch.MLP(input_keys, ("u", "v", "p"), 3, 16)
+    navier_stokes = equation.NavierStokes(0.01, 1.0, 2, True)
+    ns_exprs = {
+        name: ppsci.lambdify(expr, model)
+        for name, expr in navier_stokes.equations.items()
+        if isinstance(expr, sp.Basic)
+    }
+    expr_dicts = (ns_exprs,) + tuple(
+        {"u": lambda out: out["u"], "v": lambda out: out["v"]} for _ in batch_sizes[1:]
+    )
+    constraint = {f"c{i}": _DummyConstraint() for i in range(len(batch_sizes))}
+    input_dicts, label_dicts, weight_dicts = _build_constraint_data(
+        input_keys, batch_sizes
+    )
+    expr_solver = expression.ExpressionSolver()
+
+    # full batch
+    losses_ref = expr_solver.train_forward(
+        expr_dicts, input_dicts, model, constraint, label_dicts, weight_dicts
+    )
+    paddle.add_n(losses_ref).backward()
+    grads_ref = [param.grad.clone() for param in model.parameters()]
+    model.clear_gradients()
+
+    # micro-chunks
+    losses_chunked = expr_solver.train_forward_chunked(
+        expr_dicts,
+        input_dicts,
+        model,
+        constraint,
+        label_dicts,
+        weight_dicts,
+        num_chunks,
+        lambda loss: loss.backward(),
+    )
+    grads_chunked = [param.grad.clone() for param in model.parameters()]
+    model.clear_gradients()
+
+    for loss_ref, loss_chunked in zip(losses_ref, losses_chunked):
+        assert paddle.allclose(loss_ref, loss_chunked, rtol=1e-5, atol=1e-6)
+    for grad_ref, grad_chunked in zip(grads_ref, grads_chunked):
+        assert paddle.allclose(grad_ref, grad_chunked, rtol=1e-4, atol=1e-6)
+
+
+def test_solver_num_chunks_unknown_constraint(tmp_path):
+    model = arch.MLP(("x",), ("u",), 2, 16)
+    with pytest.raises(ValueError, match="valid constraint names"):
+        ppsci.solver.Solver(
+            model,
+            {"c0": _DummyConstraint()},
+            str(tmp_path),
+            num_chunks={"c1": 2},
+        )
+
+
+def test_derivative_cache():
+    batch_size = 13
+    x, y = sp.symbols("x y")
+    u = sp.Function("u")(x, y)
+    model = arch.MLP(("x", "y"), ("u",), 2, 16)
+    exprs = (
+        u.diff(x) + u.diff(x, 2),
+        u.diff(x) * u.diff(y) + u.diff(x, y),
+    )
+    data_dict = {}
+    for key in ("x", "y"):
+        data_dict[key] = paddle.randn([batch_size, 1])
+        data_dict[key].stop_gradient = False
+    data_dict.update(model(data_dict))
+
+    stats = {}
+    ppsci.autodiff.num_reverse_sweeps(reset=True)
+    with ppsci.autodiff.DerivativeCache(stats) as cache:
+        for expr in exprs:
+            ppsci.lambdify(expr, model)(data_dict)
+    # hits: u__x in the 2nd expression, (u, x, 1) of u__x__y
+    # misses: (u, x, 1), (u, x, 2), (u, y, 1), (u__x, y, 1)
+    assert (cache.hits, cache.misses) == (2, 4)
+    # first order derivatives to x and y are taken in different expressions, so
+    # they are not grouped into one sweep, then u__x__x and u__x__y
+    assert cache.sweeps == ppsci.autodiff.num_reverse_sweeps() == 4
+    assert cache.nodes == 4
+    assert cache.retained_bytes == 4 * batch_size * 4
+    assert stats == {
+        "hits": 2,
+        "misses": 4,
+        "sweeps": 4,
+        "nodes": 4,
+        "retained_bytes": 4 * batch_size * 4,
+    }
+    assert ppsci.autodiff.current_derivative_cache() is None
+    assert len(ppsci.autodiff.jacobian.Js) == 0
+
+
+if __name__ == "__main__":
+    pytest.main()
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import paddle
+import pytest
+
+from ppsci.utils import reader
+
+
+def _write_csv(path, data, delimiter=","):
+    with open(path, "w") as f:
+        f.write(delimiter.join(f'"{key}"' for key in data) + "\n")
+        for row in zip(*data.values()):
+            f.write(delimiter.join(str(v) for v in row) + "\n")
+
+
+@pytest.mark.parametrize("delimiter", [",", "\t"])
+def test_load_csv_file_cache(tmp_path, delimiter):
+    file_path = str(tmp_path / "data.csv")
+    data = {
+        "Points:0": np.random.rand(100),
+        "Points:1": np.random.rand(100),
+        "p": np.random.rand(100),
+    }
+    _write_csv(file_path, data, delimiter)
+    keys = ("x", "y")
+    alias_dict = {"x": "Points:0", "y": "Points:1"}
+
+    ref = reader.load_csv_file(file_path, keys, alias_dict, delimiter, use_cache=False)
+    assert not os.path.exists(tmp_path / ".data.csv.cache")
+    for key, fetch_key in alias_dict.items():
+        assert ref[key].shape == (100, 1)
+        assert ref[key].dtype == paddle.get_default_dtype()
+        np.testing.assert_allclose(ref[key][:, 0], data[fetch_key], rtol=1e-6)
+
+    # first load builds the cache and the second one reads from it
+    for _ in range(2):
+        out = reader.load_csv_file(file_path, keys, alias_dict, delimiter)
+        for key in keys:
+            np.testing.assert_array_equal(out[key], ref[key])
+    assert len(os.listdir(tmp_path / ".data.csv.cache")) == 3
+
+    # modified file invalidates the cache
+    data["Points:0"] = data["Points:0"] + 1
+    _write_csv(file_path, data, delimiter)
+    out = reader.load_csv_file(file_path, ("x",), alias_dict, delimiter)
+    np.testing.assert_allclose(out["x"][:, 0], data["Points:0"], rtol=1e-6)
+
+
+def test_load_csv_file_quoted_field(tmp_path):
+    file_path = str(tmp_path / "data.csv")
+    with open(file_path, "w") as f:
+        f.write('x,u\n"1.0",2.0\n"3.0",4.0\n')
+    out = reader.load_csv_file(file_path, ("x", "u"), use_cache=False)
+    np.testing.assert_array_equal(out["x"][:, 0], [1.0, 3.0])
+    np.testing.assert_array_equal(out["u"][:, 0], [2.0, 4.0])
+
+
+if __name__ == "__main__":
+    pytest.main()
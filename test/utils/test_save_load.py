@@ -0,0 +1,54 @@
+import os
+import threading
+
+import paddle
+import pytest
+
+from ppsci.utils import save_load
+
+
+def test_async_checkpoint_writer(tmp_path, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    written_epochs = []
+    write_checkpoint = save_load._write_checkpoint
+
+    def blocked_write_checkpoint(ckpt_path, states):
+        started.set()
+        release.wait()
+        written_epochs.append(states[".pdstates"]["epoch"])
+        write_checkpoint(ckpt_path, states)
+
+    monkeypatch.setattr(save_load, "_write_checkpoint", blocked_write_checkpoint)
+    writer = save_load.AsyncCheckpointWriter(max_pending=2)
+    ckpt_path = str(tmp_path / "latest")
+
+    # the first one is taken by background thread, the others are coalesced
+    writer.submit(ckpt_path, {".pdstates": {"epoch": 1}})
+    assert started.wait(timeout=10)
+    for epoch in range(2, 5):
+        writer.submit(ckpt_path, {".pdstates": {"epoch": epoch}})
+
+    release.set()
+    writer.flush()
+    assert written_epochs == [1, 4]
+    assert paddle.load(f"{ckpt_path}.pdstates") == {"epoch": 4}
+    # no temporary directory is left
+    assert os.listdir(tmp_path) == ["latest.pdstates"]
+
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit(ckpt_path, {".pdstates": {"epoch": 5}})
+
+
+def test_snapshot():
+    state = {"w": paddle.ones([2]), "meta": [paddle.zeros([1]), 1]}
+    snapshot = save_load._snapshot(state)
+    state["w"].set_value(paddle.zeros([2]))
+    state["meta"].append(2)
+    assert paddle.allclose(snapshot["w"], paddle.ones([2]))
+    assert len(snapshot["meta"]) == 2
+
+
+if __name__ == "__main__":
+    pytest.main()